@@ -2,6 +2,8 @@ import os
 import importlib.util
 from fastapi import APIRouter, HTTPException
 from ..config import settings
+from ..db import SessionLocal
+from ..catalog import bump_catalog_version
 
 router = APIRouter(prefix="/api/dev", tags=["dev"])
 
@@ -56,4 +58,11 @@ def seed_via_api():
     except Exception as e:
         results["internships"] = f"error: {e}"
 
+    # Seeders write internships directly; make cached catalog snapshots reload
+    db = SessionLocal()
+    try:
+        results["catalog_version"] = bump_catalog_version(db)
+    finally:
+        db.close()
+
     return {"status": "completed", "results": results}
@@ -3,17 +3,22 @@ Frontend-facing API endpoints for resume upload and recommendation retrieval.
 These endpoints are designed for the Vue frontend and don't require student IDs.
 """
 
-from fastapi import APIRouter, UploadFile, File, Depends, HTTPException, BackgroundTasks
-from ..nlp.parser import parse_resume
-from ..nlp.embedding import embed_text, save_embedding
-from ...scripts.process_resume import process_resume_file
-from ..db import get_db
+from fastapi import APIRouter, UploadFile, File, Depends, HTTPException, BackgroundTasks, Response
+from fastapi.responses import JSONResponse
+from ..nlp.backfill import backfill_embeddings
+from ..db import get_async_db
 from ..db import SessionLocal
-from .. import models
+from .. import models, crud, crud_async, jobs, metrics
+from ..nlp.scoring import DEFAULT_TOP_K
+from ..topk import get_top_k, next_cursor, parse_cursor
+from ..config import settings
+from ..utils.upload_stream import save_upload, UploadTooLarge
 from .scraper import scrape_internships
-import shutil
+import asyncio
+import functools
 import os
 import uuid
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from typing import List, Dict, Any
 
@@ -22,95 +27,78 @@ UPLOAD_DIR = os.path.join(os.getcwd(), "uploads")
 os.makedirs(UPLOAD_DIR, exist_ok=True)
 
 
+@metrics.timed("compute_recommendations")
 def compute_recommendations(db: Session, resume: models.Resume) -> List[Dict[str, Any]]:
     """Compute match scores between a resume and active internships.
     Returns a list of recommendation dicts (same shape as the GET endpoint).
     """
-    # Get all active internships
-    internships = db.query(models.Internship).filter(models.Internship.is_active == 1).all()
-    if not internships:
-        return []
+    # Served from the materialized top-k (kept current by ingest); computed and stored on a miss
+    return get_top_k(db, resume, k=DEFAULT_TOP_K)
 
-    resume_skills = set(s.strip().lower() for s in (resume.skills or "").split(",") if s.strip())
-    resume_outcomes = set(o.strip().lower() for o in (resume.outcomes or "").split(",") if o.strip())
 
-    results: List[Dict[str, Any]] = []
-    for internship in internships:
-        internship_skills = set(s.strip().lower() for s in (internship.required_skills or "").split(",") if s.strip())
-
-        if internship_skills:
-            matched = len(resume_skills.intersection(internship_skills))
-            skill_score = int((matched / len(internship_skills)) * 100)
-        else:
-            skill_score = 40
-
-        out_text = ((internship.title or "") + " " + (internship.description or "")).lower()
-        outcome_matches = 0
-        for o in resume_outcomes:
-            if o and o in out_text:
-                outcome_matches += 1
+async def receive_upload(file: UploadFile, directory: str, filename: str):
+    """Stream the upload to `directory/filename`; returns (path, sha256). 413 past MAX_UPLOAD_BYTES."""
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, filename)
+    try:
+        content_hash, _ = await save_upload(file, path, settings.MAX_UPLOAD_BYTES, settings.UPLOAD_CHUNK_SIZE)
+    except UploadTooLarge as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    return path, content_hash
 
-        outcome_boost = min(outcome_matches, 3) * 10
-        match_score = min(100, int(0.8 * skill_score + outcome_boost))
 
-        matched_skills_list = [s.strip() for s in (internship.required_skills or "").split(",") if s.strip().lower() in resume_skills][:5]
+async def enqueue_resume(path: str, filename: str, student_id: int = None, content_hash: str = None) -> jobs.Job:
+    """Queue a saved upload: parsed on the worker pool, then embedded and stored here; 429 when the queue is full."""
+    try:
+        # submit writes the upload_jobs row with the sync engine: keep that round trip off the event loop
+        return await asyncio.to_thread(
+            jobs.submit, "resume", jobs.parse_resume_job, path,
+            then=functools.partial(jobs.store_resume_job, filename=filename, student_id=student_id,
+                                   content_hash=content_hash))
+    except jobs.JobQueueFull as e:
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": "5"})
 
-        if match_score > 0 or len(results) < 5:
-            results.append({
-                "id": internship.id,
-                "title": internship.title,
-                "company_name": internship.company_name,
-                "location": internship.location,
-                "description": internship.description,
-                "posting_url": internship.posting_url,
-                "matched_skills": matched_skills_list,
-                "match_score": match_score,
-                "posted_date": internship.posted_date.isoformat() if internship.posted_date else None
-            })
 
-    results.sort(key=lambda x: x["match_score"], reverse=True)
-    return results[:20]
+@router.get("/jobs/{job_id}")
+def get_job_status(job_id: str):
+    """Status of a queued upload: queued, running, done (with result) or failed (with error)."""
+    status = jobs.get_job_status(job_id)
+    if status is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return status
 
 
 @router.post("/upload-resume")
-async def upload_resume(file: UploadFile = File(...), background_tasks: BackgroundTasks = None, db: Session = Depends(get_db)):
+async def upload_resume(file: UploadFile = File(...), background_tasks: BackgroundTasks = None, wait: bool = True,
+                        db: AsyncSession = Depends(get_async_db)):
     """
     Upload resume from frontend.
     Returns resume_id and extracted skills for matching.
+
+    Parsing and embedding run on the worker pool. With `wait=false` the response
+    is a job id right away (poll `/api/jobs/{job_id}`); otherwise the request
+    awaits the job without blocking the event loop.
     """
     try:
         # Generate unique ID for this resume
         resume_id = str(uuid.uuid4())
         filename = f"{resume_id}_{file.filename}"
-        path = os.path.join(UPLOAD_DIR, filename)
-        
-        # Save file
-        os.makedirs(UPLOAD_DIR, exist_ok=True)
-        with open(path, "wb") as f:
-            shutil.copyfileobj(file.file, f)
-        
-        # Use shared helper to parse, embed and persist the resume (no scraping here)
-        try:
-            new_resume_id, parsed, emb_path = process_resume_file(path, filename=filename, db=db, run_scrape=False)
-            resume = db.query(models.Resume).filter(models.Resume.id == new_resume_id).first()
-        except Exception:
-            # fallback to inline logic if helper fails
-            parsed = parse_resume(path)
-            try:
-                emb = embed_text(parsed["text"])
-                emb_path = save_embedding(resume_id, emb, prefix="resume")
-            except Exception:
-                emb_path = ""
-            resume = models.Resume(
-                filename=filename,
-                parsed_text=parsed["text"],
-                skills=",".join(parsed.get("skills", [])),
-                outcomes=",".join(parsed.get("outcomes", [])),
-                embedding=emb_path
-            )
-            db.add(resume)
-            db.commit()
-            db.refresh(resume)
+        path, content_hash = await receive_upload(file, UPLOAD_DIR, filename)
+
+        resume = await crud_async.get_resume_by_hash(db, content_hash)
+        if resume is not None:
+            # identical file already parsed and embedded: reuse it and drop the duplicate copy
+            os.remove(path)
+            extracted_skills = [s for s in (resume.skills or "").split(",") if s]
+            deduplicated = True
+        else:
+            job = await enqueue_resume(path, filename, content_hash=content_hash)
+            if not wait:
+                return JSONResponse({"status": "queued", "job_id": job.id}, status_code=202)
+            result = await asyncio.wrap_future(job.future)
+            resume = await crud_async.get_resume(db, result["resume_id"])
+            extracted_skills = result["extracted_skills"]
+            deduplicated = False
 
         # Trigger scraping from RapidAPI to refresh internship data.
         # Run as a background task so the upload response returns quickly.
@@ -119,6 +107,9 @@ async def upload_resume(file: UploadFile = File(...), background_tasks: Backgrou
             try:
                 try:
                     scrape_internships(query=q, limit=lim, db=db_sess)
+                    if settings.BACKFILL_AFTER_SCRAPE:
+                        # embed the postings that were just inserted so semantic search sees them
+                        backfill_embeddings(db_sess, "internships")
                 except Exception:
                     # swallow scraper errors in background job
                     pass
@@ -129,55 +120,102 @@ async def upload_resume(file: UploadFile = File(...), background_tasks: Backgrou
             if background_tasks is not None:
                 background_tasks.add_task(_run_scrape, "internship", 50)
             else:
-                # fallback to synchronous call if BackgroundTasks not provided
-                try:
-                    scrape_internships(query="internship", limit=50, db=db)
-                except Exception:
-                    pass
+                # fallback to an inline call (off the event loop) if BackgroundTasks not provided
+                await asyncio.to_thread(_run_scrape, "internship", 50)
         except Exception:
             # ensure upload still succeeds even if scheduling fails
             pass
 
         # After saving and scraping, compute recommendations immediately and return them
         try:
-            recs = compute_recommendations(db, resume)
+            # top-k code is sync; run_sync drives it over the async connection
+            recs = await db.run_sync(compute_recommendations, resume)
         except Exception:
             recs = []
 
         return {
             "status": "ok",
             "resume_id": resume.id,
-            "extracted_skills": parsed.get("skills", []),
+            "extracted_skills": extracted_skills,
+            "deduplicated": deduplicated,
             "recommendations": recs
         }
+    except HTTPException:
+        raise
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=400, detail=str(e))
 
 
 @router.get("/get-recommendations")
-async def get_recommendations(resume_id: int = None, db: Session = Depends(get_db)):
+async def get_recommendations(response: Response, resume_id: int = None, cursor: str = None, limit: int = None,
+                              include_description: bool = False, db: AsyncSession = Depends(get_async_db)):
     """
     Get AI internship recommendations based on uploaded resume.
     Returns list of internships with match scores.
+
+    Paged with a keyset cursor: pass the `X-Next-Cursor` response header back as
+    `cursor` for the next page. Descriptions are shortened unless `include_description=true`.
     """
     try:
         # Get resume (latest if not specified)
-        if resume_id:
-            resume = db.query(models.Resume).filter(models.Resume.id == resume_id).first()
-        else:
-            resume = db.query(models.Resume).order_by(models.Resume.created_at.desc()).first()
+        resume = await crud_async.get_resume(db, resume_id)
 
         if not resume:
             return []
 
-        # Delegate to the shared helper
-        return compute_recommendations(db, resume)
+        size = max(1, min(limit or DEFAULT_TOP_K, DEFAULT_TOP_K))
+        page = await db.run_sync(get_top_k, resume, k=DEFAULT_TOP_K, after=parse_cursor(cursor), limit=size + 1,
+                                 include_description=include_description)
+        nxt = next_cursor(page, size)
+        if nxt:
+            response.headers["X-Next-Cursor"] = nxt
+        return page[:size]
         
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 
+@router.get("/resumes")
+async def list_resumes(response: Response, student_id: int = None, cursor: int = None, limit: int = None,
+                       db: AsyncSession = Depends(get_async_db)):
+    """
+    List resumes newest first (no parsed text). `cursor` is the `X-Next-Cursor` of the previous page.
+    """
+    size = crud.page_size(limit)
+    # one extra row tells whether a next page exists
+    rows = await crud_async.list_resumes(db, student_id=student_id, before_id=cursor, limit=size + 1)
+    if len(rows) > size:
+        rows = rows[:size]
+        response.headers["X-Next-Cursor"] = str(rows[-1].id)
+    return [{
+        "id": r.id,
+        "student_id": r.student_id,
+        "filename": r.filename,
+        "skills": [s for s in (r.skills or "").split(",") if s],
+        "outcomes": [o for o in (r.outcomes or "").split(",") if o],
+        "created_at": r.created_at.isoformat() if r.created_at else None,
+    } for r in rows]
+
+
+@router.get("/internships")
+async def list_internships(region: str = None, city: str = None, limit: int = 50,
+                           db: AsyncSession = Depends(get_async_db)):
+    """
+    List active internships by normalized region/city (e.g. region=NCR, city=Makati).
+    """
+    rows = await crud_async.list_internships(db, region=region, city=city, limit=max(1, min(limit, 200)))
+    return [{
+        "id": i.id,
+        "title": i.title,
+        "company_name": i.company_name,
+        "location": i.location,
+        "city": i.city,
+        "region": i.region,
+        "posting_url": i.posting_url,
+    } for i in rows]
+
+
 @router.get("/health")
 async def health_check():
     """Health check endpoint."""
@@ -1,25 +1,49 @@
 from fastapi import APIRouter, Depends
 from ..db import get_db
-from .. import crud
-from ..nlp.embedding import load_embedding
-from ..nlp.ranker import build_feature_vector, Ranker
+from .. import crud, metrics, models
+from ..config import settings
+from ..nlp.embedding import coerce_embedding
+from ..nlp.vector_search import nearest_internships
+from ..nlp.lazy import LazyModel
 import numpy as np
-import torch
 import os
-from ..llm.llm_client import explain_match
+from ..llm.llm_client import explain_matches
 
 router = APIRouter(prefix="/recommend", tags=["recommend"])
 RANKER_PATH = os.path.join(os.getcwd(), "backend", "models", "ranker.pt")
-ranker = None
-if os.path.exists(RANKER_PATH):
+
+def _load_ranker():
+    """Load the trained ranker checkpoint, or None when no checkpoint exists (cosine fallback)."""
+    if not os.path.exists(RANKER_PATH):
+        return None
+    import torch
+    from ..nlp.ranker import configure_torch_threads, Ranker
+    configure_torch_threads(settings.TORCH_NUM_THREADS)
     ckpt = torch.load(RANKER_PATH, map_location="cpu")
     input_dim = ckpt.get('input_dim')
     ranker = Ranker(input_dim)
     ranker.load_state_dict(ckpt['state_dict'])
     ranker.eval()
+    return ranker
+
+ranker_model = LazyModel("ranker", _load_ranker)
 
-def cos(a,b):
-    return float(np.dot(a,b)/(np.linalg.norm(a)+1e-8)/(np.linalg.norm(b)+1e-8))
+def cos_many(a, B):
+    """Cosine of vector `a` against every row of `B` in one matrix product."""
+    return (B @ a) / (np.linalg.norm(B, axis=1) + 1e-8) / (np.linalg.norm(a) + 1e-8)
+
+def score_departments(resume_emb, dept_embs, gpa_norm, overlaps, dept_skill_counts):
+    """Score one resume against all departments with a single ranker forward pass (or cosine fallback)."""
+    ranker = ranker_model.get()
+    if ranker:
+        import torch
+        from ..nlp.ranker import build_feature_matrix
+        feats = build_feature_matrix(resume_emb, dept_embs, gpa_norm, overlaps)
+        with metrics.stage("ranker_inference"), torch.no_grad():
+            x = torch.from_numpy(feats.astype(np.float32))
+            return ranker(x).squeeze(1).tolist()
+    base = cos_many(resume_emb, dept_embs)
+    return (base * 0.9 + 0.05 * gpa_norm + 0.05 * (overlaps / np.maximum(1, dept_skill_counts))).tolist()
 
 @router.get("/student/{student_id}")
 def recommend_for_student(student_id:int, db=Depends(get_db)):
@@ -29,25 +53,49 @@ def recommend_for_student(student_id:int, db=Depends(get_db)):
     if not student.resumes:
         return {"error":"student has no resumes"}
     resume = student.resumes[-1]
-    resume_emb = load_embedding(resume.embedding)
-    departments = crud.get_all_departments(db)
+    # stored per resume, stamped with a fingerprint of the departments and the student's GPA
+    catalog_version = crud.department_inputs_version(db, student)
+    stored = crud.get_resume_recommendations(db, resume.id, catalog_version)
+    if stored:
+        # same resume, departments and GPA: serve what was computed last time
+        results = [{"department": r.department.name, "score": r.score, "reason": r.reason} for r in stored]
+        results = sorted(results, key=lambda x: x["score"], reverse=True)
+        return {"student": student.name, "recommendations": results}
+    resume_emb = coerce_embedding(resume.embedding)
+    # departments not embedded yet (see scripts/backfill_embeddings.py) can't be scored
+    departments = [d for d in crud.get_all_departments(db) if d.embedding is not None]
+    if not departments:
+        return {"student": student.name, "recommendations": []}
+    student_skills = set(resume.skills.split(",")) if resume.skills else set()
+    dept_skills = [set(d.required_skills.split(",")) if d.required_skills else set() for d in departments]
+    overlaps = np.array([len(student_skills.intersection(s)) for s in dept_skills], dtype=np.float64)
+    dept_skill_counts = np.array([len(s) for s in dept_skills], dtype=np.float64)
+    dept_embs = np.stack([coerce_embedding(d.embedding) for d in departments])
+    gpa_norm = (student.gpa or 0) / 4.0
+    scores = score_departments(resume_emb, dept_embs, gpa_norm, overlaps, dept_skill_counts)
+    reasons = explain_matches(student, resume, list(zip(departments, scores)))
     results = []
-    for d in departments:
-        dept_emb = load_embedding(d.embedding)
-        student_skills = set(resume.skills.split(",")) if resume.skills else set()
-        dept_skills = set(d.required_skills.split(",")) if d.required_skills else set()
-        overlap = len(student_skills.intersection(dept_skills))
-        gpa_norm = (student.gpa or 0) / 4.0
-        feat = build_feature_vector(resume_emb, dept_emb, gpa_norm, overlap)
-        if ranker:
-            with torch.no_grad():
-                x = torch.tensor(feat, dtype=torch.float).unsqueeze(0)
-                score = float(ranker(x).squeeze().item())
-        else:
-            base = cos(resume_emb, dept_emb)
-            score = base * 0.9 + 0.05 * gpa_norm + 0.05 * (overlap/ max(1, len(dept_skills)))
-        reason = explain_match(student, resume, d, score)
-        rec = crud.create_recommendation(db, student.id, d.id, score, reason)
+    rows = []
+    for d, score, reason in zip(departments, scores, reasons):
+        rows.append({"department_id": d.id, "score": score, "reason": reason})
         results.append({"department": d.name, "score": score, "reason": reason})
+    crud.save_recommendations(db, student.id, resume.id, catalog_version, rows)
     results = sorted(results, key=lambda x: x["score"], reverse=True)
     return {"student": student.name, "recommendations": results}
+
+@router.get("/resume/{resume_id}/nearest")
+def nearest_internships_for_resume(resume_id:int, k:int=20, db=Depends(get_db)):
+    """Semantic candidates: the k active internships whose embeddings are closest to the resume's."""
+    resume = db.query(models.Resume).filter(models.Resume.id == resume_id).first()
+    if not resume:
+        return {"error":"resume not found"}
+    query_vec = coerce_embedding(resume.embedding)
+    if query_vec is None:
+        return {"error":"resume has no embedding"}
+    hits = nearest_internships(db, query_vec, k=max(1, min(k, 100)))
+    by_id = {r.id: r for r in db.query(models.Internship.id, models.Internship.title, models.Internship.company_name)
+             .filter(models.Internship.id.in_([h[0] for h in hits])).all()}
+    return {"resume_id": resume.id, "matches": [
+        {"id": iid, "title": by_id[iid].title, "company_name": by_id[iid].company_name, "similarity": 1.0 - dist}
+        for iid, dist in hits if iid in by_id
+    ]}
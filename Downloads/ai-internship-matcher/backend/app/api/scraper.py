@@ -1,65 +1,69 @@
-import requests
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from bs4 import BeautifulSoup
 from fastapi import APIRouter, Depends, HTTPException
 import time
 from urllib.parse import urljoin
 from ..config import settings
 from ..db import get_db
+from sqlalchemy import insert, tuple_
 from sqlalchemy.orm import Session
-from .. import models
-from ..nlp.parser import extract_skills_from_text
-from ..utils.location import is_philippines_location
+from .. import crud, metrics, models
+from ..nlp.parser import extract_skills_batch
+from ..nlp.scoring import split_skills
+from ..utils.location import classify_locations
+from ..catalog import bump_catalog_version, read_catalog_version
+from ..topk import apply_catalog_delta
+from ..utils.rapidapi import fetch_internships, RapidAPIError
 
 router = APIRouter(prefix="/scrape", tags=["scrape"])
 HEADERS = {"User-Agent": "InternshipMatcherBot/0.1 (email@example.com)"}
 
 # RapidAPI configuration for Internships API
-RAPIDAPI_KEY = getattr(settings, "RAPID_API_KEY", "")
-RAPIDAPI_HOST = getattr(settings, "RAPID_API_HOST", "internships-api.p.rapidapi.com")
+RAPIDAPI_KEY = settings.RAPID_API_KEY
+RAPIDAPI_HOST = settings.RAPID_API_HOST
 
 
-@router.get("/internships")
-def scrape_internships(query: str = "internship", limit: int = 10, db: Session = Depends(get_db)):
-    """
-    Fetch internship listings from RapidAPI Internships API (primary scraper).
-    Requires RAPID_API_KEY and RAPID_API_HOST environment variables.
-    Returns structured internship data with skills, locations, and company info.
-    """
-    if not RAPIDAPI_KEY:
-        raise HTTPException(
-            status_code=400,
-            detail="RAPID_API_KEY not configured. Set it in .env file."
-        )
+def _run_async(coro):
+    """Run `coro` to completion from sync code, even when called inside a running event loop."""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        return pool.submit(asyncio.run, coro).result()
 
-    results = []
-    inserted = 0
 
-    url = f"https://{RAPIDAPI_HOST}/search"
-    headers = {
-        "x-rapidapi-key": RAPIDAPI_KEY,
-        "x-rapidapi-host": RAPIDAPI_HOST
-    }
-    params = {
-        "keyword": query,
-        "limit": min(limit, 50),  # API may have limits
-    }
+# Max (title, company) pairs per dedupe query; keeps bind parameter counts bounded for large imports
+DEDUPE_CHUNK = 1000
 
-    try:
-        response = requests.get(url, headers=headers, params=params, timeout=10)
-        response.raise_for_status()
-    except requests.exceptions.RequestException as e:
-        raise HTTPException(status_code=502, detail=f"RapidAPI request failed: {str(e)}")
 
-    try:
-        data = response.json()
-        internships_list = data.get("jobs", data.get("results", data.get("data", [])))
-        
-        if not isinstance(internships_list, list):
-            internships_list = []
-    except Exception as e:
-        raise HTTPException(status_code=502, detail=f"Failed to parse RapidAPI response: {str(e)}")
-
-    for item in internships_list:
+def existing_title_company_pairs(db: Session, pairs):
+    """Return the subset of `(title, company_name)` pairs that already exist, in one query per chunk."""
+    pairs = list(pairs)
+    found = set()
+    for i in range(0, len(pairs), DEDUPE_CHUNK):
+        rows = db.query(models.Internship.title, models.Internship.company_name).filter(
+            tuple_(models.Internship.title, models.Internship.company_name).in_(pairs[i:i + DEDUPE_CHUNK])
+        ).all()
+        found.update((r.title, r.company_name) for r in rows)
+    return found
+
+
+def ingest_internships(db: Session, internships_list):
+    """Map RapidAPI items to `Internship` rows, dedupe them and insert the new ones in one transaction.
+
+    Returns `(results, inserted)` where `results` has one status dict per item.
+    """
+    results = []
+    pending = []
+    places = classify_locations({
+        "location": item.get("location") or item.get("city") or "",
+        "posting_url": item.get("url") or item.get("link") or "",
+        "description": item.get("description") or item.get("summary") or "",
+        "country": item.get("country") or item.get("country_name") or None,
+    } for item in internships_list)
+    for item, place in zip(internships_list, places):
         # Map RapidAPI fields to our model
         title = item.get("title") or item.get("job_title") or ""
         company = item.get("company") or item.get("company_name") or ""
@@ -67,57 +71,96 @@ def scrape_internships(query: str = "internship", limit: int = 10, db: Session =
         description = item.get("description") or item.get("summary") or ""
         posting_url = item.get("url") or item.get("link") or ""
         posted_date_str = item.get("posted_date") or item.get("date") or None
-        
-        # Extract required skills from description using NLP
-        try:
-            skills = extract_skills_from_text(description)
+
+        # Enforce Philippines-only postings
+        if not place.is_ph:
+            results.append({"title": title, "company": company, "saved": False, "reason": "non-PH"})
+            continue
+
+        entry = {"title": title, "company": company}
+        results.append(entry)
+        pending.append((entry, item, {
+            "title": title or "Unknown",
+            "company_name": company or "Unknown",
+            "location": location,
+            "city": place.city,
+            "region": place.region,
+            "description": description,
+            "posting_url": posting_url,
+            "posted_date": posted_date_str,
+            "is_active": 1,
+            "source": "rapidapi",
+        }))
+
+    # Dedupe by title + company against the DB and within this batch
+    seen = existing_title_company_pairs(db, {(row["title"], row["company_name"]) for _, _, row in pending})
+    fresh = []
+    for entry, item, row in pending:
+        key = (row["title"], row["company_name"])
+        if key in seen:
+            entry["saved"] = False
+            continue
+        seen.add(key)
+        fresh.append((entry, item, row))
+
+    # Extract required skills for the new postings in one NLP batch
+    try:
+        extracted = extract_skills_batch([row["description"] for _, _, row in fresh], n_process=settings.SPACY_N_PROCESS)
+    except Exception:
+        extracted = [None] * len(fresh)
+    new_rows = []
+    for (entry, item, row), skills in zip(fresh, extracted):
+        if skills is None:
+            skills = []
+        else:
             # Also check for skills field in API response if available
-            if item.get("skills"):
-                api_skills = item.get("skills")
+            api_skills = item.get("skills")
+            if api_skills:
                 if isinstance(api_skills, list):
                     skills.extend(api_skills)
                 elif isinstance(api_skills, str):
                     skills.extend([s.strip() for s in api_skills.split(",")])
             skills = list(set(skills))  # dedupe
-        except Exception:
-            skills = []
+        row["required_skills"] = ",".join(skills) if skills else ""
+        new_rows.append(row)
+        entry.update({"location": row["location"], "saved": True, "skills": skills})
 
-        # Enforce Philippines-only postings: use stricter helper when possible
-        country = item.get("country") or item.get("country_name") or None
-        if not is_philippines_location(location, posting_url, description, country):
-            results.append({"title": title, "company": company, "saved": False, "reason": "non-PH"})
-            continue
+    if new_rows:
+        prev_version = read_catalog_version(db)
+        # executemany RETURNING only lines up with new_rows when the order is requested explicitly
+        stmt = insert(models.Internship).returning(models.Internship.id, sort_by_parameter_order=True)
+        new_ids = db.execute(stmt, new_rows).scalars().all()
+        db.commit()
+        crud.sync_internship_skills(db, {i: split_skills(row["required_skills"]) for i, row in zip(new_ids, new_rows)})
+        new_version = bump_catalog_version(db)
+        # score only the new postings against stored per-resume top-k lists
+        apply_catalog_delta(db, prev_version, new_version, added_ids=new_ids)
+    return results, len(new_rows)
 
-        # Dedupe by title + company
-        exists = db.query(models.Internship).filter(
-            models.Internship.title == title,
-            models.Internship.company_name == company
-        ).first()
-        if exists:
-            results.append({"title": title, "company": company, "saved": False})
-            continue
 
-        internship = models.Internship(
-            title=title or "Unknown",
-            company_name=company or "Unknown",
-            location=location,
-            description=description,
-            required_skills=",".join(skills) if skills else "",
-            posting_url=posting_url,
-            posted_date=posted_date_str,
-            is_active=1,
-            source="rapidapi"
+@router.get("/internships")
+@metrics.timed("scrape_internships")
+def scrape_internships(query: str = "internship", limit: int = 10, db: Session = Depends(get_db)):
+    """
+    Fetch internship listings from RapidAPI Internships API (primary scraper).
+    Requires RAPID_API_KEY and RAPID_API_HOST environment variables.
+    `query` may hold several comma-separated keywords; they are fetched concurrently,
+    paging until `limit` postings per keyword (rate limited by JOBSCRAPER_RATE_LIMIT).
+    Returns structured internship data with skills, locations, and company info.
+    """
+    if not RAPIDAPI_KEY:
+        raise HTTPException(
+            status_code=400,
+            detail="RAPID_API_KEY not configured. Set it in .env file."
         )
-        db.add(internship)
-        db.commit()
-        inserted += 1
-        results.append({
-            "title": title,
-            "company": company,
-            "location": location,
-            "saved": True,
-            "skills": skills
-        })
+
+    keywords = [k.strip() for k in query.split(",") if k.strip()] or ["internship"]
+    try:
+        internships_list = _run_async(fetch_internships(keywords, limit=max(1, limit), api_key=RAPIDAPI_KEY))
+    except RapidAPIError as e:
+        raise HTTPException(status_code=502, detail=str(e))
+
+    results, inserted = ingest_internships(db, internships_list)
 
     return {
         "source": "RapidAPI Internships",
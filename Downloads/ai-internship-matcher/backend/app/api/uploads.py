@@ -1,26 +1,29 @@
 from fastapi import APIRouter, UploadFile, File, Depends, HTTPException
-from ..nlp.parser import parse_resume
-from ..nlp.embedding import embed_text, save_embedding
-from ..db import get_db
-from .. import crud, models
-import shutil, os
+from fastapi.responses import JSONResponse
+from ..db import get_async_db
+from .. import crud_async
+from .frontend_api import enqueue_resume, receive_upload
+import asyncio, os
 
 router = APIRouter(prefix="/upload", tags=["upload"])
 UPLOAD_DIR = os.path.join(os.getcwd(), "backend", "uploads")
 os.makedirs(UPLOAD_DIR, exist_ok=True)
 
 @router.post("/resume/{student_id}")
-async def upload_resume(student_id:int, file: UploadFile = File(...), db=Depends(get_db)):
+async def upload_resume(student_id:int, file: UploadFile = File(...), wait: bool = True, db=Depends(get_async_db)):
     filename = f"{student_id}_{file.filename}"
-    path = os.path.join(UPLOAD_DIR, filename)
-    with open(path, "wb") as f:
-        shutil.copyfileobj(file.file, f)
-    parsed = parse_resume(path)
-    emb = embed_text(parsed["text"])
-    emb_path = save_embedding(student_id, emb, prefix="resume")
-    resume = crud.create_resume(db, student_id=student_id, filename=filename,
-                                parsed_text=parsed["text"],
-                                skills=",".join(parsed["skills"]),
-                                outcomes=",".join(parsed["outcomes"]),
-                                embedding_path=emb_path)
-    return {"status":"ok", "resume_id": resume.id}
+    path, content_hash = await receive_upload(file, UPLOAD_DIR, filename)
+    existing = await crud_async.get_resume_by_hash(db, content_hash, student_id=student_id)
+    if existing is not None:
+        # same bytes were parsed before: reuse that parse/embedding instead of running the pipeline again
+        if existing.student_id != student_id:
+            existing = await crud_async.copy_resume(db, existing, student_id=student_id, filename=filename)
+        elif existing.filename != filename:
+            os.remove(path)
+        return {"status":"ok", "resume_id": existing.id, "deduplicated": True}
+    # parse + embed on the worker pool; wait=false returns the job id for /api/jobs/{job_id}
+    job = await enqueue_resume(path, filename, student_id=student_id, content_hash=content_hash)
+    if not wait:
+        return JSONResponse({"status": "queued", "job_id": job.id}, status_code=202)
+    result = await asyncio.wrap_future(job.future)
+    return {"status":"ok", "resume_id": result["resume_id"]}
@@ -0,0 +1,122 @@
+"""Process-level snapshot of the active internship catalog.
+
+Request handlers score against an immutable `CatalogSnapshot` instead of
+hydrating every `Internship` row per call. The snapshot is stamped with the
+version stored in `catalog_meta`; ingest paths call `bump_catalog_version`
+and readers rebuild lazily and swap the module-level reference in one
+assignment, so a request always sees a complete snapshot.
+"""
+import threading
+import time
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from . import models
+from .config import settings
+from .nlp.scoring import ScoringEngine
+
+CATALOG_COLUMNS = (
+    models.Internship.id,
+    models.Internship.title,
+    models.Internship.company_name,
+    models.Internship.location,
+    models.Internship.description,
+    models.Internship.posting_url,
+    models.Internship.posted_date,
+    models.Internship.required_skills,
+)
+
+
+class CatalogSnapshot:
+    """Immutable view of the active catalog at one version."""
+
+    def __init__(self, version: int, engine: ScoringEngine):
+        self.version = version
+        self.engine = engine
+        self.loaded_at = time.monotonic()
+
+    def __len__(self):
+        return len(self.engine)
+
+
+_snapshot: Optional[CatalogSnapshot] = None
+_checked_at = 0.0
+_build_lock = threading.Lock()
+
+
+def read_catalog_version(db: Session) -> int:
+    """Current catalog version as stored in the database (0 if never bumped)."""
+    return db.query(models.CatalogMeta.version).filter(models.CatalogMeta.id == 1).scalar() or 0
+
+
+def bump_catalog_version(db: Session) -> int:
+    """Mark the catalog as changed; call after internships are inserted or deactivated."""
+    global _checked_at
+    now = datetime.utcnow()
+    dialect = db.get_bind().dialect.name
+    if dialect in ("postgresql", "sqlite"):
+        # one atomic upsert: two first-ever bumps in different workers can't both try to insert id=1
+        insert = postgresql_insert if dialect == "postgresql" else sqlite_insert
+        stmt = insert(models.CatalogMeta).values(id=1, version=1, updated_at=now)
+        db.execute(stmt.on_conflict_do_update(
+            index_elements=[models.CatalogMeta.id],
+            set_={"version": models.CatalogMeta.version + 1, "updated_at": now},
+        ))
+    else:
+        # the row is seeded by migration 0002, so this update normally hits it
+        updated = db.query(models.CatalogMeta).filter(models.CatalogMeta.id == 1).update(
+            {models.CatalogMeta.version: models.CatalogMeta.version + 1, models.CatalogMeta.updated_at: now},
+            synchronize_session=False,
+        )
+        if not updated:
+            db.add(models.CatalogMeta(id=1, version=1, updated_at=now))
+    db.commit()
+    # force the next reader in this process to re-check the stored version
+    _checked_at = 0.0
+    return read_catalog_version(db)
+
+
+def load_snapshot(db: Session, version: int) -> CatalogSnapshot:
+    """Build a snapshot from the active internships, loading only the scored/displayed columns."""
+    rows = (
+        db.query(*CATALOG_COLUMNS)
+        .filter(models.Internship.is_active == 1)
+        .order_by(models.Internship.id)
+        .all()
+    )
+    return CatalogSnapshot(version, ScoringEngine([dict(r._mapping) for r in rows]))
+
+
+def get_catalog(db: Session) -> CatalogSnapshot:
+    """Return the current snapshot, rebuilding it if the stored version moved.
+
+    The version row is consulted at most every `CATALOG_VERSION_CHECK_SECONDS`,
+    which also picks up ingests done by other worker processes.
+    """
+    global _snapshot, _checked_at
+    snap = _snapshot
+    now = time.monotonic()
+    if snap is not None and now - _checked_at < settings.CATALOG_VERSION_CHECK_SECONDS:
+        return snap
+    version = read_catalog_version(db)
+    if snap is not None and snap.version == version:
+        _checked_at = now
+        return snap
+    with _build_lock:
+        snap = _snapshot
+        if snap is None or snap.version != version:
+            snap = load_snapshot(db, version)
+            _snapshot = snap
+        _checked_at = time.monotonic()
+    return snap
+
+
+def invalidate_catalog():
+    """Drop the cached snapshot so the next reader reloads it."""
+    global _snapshot, _checked_at
+    _snapshot = None
+    _checked_at = 0.0
@@ -1,6 +1,11 @@
-from sqlalchemy.orm import Session
+from sqlalchemy import insert, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session, joinedload
 from . import models
+from .config import settings
+from .catalog import bump_catalog_version, read_catalog_version
 from datetime import datetime
+import hashlib
 
 def create_student(db: Session, name:str, email:str, program:str, gpa:float=None, protected_age:int=None):
     s = models.Student(name=name, email=email, program=program, gpa=gpa, protected_age=protected_age)
@@ -10,19 +15,152 @@ def create_student(db: Session, name:str, email:str, program:str, gpa:float=None
 def get_student(db: Session, student_id:int):
     return db.query(models.Student).filter(models.Student.id==student_id).first()
 
-def list_students(db: Session, skip:int=0, limit:int=100):
-    return db.query(models.Student).offset(skip).limit(limit).all()
+def page_size(limit:int=None):
+    """Clamp a client-supplied page size to 1..MAX_PAGE_SIZE (PAGE_SIZE when missing)."""
+    return max(1, min(limit or settings.PAGE_SIZE, settings.MAX_PAGE_SIZE))
+
+# Read queries below are built as select() statements so `crud_async` runs the same SQL on an AsyncSession
+
+def students_page_stmt(after_id:int=None, limit:int=100):
+    q = select(models.Student.id, models.Student.name, models.Program.name.label("program")).outerjoin(
+        models.Program, models.Program.id==models.Student.program_id)
+    if after_id is not None:
+        q = q.where(models.Student.id > after_id)
+    return q.order_by(models.Student.id).limit(limit)
+
+def list_students(db: Session, after_id:int=None, limit:int=100):
+    """Keyset page of students by id: `(id, name, program)` rows, `program` being the program name."""
+    return db.execute(students_page_stmt(after_id, limit)).all()
+
+def resumes_page_stmt(student_id:int=None, before_id:int=None, limit:int=100):
+    r = models.Resume
+    q = select(r.id, r.student_id, r.filename, r.skills, r.outcomes, r.created_at)
+    if student_id is not None:
+        q = q.where(r.student_id==student_id)
+    if before_id is not None:
+        q = q.where(r.id < before_id)
+    return q.order_by(r.id.desc()).limit(limit)
+
+def list_resumes(db: Session, student_id:int=None, before_id:int=None, limit:int=100):
+    """Keyset page of resumes, newest first, without the parsed text or embedding."""
+    return db.execute(resumes_page_stmt(student_id, before_id, limit)).all()
+
+def resume_stmt(resume_id:int=None):
+    """The resume with `resume_id`, or the latest one when it is None."""
+    q = select(models.Resume)
+    if resume_id:
+        return q.where(models.Resume.id==resume_id)
+    return q.order_by(models.Resume.created_at.desc()).limit(1)
+
+def get_resume(db: Session, resume_id:int=None):
+    return db.scalars(resume_stmt(resume_id)).first()
 
 def create_resume(db: Session, student_id:int, filename:str, parsed_text:str, skills:str, outcomes:str, embedding_path:str):
     r = models.Resume(student_id=student_id, filename=filename, parsed_text=parsed_text, skills=skills, outcomes=outcomes, embedding=embedding_path)
     db.add(r); db.commit(); db.refresh(r)
     return r
 
+def get_resume_by_hash(db: Session, content_hash:str, student_id:int=None):
+    """Latest parsed resume with this file hash, preferring one owned by `student_id`."""
+    own, latest = resume_by_hash_stmts(content_hash, student_id)
+    if own is not None:
+        found = db.scalars(own).first()
+        if found:
+            return found
+    return db.scalars(latest).first()
+
+def resume_by_hash_stmts(content_hash:str, student_id:int=None):
+    """(the student's own match or None, the latest match) for `get_resume_by_hash`."""
+    q = select(models.Resume).where(models.Resume.content_hash==content_hash, models.Resume.parsed_text.isnot(None))
+    q = q.order_by(models.Resume.id.desc()).limit(1)
+    return (q.where(models.Resume.student_id==student_id) if student_id is not None else None), q
+
+def resume_copy(source: models.Resume, student_id:int, filename:str):
+    return models.Resume(student_id=student_id, filename=filename, parsed_text=source.parsed_text, skills=source.skills,
+                         outcomes=source.outcomes, embedding=source.embedding, content_hash=source.content_hash)
+
+def copy_resume(db: Session, source: models.Resume, student_id:int, filename:str):
+    """New Resume row for `student_id` reusing the parse, skills and embedding of an identical upload."""
+    r = resume_copy(source, student_id, filename)
+    db.add(r); db.commit(); db.refresh(r)
+    return r
+
 def create_department(db: Session, name:str, program_focus:str, description:str, required_skills:str, embedding_path:str=None):
     d = models.InternshipDepartment(name=name, program_focus=program_focus, description=description, required_skills=required_skills, embedding=embedding_path)
     db.add(d); db.commit(); db.refresh(d)
     return d
 
+def department_inputs_version(db: Session, student) -> int:
+    """Fingerprint of what a student's department recommendations depend on besides the resume.
+
+    Covers every department's name, focus, description, skills and embedding model (re-embedding
+    changes the model) plus the student's GPA, so any edit to them, through whatever path,
+    misses the stored recommendations. Stored in `Recommendation.catalog_version`.
+    """
+    D = models.InternshipDepartment
+    h = hashlib.sha256()
+    for row in db.query(D.id, D.name, D.program_focus, D.description, D.required_skills, D.embedding_model).order_by(D.id):
+        h.update(repr(tuple(row)).encode("utf-8"))
+    h.update(repr(student.gpa).encode("utf-8"))
+    # fits the Integer column
+    return int.from_bytes(h.digest()[:4], "big") & 0x7FFFFFFF
+
+def internships_stmt(region:str=None, city:str=None, limit:int=100):
+    q = select(models.Internship).where(models.Internship.is_active==1)
+    if region:
+        q = q.where(models.Internship.region==region)
+    if city:
+        q = q.where(models.Internship.city==city)
+    return q.order_by(models.Internship.id.desc()).limit(limit)
+
+def list_internships(db: Session, region:str=None, city:str=None, limit:int=100):
+    """Active internships filtered on the indexed region/city columns set at ingest."""
+    return db.scalars(internships_stmt(region, city, limit)).all()
+
+def _insert_ignore(db: Session, model):
+    """INSERT that skips rows hitting a unique constraint (postgres/sqlite), plain INSERT elsewhere."""
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        return postgresql.insert(model).on_conflict_do_nothing()
+    if dialect == "sqlite":
+        return sqlite.insert(model).on_conflict_do_nothing()
+    return insert(model)
+
+def get_skill_ids(db: Session, names):
+    """Ids of the given skill names in the skills dictionary, adding the missing ones."""
+    names = sorted({n.strip().lower() for n in names if n and n.strip()})
+    if not names:
+        return {}
+    db.execute(_insert_ignore(db, models.Skill), [{"name": n} for n in names])
+    return dict(db.query(models.Skill.name, models.Skill.id).filter(models.Skill.name.in_(names)).all())
+
+def sync_internship_skills(db: Session, skills_by_internship:dict):
+    """Mirror `{internship_id: [skill, ...]}` into internship_skills and skill_count, in one commit."""
+    if not skills_by_internship:
+        return
+    per_row = {i: {s.strip().lower() for s in skills if s and s.strip()} for i, skills in skills_by_internship.items()}
+    ids = get_skill_ids(db, set().union(*per_row.values()))
+    db.query(models.InternshipSkill).filter(models.InternshipSkill.internship_id.in_(list(per_row))).delete(
+        synchronize_session=False)
+    links = [{"internship_id": i, "skill_id": ids[n]} for i, names in per_row.items() for n in names]
+    if links:
+        db.execute(insert(models.InternshipSkill), links)
+    db.execute(update(models.Internship), [{"id": i, "skill_count": len(names)} for i, names in per_row.items()])
+    db.commit()
+
+def deactivate_internships(db: Session, internship_ids:list):
+    """Mark postings inactive and evict them from the stored per-resume top-k lists."""
+    from .topk import apply_catalog_delta
+    if not internship_ids:
+        return 0
+    prev_version = read_catalog_version(db)
+    n = db.query(models.Internship).filter(models.Internship.id.in_(internship_ids), models.Internship.is_active==1).update(
+        {models.Internship.is_active: 0}, synchronize_session=False)
+    db.commit()
+    if n:
+        apply_catalog_delta(db, prev_version, bump_catalog_version(db))
+    return n
+
 def get_all_departments(db: Session):
     return db.query(models.InternshipDepartment).all()
 
@@ -30,3 +168,51 @@ def create_recommendation(db: Session, student_id:int, department_id:int, score:
     rec = models.Recommendation(student_id=student_id, department_id=department_id, score=score, reason=reason, created_at=datetime.utcnow())
     db.add(rec); db.commit(); db.refresh(rec)
     return rec
+
+def get_resume_recommendations(db: Session, resume_id:int, catalog_version:int, target:str="department_id", exists:bool=False):
+    """Stored recommendations of a resume computed against `catalog_version` (empty if none).
+
+    With `exists=True` only whether any are stored is returned.
+    """
+    col = getattr(models.Recommendation, target)
+    q = db.query(models.Recommendation).filter(
+        models.Recommendation.resume_id==resume_id,
+        models.Recommendation.catalog_version==catalog_version,
+        col.isnot(None),
+    )
+    if exists:
+        return db.query(q.exists()).scalar()
+    if target == "department_id":
+        # callers read r.department.name; load them in the same query instead of one SELECT per row
+        q = q.options(joinedload(models.Recommendation.department))
+    return q.all()
+
+def save_recommendations(db: Session, student_id:int, resume_id:int, catalog_version:int, rows:list, target:str="department_id"):
+    """Persist a resume's recommendations in one transaction.
+
+    `rows` are dicts with `target` (department_id or internship_id), `score` and `reason`.
+    Inserts are idempotent on (resume, target, catalog version) and rows from older
+    catalog versions of the same resume are dropped.
+    """
+    if not rows:
+        return
+    now = datetime.utcnow()
+    values = [dict(r, student_id=student_id, resume_id=resume_id, catalog_version=catalog_version, created_at=now) for r in rows]
+    col = getattr(models.Recommendation, target)
+    db.query(models.Recommendation).filter(
+        models.Recommendation.resume_id==resume_id,
+        models.Recommendation.catalog_version!=catalog_version,
+        col.isnot(None),
+    ).delete(synchronize_session=False)
+    db.execute(insert_recommendations_stmt(db, target), values)
+    db.commit()
+
+def insert_recommendations_stmt(db: Session, target:str="department_id"):
+    """INSERT for Recommendation rows that skips rows already stored for the same (resume, target, catalog version)."""
+    col = getattr(models.Recommendation, target)
+    dialect = db.get_bind().dialect.name
+    if dialect in ("postgresql", "sqlite"):
+        dialect_insert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+        return dialect_insert(models.Recommendation).on_conflict_do_nothing(
+            index_elements=["resume_id", target, "catalog_version"], index_where=col.isnot(None))
+    return insert(models.Recommendation)
@@ -0,0 +1,41 @@
+"""Async counterparts of the `crud` functions used by `async def` routes.
+
+They take an `AsyncSession` (`get_async_db`) and run the statements built in
+`crud`, so both versions issue the same SQL.
+"""
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from . import crud, models
+
+
+async def list_students(db: AsyncSession, after_id: int = None, limit: int = 100):
+    return (await db.execute(crud.students_page_stmt(after_id, limit))).all()
+
+
+async def list_resumes(db: AsyncSession, student_id: int = None, before_id: int = None, limit: int = 100):
+    return (await db.execute(crud.resumes_page_stmt(student_id, before_id, limit))).all()
+
+
+async def get_resume(db: AsyncSession, resume_id: int = None):
+    return (await db.scalars(crud.resume_stmt(resume_id))).first()
+
+
+async def get_resume_by_hash(db: AsyncSession, content_hash: str, student_id: int = None):
+    own, latest = crud.resume_by_hash_stmts(content_hash, student_id)
+    if own is not None:
+        found = (await db.scalars(own)).first()
+        if found:
+            return found
+    return (await db.scalars(latest)).first()
+
+
+async def copy_resume(db: AsyncSession, source: models.Resume, student_id: int, filename: str):
+    r = crud.resume_copy(source, student_id, filename)
+    db.add(r)
+    await db.commit()
+    await db.refresh(r)
+    return r
+
+
+async def list_internships(db: AsyncSession, region: str = None, city: str = None, limit: int = 100):
+    return (await db.scalars(crud.internships_stmt(region, city, limit))).all()
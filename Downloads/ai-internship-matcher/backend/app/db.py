@@ -1,14 +1,67 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
 from .config import settings
+from .utils import query_stats
 
-engine = create_engine(settings.DATABASE_URL, pool_pre_ping=True)
+# asyncio driver used for each backend when ASYNC_DATABASE_URL is not set
+ASYNC_DRIVERS = {"postgresql": "asyncpg", "sqlite": "aiosqlite"}
+
+def async_database_url(url: str):
+    """DATABASE_URL with its driver swapped for the asyncio one (postgresql -> asyncpg, sqlite -> aiosqlite)."""
+    u = make_url(url)
+    driver = ASYNC_DRIVERS.get(u.get_backend_name())
+    return u.set(drivername=f"{u.get_backend_name()}+{driver}") if driver else u
+
+def pool_options(url) -> dict:
+    """Explicit pool sizing from settings; SQLite keeps SQLAlchemy's own pool choice."""
+    if make_url(url).get_backend_name() == "sqlite":
+        return {}
+    return {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+    }
+
+engine = create_engine(settings.DATABASE_URL, pool_pre_ping=True, **pool_options(settings.DATABASE_URL))
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
+# Async engine for the `async def` routes, so DB waits yield the event loop instead of blocking it
+_async_url = settings.ASYNC_DATABASE_URL or async_database_url(settings.DATABASE_URL)
+async_engine = create_async_engine(_async_url, pool_pre_ping=True, **pool_options(_async_url))
+# expire_on_commit=False: attributes stay readable after commit without an implicit (sync) refresh
+AsyncSessionLocal = async_sessionmaker(async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+
+if async_engine.dialect.driver == "asyncpg":
+    try:
+        from pgvector.asyncpg import register_vector
+    except ImportError:
+        register_vector = None
+    if register_vector is not None:
+        @event.listens_for(async_engine.sync_engine, "connect")
+        def _register_vector(dbapi_connection, connection_record):
+            # asyncpg needs the vector codec per connection (psycopg2 goes through the SQLAlchemy type)
+            dbapi_connection.run_async(register_vector)
+
+def instrument(engine):
+    """Feed every statement's duration into the current request's `query_stats`."""
+    event.listen(engine, "before_cursor_execute", query_stats.before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", query_stats.after_cursor_execute)
+
+if settings.SQL_STATS:
+    instrument(engine)
+    instrument(async_engine.sync_engine)
+
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
         db.close()
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -0,0 +1,193 @@
+"""Bounded process pool for CPU-bound resume work, with job status in the database.
+
+Parsing (pdfminer + spaCy) runs in `JOB_WORKERS` child processes instead of
+on the uvicorn event loop. `submit` refuses new work with `JobQueueFull` once
+`JOB_QUEUE_LIMIT` jobs of this process are queued or running, so a burst of
+large PDFs turns into 429s instead of a stalled server.
+
+A job may have a `then` step that runs in this process once the child is done
+(on a small thread pool, off the event loop, as are the status updates): uploads embed and insert the
+Resume row there, so `embed_text` goes through this process's micro-batcher
+and embedding cache like every other caller.
+
+Status lives in the `upload_jobs` table rather than in memory, so
+`GET /api/jobs/{id}` works whichever uvicorn worker accepted the upload;
+rows are kept for `JOB_RESULT_TTL_SECONDS` after they finish.
+"""
+import json
+import multiprocessing
+import threading
+import time
+import uuid
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, Optional
+
+from . import metrics, models
+from .config import settings
+from .db import SessionLocal
+
+
+class JobQueueFull(Exception):
+    """Raised when the pool already holds JOB_QUEUE_LIMIT unfinished jobs."""
+
+
+class Job:
+    """Handle on a job submitted by this process; `future` resolves with the final result."""
+
+    def __init__(self, kind: str):
+        self.id = uuid.uuid4().hex
+        self.kind = kind
+        self.future: Future = Future()
+        self.created_at = time.time()
+
+
+_pool: Optional[ProcessPoolExecutor] = None
+# runs the `then` steps; several at once so their embed_text calls can share a batch
+_then_pool = ThreadPoolExecutor(max_workers=max(2, settings.JOB_WORKERS), thread_name_prefix="job-then")
+_jobs: Dict[str, Job] = {}
+_lock = threading.Lock()
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        # spawn: children import their own models instead of inheriting torch/DB state through fork
+        # each worker may start its own page pool (pdf_extract) for long PDFs, stopped when the worker exits
+        _pool = ProcessPoolExecutor(max_workers=settings.JOB_WORKERS,
+                                    mp_context=multiprocessing.get_context(settings.JOB_START_METHOD))
+    return _pool
+
+
+def _set_status(job_id: str, status: str, result: Any = None, error: Optional[str] = None):
+    values = {"status": status}
+    if status in ("done", "failed"):
+        values.update(finished_at=time.time(), result=json.dumps(result) if result is not None else None, error=error)
+    db = SessionLocal()
+    try:
+        db.query(models.UploadJob).filter(models.UploadJob.id == job_id).update(values, synchronize_session=False)
+        db.commit()
+    finally:
+        db.close()
+
+
+def _record(job: Job):
+    """Insert the queued row and drop rows that finished more than JOB_RESULT_TTL_SECONDS ago."""
+    db = SessionLocal()
+    try:
+        db.query(models.UploadJob).filter(
+            models.UploadJob.finished_at < job.created_at - settings.JOB_RESULT_TTL_SECONDS).delete(synchronize_session=False)
+        db.add(models.UploadJob(id=job.id, kind=job.kind, status="queued", created_at=job.created_at))
+        db.commit()
+    finally:
+        db.close()
+
+
+def _run(job_id: str, fn: Callable, *args):
+    """Child-process entry point: mark the job running, then run it."""
+    _set_status(job_id, "running")
+    return fn(*args)
+
+
+def pending() -> int:
+    return len(_jobs)
+
+
+def _finish(job: Job, result: Any = None, error: Optional[BaseException] = None):
+    with _lock:
+        _jobs.pop(job.id, None)
+    metrics.observe(f"job_{job.kind}", time.time() - job.created_at, error is not None)
+    try:
+        _set_status(job.id, "failed" if error else "done", result=result, error=str(error) if error else None)
+    finally:
+        if error:
+            job.future.set_exception(error)
+        else:
+            job.future.set_result(result)
+
+
+def submit(kind: str, fn: Callable, *args, then: Optional[Callable[[Any], Any]] = None) -> Job:
+    """Run `fn(*args)` in a worker process, then `then(result)` here; the job's result is the last step's."""
+    job = Job(kind)
+    with _lock:
+        if pending() >= settings.JOB_QUEUE_LIMIT:
+            raise JobQueueFull(f"{settings.JOB_QUEUE_LIMIT} jobs already queued")
+        _jobs[job.id] = job
+    try:
+        _record(job)
+        try:
+            child = _get_pool().submit(_run, job.id, fn, *args)
+        except BrokenProcessPool:
+            # a worker died (OOM, segfault in a parser); start a fresh pool rather than failing every upload
+            shutdown()
+            child = _get_pool().submit(_run, job.id, fn, *args)
+    except BaseException:
+        with _lock:
+            _jobs.pop(job.id, None)
+        raise
+
+    def _then(result):
+        try:
+            _finish(job, then(result))
+        except Exception as e:
+            _finish(job, error=e)
+
+    def _after_child(future):
+        if future.cancelled():
+            return _finish(job, error=RuntimeError("job cancelled"))
+        if future.exception() is not None:
+            return _finish(job, error=future.exception())
+        result = future.result()
+        if isinstance(result, dict):
+            # stage timings measured inside the worker, merged into this process's /metrics
+            metrics.merge(result.pop("stage_timings", None))
+        if then is None:
+            _finish(job, result)
+        else:
+            _then(result)
+
+    # done callbacks run on the pool's management thread; the status write and `then` step go to _then_pool
+    child.add_done_callback(lambda future: _then_pool.submit(_after_child, future))
+    return job
+
+
+def get_job_status(job_id: str) -> Optional[Dict[str, Any]]:
+    """Status of any job (from any worker process): queued, running, done (with result) or failed (with error)."""
+    db = SessionLocal()
+    try:
+        row = db.query(models.UploadJob).filter(models.UploadJob.id == job_id).first()
+    finally:
+        db.close()
+    if row is None:
+        return None
+    out = {"job_id": row.id, "kind": row.kind, "status": row.status, "created_at": row.created_at,
+           "finished_at": row.finished_at}
+    if row.status == "done":
+        out["result"] = json.loads(row.result) if row.result else None
+    elif row.status == "failed":
+        out["error"] = row.error
+    return out
+
+
+def shutdown():
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+
+
+def parse_resume_job(path: str) -> Dict[str, Any]:
+    """Runs in a worker process: parse one uploaded resume (text, skills, outcomes)."""
+    from .nlp.parser import parse_resume
+    with metrics.capture() as stage_timings:
+        parsed = parse_resume(path)
+    return {"parsed": parsed, "stage_timings": stage_timings}
+
+
+def store_resume_job(result: Dict[str, Any], filename: str, student_id: Optional[int] = None,
+                     content_hash: Optional[str] = None) -> Dict[str, Any]:
+    """`then` step of an upload, in the API process: embed (batched, cached) and insert the Resume row."""
+    from scripts.process_resume import store_parsed_resume
+    parsed = result["parsed"]
+    resume_id = store_parsed_resume(parsed, filename, student_id=student_id, content_hash=content_hash)
+    return {"resume_id": resume_id, "extracted_skills": parsed.get("skills", []), "embedding_path": ""}
@@ -1,21 +1,129 @@
 import os
+import json
+import hashlib
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from ..config import settings
+from .. import metrics
 
-def explain_match(student, resume, department, score):
-    provider = settings.LLM_PROVIDER
-    prompt = f"""Provide a short (1-2 sentence) explanation why student '{student.name}' (GPA {student.gpa}) matches department '{department.name}' with score {score:.2f}. Mention skills that matched and program focus, avoid personal demographics."""
-    if provider == "openai" and settings.OPENAI_API_KEY:
+# Explanations depend only on (matched skills, department, score bucket), so they are
+# cached under that key: an in-process LRU plus an optional directory of JSON files.
+_cache = OrderedDict()
+_cache_lock = threading.Lock()
+_pool = ThreadPoolExecutor(max_workers=max(1, settings.LLM_MAX_CONCURRENCY), thread_name_prefix="llm")
+
+
+def _split(skills):
+    return set(s.strip().lower() for s in (skills or "").split(",") if s.strip())
+
+
+def matched_skills(resume, department):
+    return sorted(_split(resume.skills) & _split(department.required_skills))
+
+
+def score_bucket(score):
+    """Coarse score used in the cache key and prompt (0.05 steps)."""
+    return round(round(float(score) * 20) / 20, 2)
+
+
+def explanation_key(skills, department_name, bucket):
+    raw = json.dumps([list(skills), department_name, bucket], separators=(",", ":"))
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def _disk_path(key):
+    return os.path.join(settings.LLM_CACHE_DIR, f"{key}.json")
+
+
+def _cache_get(key):
+    with _cache_lock:
+        if key in _cache:
+            _cache.move_to_end(key)
+            return _cache[key]
+    if settings.LLM_CACHE_DIR:
         try:
-            import openai
-            openai.api_key = settings.OPENAI_API_KEY
-            resp = openai.ChatCompletion.create(
-                model="gpt-4o-mini",
-                messages=[{"role":"system","content":"You are an assistant that creates neutral, concise match explanations."},
-                          {"role":"user","content":prompt}],
-                max_tokens=100
-            )
-            return resp.choices[0].message.content.strip()
-        except Exception:
+            with open(_disk_path(key), "r", encoding="utf-8") as f:
+                value = json.load(f)["text"]
+        except (OSError, ValueError, KeyError):
+            return None
+        _cache_put(key, value, persist=False)
+        return value
+    return None
+
+
+def _cache_put(key, value, persist=True):
+    with _cache_lock:
+        _cache[key] = value
+        _cache.move_to_end(key)
+        while len(_cache) > settings.LLM_CACHE_SIZE:
+            _cache.popitem(last=False)
+    if persist and settings.LLM_CACHE_DIR:
+        try:
+            os.makedirs(settings.LLM_CACHE_DIR, exist_ok=True)
+            tmp = _disk_path(key) + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump({"text": value}, f)
+            os.replace(tmp, _disk_path(key))
+        except OSError:
             pass
+
+
+def _template(resume, department):
     skills = resume.skills if resume.skills else "skills not listed"
     return f"Matches because {skills} align with department's focus ({department.program_focus})."
+
+
+def _call_provider(prompt):
+    """Ask the configured LLM for an explanation; returns None when no provider is usable.
+
+    `OPENAI_API_BASE` points the client at any OpenAI-compatible server (e.g. a local stub).
+    """
+    if settings.LLM_PROVIDER != "openai" or not (settings.OPENAI_API_KEY or settings.OPENAI_API_BASE):
+        return None
+    import openai
+    kwargs = {"api_key": settings.OPENAI_API_KEY or "stub", "request_timeout": settings.LLM_TIMEOUT}
+    if settings.OPENAI_API_BASE:
+        kwargs["api_base"] = settings.OPENAI_API_BASE
+    resp = openai.ChatCompletion.create(
+        model="gpt-4o-mini",
+        messages=[{"role":"system","content":"You are an assistant that creates neutral, concise match explanations."},
+                  {"role":"user","content":prompt}],
+        max_tokens=100,
+        **kwargs
+    )
+    return resp.choices[0].message.content.strip()
+
+
+@metrics.timed("explain_match")
+def explain_match(student, resume, department, score):
+    skills = matched_skills(resume, department)
+    bucket = score_bucket(score)
+    key = explanation_key(skills, department.name, bucket)
+    cached = _cache_get(key)
+    if cached is not None:
+        return cached
+    prompt = f"""Provide a short (1-2 sentence) explanation why a student matches department '{department.name}' (program focus: {department.program_focus}) with score {bucket:.2f}. Matched skills: {', '.join(skills) or 'none listed'}. Avoid personal demographics."""
+    try:
+        text = _call_provider(prompt)
+    except Exception:
+        text = None
+    if text:
+        _cache_put(key, text)
+        return text
+    return _template(resume, department)
+
+
+def explain_matches(student, resume, scored_departments):
+    """Explain several `(department, score)` pairs concurrently on the shared bounded pool.
+
+    Returns explanations in input order; failures fall back to the template string.
+    """
+    futures = [_pool.submit(explain_match, student, resume, d, s) for d, s in scored_departments]
+    results = []
+    for (d, _), fut in zip(scored_departments, futures):
+        try:
+            results.append(fut.result())
+        except Exception:
+            results.append(_template(resume, d))
+    return results
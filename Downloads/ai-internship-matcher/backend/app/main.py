@@ -1,30 +1,112 @@
-from fastapi import FastAPI
-from .db import engine
-from . import models
+import logging
+import threading
+from fastapi import Depends, FastAPI, Request, Response
+from fastapi.responses import JSONResponse, PlainTextResponse
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+from .config import settings
+from .db import engine, async_engine, get_async_db
+from . import crud_async, jobs, metrics
 from .api import uploads, recommendations, scraper, frontend_api
-from .crud import list_students
+from .crud import page_size
+from .nlp import embedding, lazy, pdf_extract
+from .nlp.vector_search import ensure_vector_indexes
+from .migrate import upgrade_to_head
+from .utils import query_stats
+from .utils.responses import FastJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 
-models.Base.metadata.create_all(bind=engine)
-
-app = FastAPI(title="AI Internship Matcher (pilot)")
+# orjson-rendered responses when orjson is installed
+app = FastAPI(title="AI Internship Matcher (pilot)", default_response_class=FastJSONResponse)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=['*'],
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"] + (
+        ["X-DB-Queries", "X-DB-Time-Ms", "X-DB-Slowest-Ms", "X-DB-Repeated"] if settings.SQL_STATS_HEADERS else []),
 )
+# requests currently being served, reported by GET /metrics
+app.add_middleware(metrics.InFlightMiddleware)
+sql_log = logging.getLogger("app.sql")
+
+@app.middleware("http")
+async def sql_stats(request: Request, call_next):
+    """Attribute SQL statements to the request; flag N+1 patterns, optionally report in headers/logs."""
+    if not settings.SQL_STATS:
+        return await call_next(request)
+    stats, token = query_stats.start(settings.SQL_SLOWEST_KEPT)
+    try:
+        response = await call_next(request)
+    finally:
+        query_stats.stop(token)
+    route = f"{request.method} {request.url.path}"
+    for shape, n in stats.repeated(settings.SQL_NPLUS1_THRESHOLD):
+        sql_log.warning("possible N+1 in %s: %d x %s", route, n, shape[:300])
+    if settings.SQL_LOG_QUERIES and stats.count:
+        sql_log.info("%s: %d queries, %.1f ms; slowest: %s", route, stats.count, stats.total * 1000,
+                     "; ".join(f"{d * 1000:.1f} ms {q[:200]}" for d, q in stats.slowest))
+    if settings.SQL_STATS_HEADERS:
+        response.headers.update(stats.headers(settings.SQL_NPLUS1_THRESHOLD))
+    return response
 
 app.include_router(uploads.router)
 app.include_router(recommendations.router)
 app.include_router(scraper.router)
 app.include_router(frontend_api.router)
 
-@app.get("/api/students")
-def get_students():
-    from .db import SessionLocal
-    db = SessionLocal()
+# Readiness state: schema created at startup, models optionally warmed in the background
+_startup = {"schema": False, "warmup": None}
+
+@app.on_event("startup")
+def on_startup():
+    # Schema/index creation runs here rather than at import so importing app.main stays cheap
+    if settings.DB_AUTO_MIGRATE:
+        upgrade_to_head(engine)
+    ensure_vector_indexes(engine)
+    _startup["schema"] = True
+    if settings.WARMUP_MODELS:
+        # warm in the background so liveness (/api/health) answers immediately
+        def _warm():
+            _startup["warmup"] = lazy.warm_up()
+        threading.Thread(target=_warm, name="model-warmup", daemon=True).start()
+
+@app.on_event("shutdown")
+async def on_shutdown():
+    jobs.shutdown()
+    pdf_extract.shutdown()
+    await async_engine.dispose()
+
+@app.get("/api/ready")
+def readiness():
+    """Readiness probe: schema created, DB reachable and, with WARMUP_MODELS, every model loaded."""
+    checks = {"schema": _startup["schema"], "database": False, "models": lazy.status()}
     try:
-        return [ {"id":s.id, "name":s.name, "program":s.program} for s in list_students(db) ]
-    finally:
-        db.close()
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+        checks["database"] = True
+    except Exception as e:
+        checks["database_error"] = str(e)
+    models_ok = not settings.WARMUP_MODELS or all(m["loaded"] for m in checks["models"].values())
+    ready = checks["schema"] and checks["database"] and models_ok
+    return JSONResponse({"ready": ready, **checks}, status_code=200 if ready else 503)
+
+@app.get("/metrics")
+def get_metrics(format: str = "prometheus"):
+    """Per-stage latency histograms/error counters, in-flight requests, model load times and embedding
+    batcher/cache stats; Prometheus text format, or JSON with `format=json`."""
+    models, batcher, cache = lazy.status(), embedding.batcher.stats(), embedding.cache.stats()
+    if format == "json":
+        return {**metrics.snapshot(), "models": models, "embed_batcher": batcher, "embed_cache": cache}
+    return PlainTextResponse(metrics.render_prometheus(models, batcher, cache), media_type="text/plain; version=0.0.4")
+
+@app.get("/api/students")
+async def get_students(response: Response, cursor: int = None, limit: int = None, db: AsyncSession = Depends(get_async_db)):
+    """Students by id, one keyset page at a time; pass `X-Next-Cursor` back as `cursor`."""
+    size = page_size(limit)
+    # one extra row tells whether a next page exists
+    rows = await crud_async.list_students(db, after_id=cursor, limit=size + 1)
+    if len(rows) > size:
+        rows = rows[:size]
+        response.headers["X-Next-Cursor"] = str(rows[-1].id)
+    return [ {"id":s.id, "name":s.name, "program":s.program} for s in rows ]
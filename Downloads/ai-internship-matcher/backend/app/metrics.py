@@ -0,0 +1,154 @@
+"""In-process latency histograms and counters for the resume/recommendation pipeline.
+
+Stages are timed with `@timed("name")` or `with stage("name")` and end up in a
+fixed-bucket histogram (cumulative, Prometheus style) plus call/error
+counters; one observation is a `perf_counter` pair and a short locked update,
+cheap enough to leave on in production. `GET /metrics` renders everything in
+the Prometheus text format, together with in-flight requests, model load
+times and the embedding batcher/cache stats.
+
+Stages that run in the upload worker processes (`app.jobs`) are captured per
+job with `capture()` and merged back into this process's registry when the
+job finishes, so `/metrics` on the API process covers them too.
+"""
+import bisect
+import contextvars
+import functools
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional, Tuple
+
+# upper bounds in seconds; the last bucket is +Inf
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+class Histogram:
+    def __init__(self, buckets=BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.errors = 0
+
+    def observe(self, seconds: float, error: bool = False):
+        self.counts[bisect.bisect_left(self.buckets, seconds)] += 1
+        self.sum += seconds
+        if error:
+            self.errors += 1
+
+    def to_dict(self) -> Dict[str, Any]:
+        cumulative, total = [], 0
+        for n in self.counts:
+            total += n
+            cumulative.append(total)
+        return {"count": total, "sum": self.sum, "errors": self.errors,
+                "buckets": dict(zip([*map(str, self.buckets), "+Inf"], cumulative))}
+
+
+_stages: Dict[str, Histogram] = {}
+_lock = threading.Lock()
+# set inside a worker job: observations are also collected here to ship back to the API process
+_captured: contextvars.ContextVar = contextvars.ContextVar("captured_stages", default=None)
+_in_flight = 0
+
+
+def observe(name: str, seconds: float, error: bool = False):
+    with _lock:
+        hist = _stages.get(name)
+        if hist is None:
+            hist = _stages[name] = Histogram()
+        hist.observe(seconds, error)
+    captured = _captured.get()
+    if captured is not None:
+        captured.append((name, seconds, error))
+
+
+@contextmanager
+def stage(name: str):
+    """Time the block as one observation of `name`; exceptions count as errors and propagate."""
+    start = time.perf_counter()
+    error = False
+    try:
+        yield
+    except BaseException:
+        error = True
+        raise
+    finally:
+        observe(name, time.perf_counter() - start, error)
+
+
+def timed(name: str):
+    """Decorator form of `stage` for sync functions."""
+    def wrap(fn):
+        @functools.wraps(fn)
+        def inner(*args, **kwargs):
+            with stage(name):
+                return fn(*args, **kwargs)
+        return inner
+    return wrap
+
+
+@contextmanager
+def capture():
+    """Collect the observations made in this context as a list of (stage, seconds, error)."""
+    observations: List[Tuple[str, float, bool]] = []
+    token = _captured.set(observations)
+    try:
+        yield observations
+    finally:
+        _captured.reset(token)
+
+
+def merge(observations: Optional[List[Tuple[str, float, bool]]]):
+    """Add observations captured in another process."""
+    for name, seconds, error in observations or ():
+        observe(name, seconds, error)
+
+
+class InFlightMiddleware:
+    """ASGI middleware counting HTTP requests currently being served (no per-request allocation)."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        global _in_flight
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        _in_flight += 1
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _in_flight -= 1
+
+
+def snapshot() -> Dict[str, Any]:
+    with _lock:
+        stages = {name: h.to_dict() for name, h in _stages.items()}
+    return {"in_flight_requests": _in_flight, "stages": stages}
+
+
+def _gauges(prefix: str, stats: Dict[str, Any]) -> List[str]:
+    return [f"{prefix}_{k} {float(v)}" for k, v in stats.items() if isinstance(v, (int, float)) and not isinstance(v, bool)]
+
+
+def render_prometheus(models: Dict[str, Dict[str, Any]], batcher: Dict[str, Any], cache: Dict[str, Any]) -> str:
+    """Prometheus text exposition of the stages plus the given model/batcher/cache stats."""
+    snap = snapshot()
+    lines = ["# TYPE app_in_flight_requests gauge", f"app_in_flight_requests {snap['in_flight_requests']}",
+             "# TYPE app_stage_seconds histogram"]
+    for name, h in sorted(snap["stages"].items()):
+        for le, n in h["buckets"].items():
+            lines.append(f'app_stage_seconds_bucket{{stage="{name}",le="{le}"}} {n}')
+        lines.append(f'app_stage_seconds_sum{{stage="{name}"}} {h["sum"]}')
+        lines.append(f'app_stage_seconds_count{{stage="{name}"}} {h["count"]}')
+    lines.append("# TYPE app_stage_errors_total counter")
+    lines += [f'app_stage_errors_total{{stage="{name}"}} {h["errors"]}' for name, h in sorted(snap["stages"].items())]
+    lines.append("# TYPE app_model_load_seconds gauge")
+    lines += [f'app_model_load_seconds{{model="{name}"}} {m["load_seconds"]}'
+              for name, m in sorted(models.items()) if m.get("load_seconds") is not None]
+    lines.append("# TYPE app_model_loaded gauge")
+    lines += [f'app_model_loaded{{model="{name}"}} {int(bool(m.get("loaded")))}' for name, m in sorted(models.items())]
+    lines += _gauges("app_embed_batcher", batcher)
+    lines += _gauges("app_embed_cache", cache)
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,28 @@
+"""Run Alembic migrations from the app (startup) instead of `create_all`."""
+import os
+
+from sqlalchemy import inspect
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASELINE_REVISION = "0001"
+
+
+def alembic_config(connection=None):
+    from alembic.config import Config
+    cfg = Config(os.path.join(BACKEND_DIR, "alembic.ini"))
+    cfg.set_main_option("script_location", os.path.join(BACKEND_DIR, "migrations"))
+    cfg.attributes["configure_logger"] = False
+    if connection is not None:
+        cfg.attributes["connection"] = connection
+    return cfg
+
+
+def upgrade_to_head(engine):
+    """`alembic upgrade head`; databases created by `create_all` before migrations are stamped at the baseline first."""
+    from alembic import command
+    with engine.begin() as conn:
+        cfg = alembic_config(conn)
+        insp = inspect(conn)
+        if not insp.has_table("alembic_version") and insp.has_table("internships"):
+            command.stamp(cfg, BASELINE_REVISION)
+        command.upgrade(cfg, "head")
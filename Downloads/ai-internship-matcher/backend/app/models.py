@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, Float, DateTime, ForeignKey, Boolean
+from sqlalchemy import Column, Integer, String, Text, Float, DateTime, ForeignKey, Boolean, Index
 from sqlalchemy.orm import relationship
 from .db import Base
 from datetime import datetime
@@ -65,7 +65,8 @@ class Resume(Base):
     parsed_text = Column(Text)
     skills = Column(Text)  # comma-separated extracted skills
     outcomes = Column(Text)  # comma-separated detected outcomes from resume
-    created_at = Column(DateTime, default=datetime.utcnow)
+    content_hash = Column(String(64), index=True)  # sha256 of the uploaded file; identical uploads reuse this parse
+    created_at = Column(DateTime, default=datetime.utcnow, index=True)
     # embedding: store as pgvector when available, otherwise store as text path or JSON
     if Vector is not None:
         embedding = Column(Vector(384))
@@ -84,6 +85,7 @@ class InternshipDepartment(Base):
         embedding = Column(Vector(384))
     else:
         embedding = Column(Text)
+    embedding_model = Column(String)  # EMBEDDING_MODEL that produced `embedding`; stale rows are re-embedded
 
 class Internship(Base):
     __tablename__ = "internships"
@@ -91,12 +93,14 @@ class Internship(Base):
     title = Column(String, nullable=False)
     company_name = Column(String, nullable=False)
     location = Column(String)
+    city = Column(String, index=True)  # normalized from the location gazetteer at ingest
+    region = Column(String, index=True)  # e.g. NCR, Central Visayas
     description = Column(Text)
     required_skills = Column(Text)  # comma-separated
     outcome_focus = Column(String)  # which outcome this internalizes fits (AI Research, ML Engineering, etc.)
     posting_url = Column(String)
     posted_date = Column(DateTime, default=datetime.utcnow)
-    is_active = Column(Integer, default=1)
+    is_active = Column(Integer, default=1, index=True)
     source = Column(String)  # where it was scraped from (rapidapi, jobstreet, etc.)
     created_at = Column(DateTime, default=datetime.utcnow)
     # optional vector field for semantic search (requires pgvector in DB)
@@ -104,11 +108,30 @@ class Internship(Base):
         embedding = Column(Vector(384))
     else:
         embedding = Column(Text)
+    embedding_model = Column(String)  # EMBEDDING_MODEL that produced `embedding`
+    skill_count = Column(Integer, nullable=False, default=0, server_default="0")  # rows in internship_skills
+    # ingest dedupes on (title, company_name)
+    __table_args__ = (Index("ix_internships_title_company", "title", "company_name"),)
+
+class Skill(Base):
+    """Normalized skills dictionary (lowercased, stripped names)."""
+    __tablename__ = "skills"
+    id = Column(Integer, primary_key=True)
+    name = Column(String, nullable=False, unique=True)
+
+class InternshipSkill(Base):
+    """Internship <-> skill join rows mirroring `Internship.required_skills`, for SQL-side overlap scoring."""
+    __tablename__ = "internship_skills"
+    internship_id = Column(Integer, ForeignKey("internships.id", ondelete="CASCADE"), primary_key=True)
+    skill_id = Column(Integer, ForeignKey("skills.id", ondelete="CASCADE"), primary_key=True)
+    # "which postings list any of these skills" walks this index
+    __table_args__ = (Index("ix_internship_skills_skill", "skill_id", "internship_id"),)
 
 class Recommendation(Base):
     __tablename__ = "recommendations"
     id = Column(Integer, primary_key=True, index=True)
     student_id = Column(Integer, ForeignKey("students.id"))
+    resume_id = Column(Integer, ForeignKey("resumes.id"), nullable=True)
     internship_id = Column(Integer, ForeignKey("internships.id"), nullable=True)
     department_id = Column(Integer, ForeignKey("departments.id"), nullable=True)
     outcome_match = Column(String)  # which outcome this matches (AI Research, etc.)
@@ -116,6 +139,32 @@ class Recommendation(Base):
     skill_match_score = Column(Float)  # skill overlap %
     outcome_match_score = Column(Float)  # outcome alignment %
     reason = Column(Text)
+    catalog_version = Column(Integer, default=0)  # catalog_meta.version the score was computed against
     created_at = Column(DateTime, default=datetime.utcnow)
     student = relationship("Student", back_populates="recommendations")
+    department = relationship("InternshipDepartment")
+    # one row per (resume, target, catalog version) so repeated views don't add rows
+    __table_args__ = (
+        Index("uq_recommendations_resume_department", "resume_id", "department_id", "catalog_version", unique=True,
+              postgresql_where=department_id.isnot(None), sqlite_where=department_id.isnot(None)),
+        Index("uq_recommendations_resume_internship", "resume_id", "internship_id", "catalog_version", unique=True,
+              postgresql_where=internship_id.isnot(None), sqlite_where=internship_id.isnot(None)),
+    )
+
+class CatalogMeta(Base):
+    """Single-row version stamp for the internship catalog; bumped on every ingest."""
+    __tablename__ = "catalog_meta"
+    id = Column(Integer, primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, default=datetime.utcnow)
 
+class UploadJob(Base):
+    """Status of a queued resume upload (`app.jobs`), shared by every API worker process."""
+    __tablename__ = "upload_jobs"
+    id = Column(String(32), primary_key=True)
+    kind = Column(String, nullable=False)
+    status = Column(String, nullable=False, default="queued")  # queued, running, done, failed
+    result = Column(Text)  # JSON
+    error = Column(Text)
+    created_at = Column(Float, nullable=False)  # epoch seconds
+    finished_at = Column(Float, index=True)
@@ -0,0 +1,83 @@
+"""Incremental embedding backfill for internships and departments.
+
+Rows whose embedding is missing, or was produced by a different
+`EMBEDDING_MODEL` (tracked per row in `embedding_model`), are streamed in
+keyset-paged chunks (`id > last_id ORDER BY id LIMIT n`), batch-encoded and
+written back with one bulk UPDATE per chunk. Every chunk commits on its own,
+so an interrupted run simply resumes with the rows that are still stale.
+"""
+import logging
+from typing import Callable, Dict, Optional
+
+from sqlalchemy import or_, update
+from sqlalchemy.orm import Session
+
+from .. import models
+from ..catalog import bump_catalog_version, read_catalog_version
+from ..config import settings
+from ..topk import apply_catalog_delta
+from .embedding import embed_texts, to_column_value
+
+log = logging.getLogger(__name__)
+
+
+def internship_text(row) -> str:
+    return " ".join(p for p in (row.title, row.company_name, row.required_skills, row.description) if p)
+
+
+def department_text(row) -> str:
+    return " ".join(p for p in (row.name, row.program_focus, row.required_skills, row.description) if p)
+
+
+TARGETS: Dict[str, tuple] = {
+    "internships": (models.Internship, ("title", "company_name", "required_skills", "description"), internship_text),
+    "departments": (models.InternshipDepartment, ("name", "program_focus", "required_skills", "description"), department_text),
+}
+
+
+def stale_condition(model):
+    return or_(
+        model.embedding.is_(None),
+        model.embedding_model.is_(None),
+        model.embedding_model != settings.EMBEDDING_MODEL,
+    )
+
+
+def backfill_embeddings(db: Session, target: str = "internships", chunk_size: Optional[int] = None,
+                        max_rows: Optional[int] = None, progress: Optional[Callable[[int, int], None]] = None) -> int:
+    """Embed every stale row of `target`; returns the number of rows updated."""
+    model, fields, to_text = TARGETS[target]
+    chunk_size = chunk_size or settings.BACKFILL_CHUNK_SIZE
+    columns = [model.id] + [getattr(model, f) for f in fields]
+    last_id = 0
+    done = 0
+    while max_rows is None or done < max_rows:
+        limit = chunk_size if max_rows is None else min(chunk_size, max_rows - done)
+        rows = (
+            db.query(*columns)
+            .filter(model.id > last_id, stale_condition(model))
+            .order_by(model.id)
+            .limit(limit)
+            .all()
+        )
+        if not rows:
+            break
+        vecs = embed_texts([to_text(r) for r in rows])
+        db.execute(update(model), [
+            {"id": r.id, "embedding": to_column_value(v), "embedding_model": settings.EMBEDDING_MODEL}
+            for r, v in zip(rows, vecs)
+        ])
+        db.commit()
+        last_id = rows[-1].id
+        done += len(rows)
+        if progress:
+            progress(done, last_id)
+    if done:
+        log.info("backfilled %d %s embeddings with %s", done, target, settings.EMBEDDING_MODEL)
+    if done and target == "internships":
+        # the vector search fallback depends on these embeddings; internship top-k does not, so those
+        # lists are carried to the new version as they are. Department recommendations are keyed on
+        # the departments' embedding_model instead (crud.department_inputs_version)
+        prev_version = read_catalog_version(db)
+        apply_catalog_delta(db, prev_version, bump_catalog_version(db))
+    return done
@@ -0,0 +1,94 @@
+"""Request-coalescing micro-batcher.
+
+Callers on any thread `submit` single items and get a `Future`; one background
+worker drains the queue and calls the batch function once per flush, when
+either `max_batch` items are waiting or `max_wait_ms` has passed since the
+first item of the batch arrived.
+"""
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Sequence
+
+
+class MicroBatcher:
+    def __init__(self, batch_fn: Callable[[List[Any]], Sequence[Any]], max_batch: int = 32, max_wait_ms: float = 5.0,
+                 name: str = "batcher"):
+        self.batch_fn = batch_fn
+        self.max_batch = max(1, max_batch)
+        self.max_wait = max(0.0, max_wait_ms) / 1000.0
+        self.name = name
+        self._queue: "queue.Queue" = queue.Queue()
+        self._worker = None
+        self._start_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._stats = {"requests": 0, "batches": 0, "items": 0, "last_batch_size": 0, "max_batch_size": 0, "errors": 0}
+        self._batch_sizes: Dict[int, int] = {}
+
+    def _ensure_worker(self):
+        if self._worker is not None and self._worker.is_alive():
+            return
+        with self._start_lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._run, name=self.name, daemon=True)
+                self._worker.start()
+
+    def submit(self, item: Any) -> Future:
+        fut: Future = Future()
+        self._ensure_worker()
+        with self._stats_lock:
+            self._stats["requests"] += 1
+        self._queue.put((item, fut))
+        return fut
+
+    def __call__(self, item: Any, timeout: float = None) -> Any:
+        return self.submit(item).result(timeout=timeout)
+
+    def _collect(self):
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            try:
+                batch.append(self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            futures = [f for _, f in batch if f.set_running_or_notify_cancel()]
+            items = [i for i, f in batch if f.running()]
+            if not items:
+                continue
+            try:
+                outputs = list(self.batch_fn(items))
+                if len(outputs) != len(futures):
+                    # zip would leave the extra callers blocked forever; fail the whole batch instead
+                    raise ValueError(f"{self.name}: batch_fn returned {len(outputs)} outputs for {len(futures)} inputs")
+            except BaseException as e:
+                with self._stats_lock:
+                    self._stats["errors"] += 1
+                for f in futures:
+                    f.set_exception(e)
+                continue
+            for f, out in zip(futures, outputs):
+                f.set_result(out)
+            n = len(items)
+            with self._stats_lock:
+                self._stats["batches"] += 1
+                self._stats["items"] += n
+                self._stats["last_batch_size"] = n
+                self._stats["max_batch_size"] = max(self._stats["max_batch_size"], n)
+                self._batch_sizes[n] = self._batch_sizes.get(n, 0) + 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters plus current queue depth and a batch-size histogram."""
+        with self._stats_lock:
+            out = dict(self._stats)
+            out["batch_sizes"] = dict(self._batch_sizes)
+        out["queue_depth"] = self._queue.qsize()
+        out["mean_batch_size"] = out["items"] / out["batches"] if out["batches"] else 0.0
+        return out
@@ -1,14 +1,66 @@
-from sentence_transformers import SentenceTransformer
 import numpy as np
 import os
+import json
 from ..config import settings
+from .. import metrics
+from .batcher import MicroBatcher
+from .embedding_cache import EmbeddingCache, normalize_text, timed_encode
+from .lazy import LazyModel
 
-MODEL = SentenceTransformer(settings.EMBEDDING_MODEL)
+def _load_model():
+    from sentence_transformers import SentenceTransformer
+    return SentenceTransformer(settings.EMBEDDING_MODEL)
+
+# Loaded on first use (or by the startup warm-up), not at import
+embedding_model = LazyModel("embedding", _load_model)
+
+def get_model():
+    return embedding_model.get()
 EMBED_DIR = os.path.join(os.getcwd(), "backend", "embeddings")
 os.makedirs(EMBED_DIR, exist_ok=True)
 
+# Identical (whitespace-normalized) text under the same model is never encoded twice
+cache = EmbeddingCache(
+    settings.EMBEDDING_MODEL,
+    max_items=settings.EMBED_CACHE_SIZE,
+    directory=(settings.EMBED_CACHE_DIR or os.path.join(EMBED_DIR, "cache")) if settings.EMBED_DISK_CACHE else None,
+    max_disk_items=settings.EMBED_DISK_CACHE_MAX_ITEMS,
+)
+
+def _encode(texts, batch_size=None):
+    return get_model().encode(list(texts), batch_size=batch_size or settings.EMBED_BATCH_SIZE, show_progress_bar=False)
+
+# Concurrent embed_text callers are coalesced into shared encode batches
+batcher = MicroBatcher(lambda texts: list(timed_encode(cache, _encode, texts)), max_batch=settings.EMBED_BATCH_SIZE,
+                       max_wait_ms=settings.EMBED_BATCH_WAIT_MS, name="embed-batcher")
+
+def embed_texts(texts, batch_size=None):
+    """Embed many texts, encoding only cache misses in one `encode` call; returns an (n, dim) array."""
+    texts = [normalize_text(t) for t in texts]
+    keys = [cache.key(t) for t in texts]
+    out = [cache.get(k) for k in keys]
+    missing = list(dict.fromkeys(t for t, v in zip(texts, out) if v is None))
+    if missing:
+        fresh = dict(zip(missing, timed_encode(cache, lambda ts: _encode(ts, batch_size), missing)))
+        for t, vec in fresh.items():
+            cache.put(cache.key(t), vec)
+        out = [fresh[t] if v is None else v for t, v in zip(texts, out)]
+    if not out:
+        return np.zeros((0, get_model().get_sentence_embedding_dimension()), dtype=np.float32)
+    return np.stack(out)
+
+@metrics.timed("embed_text")
 def embed_text(text):
-    vec = MODEL.encode([text], show_progress_bar=False)[0]
+    text = normalize_text(text)
+    key = cache.key(text)
+    vec = cache.get(key)
+    if vec is not None:
+        return vec
+    if settings.EMBED_BATCHING:
+        vec = batcher(text)
+    else:
+        vec = timed_encode(cache, _encode, [text])[0]
+    cache.put(key, vec)
     return vec
 
 def save_embedding(obj_id:int, vec:np.ndarray, prefix="resume"):
@@ -18,3 +70,27 @@ def save_embedding(obj_id:int, vec:np.ndarray, prefix="resume"):
 
 def load_embedding(path):
     return np.load(path)
+
+def to_column_value(vec):
+    """Embedding in the form the `embedding` columns expect: a list for pgvector, JSON text otherwise."""
+    from ..models import Vector
+    values = [float(x) for x in vec]
+    return values if Vector is not None else json.dumps(values)
+
+def coerce_embedding(value):
+    """Return a float32 vector from any stored embedding form, or None.
+
+    Accepts pgvector values / arrays / lists, a path to a saved `.npy` file, or a JSON list string.
+    """
+    if value is None:
+        return None
+    if isinstance(value, str):
+        value = value.strip()
+        if not value:
+            return None
+        if value.startswith("["):
+            return np.asarray(json.loads(value), dtype=np.float32)
+        if os.path.exists(value):
+            return np.load(value).astype(np.float32)
+        return None
+    return np.asarray(value, dtype=np.float32)
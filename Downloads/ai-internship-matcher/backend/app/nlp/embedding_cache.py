@@ -0,0 +1,168 @@
+"""Content-addressed cache for text embeddings.
+
+Vectors are keyed by sha256(model name + whitespace-normalized text), so
+re-uploaded resumes and re-scraped postings skip the transformer. Lookups go
+through an in-process LRU first and then a directory of `.npy` files shared by
+all workers.
+
+The directory is capped at `max_disk_items` files: disk hits refresh a file's
+mtime, and every tenth of the cap worth of writes a background thread deletes
+the least recently used files beyond it (`prune`, also run by
+`scripts/prune_embedding_cache.py`). Several workers pruning the same
+directory at once only race on deleting the same files, which is harmless.
+"""
+import hashlib
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional
+
+import numpy as np
+
+_WS = re.compile(r"\s+")
+
+
+def normalize_text(text: str) -> str:
+    return _WS.sub(" ", text or "").strip()
+
+
+class EmbeddingCache:
+    def __init__(self, model_name: str, max_items: int = 2048, directory: Optional[str] = None,
+                 max_disk_items: int = 0):
+        self.model_name = model_name
+        self.max_items = max_items
+        self.directory = directory or None
+        # 0 = unbounded
+        self.max_disk_items = max_disk_items
+        self._lru: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._prune_lock = threading.Lock()
+        self._writes_since_prune = 0
+        self._counters = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "encode_seconds": 0.0, "encoded": 0,
+                          "disk_evicted": 0}
+
+    def key(self, text: str) -> str:
+        return hashlib.sha256(f"{self.model_name}\0{normalize_text(text)}".encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], f"{key}.npy")
+
+    def _remember(self, key: str, vec: np.ndarray):
+        with self._lock:
+            self._lru[key] = vec
+            self._lru.move_to_end(key)
+            while len(self._lru) > self.max_items:
+                self._lru.popitem(last=False)
+
+    def get(self, key: str) -> Optional[np.ndarray]:
+        with self._lock:
+            vec = self._lru.get(key)
+            if vec is not None:
+                self._lru.move_to_end(key)
+                self._counters["memory_hits"] += 1
+                return vec
+        if self.directory:
+            path = self._path(key)
+            try:
+                vec = np.load(path)
+                # mtime is the recency that `prune` evicts by
+                os.utime(path)
+            except (OSError, ValueError):
+                vec = None
+            if vec is not None:
+                self._remember(key, vec)
+                with self._lock:
+                    self._counters["disk_hits"] += 1
+                return vec
+        with self._lock:
+            self._counters["misses"] += 1
+        return None
+
+    def put(self, key: str, vec: np.ndarray):
+        vec = np.asarray(vec)
+        self._remember(key, vec)
+        if self.directory:
+            path = self._path(key)
+            try:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+                with open(tmp, "wb") as f:
+                    np.save(f, vec)
+                os.replace(tmp, path)
+            except OSError:
+                return
+            self._maybe_prune()
+
+    def _maybe_prune(self):
+        if not self.max_disk_items:
+            return
+        with self._lock:
+            self._writes_since_prune += 1
+            if self._writes_since_prune < max(1, self.max_disk_items // 10):
+                return
+            self._writes_since_prune = 0
+        # scanning the directory is slow on a big cache; keep it off the encode path
+        threading.Thread(target=self.prune, name="embed-cache-prune", daemon=True).start()
+
+    def prune(self, max_items: Optional[int] = None) -> int:
+        """Delete the least recently used disk entries beyond `max_items` (default max_disk_items); returns how many."""
+        limit = self.max_disk_items if max_items is None else max_items
+        if not self.directory or limit is None or limit <= 0:
+            return 0
+        if not self._prune_lock.acquire(blocking=False):
+            return 0
+        try:
+            entries = []
+            for sub in os.scandir(self.directory):
+                if not sub.is_dir():
+                    continue
+                for entry in os.scandir(sub.path):
+                    if entry.name.endswith(".npy"):
+                        try:
+                            entries.append((entry.stat().st_mtime, entry.path))
+                        except OSError:
+                            pass
+            if len(entries) <= limit:
+                return 0
+            entries.sort()
+            removed = 0
+            for _, path in entries[:len(entries) - limit]:
+                try:
+                    os.remove(path)
+                    removed += 1
+                except OSError:
+                    pass
+            with self._lock:
+                self._counters["disk_evicted"] += removed
+            return removed
+        except OSError:
+            return 0
+        finally:
+            self._prune_lock.release()
+
+    def record_encode(self, n: int, seconds: float):
+        """Record time spent encoding `n` cache misses (used to estimate time saved by hits)."""
+        with self._lock:
+            self._counters["encoded"] += n
+            self._counters["encode_seconds"] += seconds
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            c = dict(self._counters)
+            c["memory_items"] = len(self._lru)
+        hits = c["memory_hits"] + c["disk_hits"]
+        lookups = hits + c["misses"]
+        c["hit_rate"] = hits / lookups if lookups else 0.0
+        per_item = c["encode_seconds"] / c["encoded"] if c["encoded"] else 0.0
+        c["saved_encode_seconds"] = hits * per_item
+        return c
+
+
+def timed_encode(cache: EmbeddingCache, encode, texts):
+    """Run `encode(texts)` and record its duration against `cache`."""
+    start = time.perf_counter()
+    out = encode(texts)
+    cache.record_encode(len(texts), time.perf_counter() - start)
+    return out
@@ -0,0 +1,67 @@
+"""Lazily loaded, process-wide model handles.
+
+Heavy models (SentenceTransformer, spaCy, the ranker) are loaded on first use
+instead of at import time, so API workers boot fast. Every handle registers
+itself in `REGISTRY`, which the startup warm-up and the readiness endpoint use.
+"""
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+from .. import metrics
+
+
+class LazyModel:
+    def __init__(self, name: str, loader: Callable[[], Any]):
+        self.name = name
+        self._loader = loader
+        self._value: Any = None
+        self._loaded = False
+        self._lock = threading.Lock()
+        self.load_seconds: Optional[float] = None
+        self.error: Optional[str] = None
+        REGISTRY[name] = self
+
+    @property
+    def loaded(self) -> bool:
+        return self._loaded
+
+    def get(self) -> Any:
+        if self._loaded:
+            return self._value
+        with self._lock:
+            if not self._loaded:
+                start = time.perf_counter()
+                try:
+                    self._value = self._loader()
+                except Exception as e:
+                    self.error = str(e)
+                    metrics.observe(f"load_{self.name}", time.perf_counter() - start, error=True)
+                    raise
+                self.load_seconds = time.perf_counter() - start
+                # also a stage, so loads inside upload workers reach the API process's /metrics
+                metrics.observe(f"load_{self.name}", self.load_seconds)
+                self.error = None
+                self._loaded = True
+        return self._value
+
+
+REGISTRY: Dict[str, LazyModel] = {}
+
+
+def warm_up(names=None) -> Dict[str, Optional[str]]:
+    """Load the named (default: all registered) models; returns name -> error (None when loaded)."""
+    results = {}
+    for name, model in list(REGISTRY.items()):
+        if names and name not in names:
+            continue
+        try:
+            model.get()
+            results[name] = None
+        except Exception as e:
+            results[name] = str(e)
+    return results
+
+
+def status() -> Dict[str, Dict[str, Any]]:
+    return {name: {"loaded": m.loaded, "load_seconds": m.load_seconds, "error": m.error} for name, m in REGISTRY.items()}
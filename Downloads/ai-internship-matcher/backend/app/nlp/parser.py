@@ -1,14 +1,9 @@
 import re
-from pdfminer.high_level import extract_text
-from docx import Document
-import spacy
-
-try:
-    nlp = spacy.load("en_core_web_sm")
-except:
-    import subprocess, sys
-    subprocess.run([sys.executable, "-m", "spacy", "download", "en_core_web_sm"])
-    nlp = spacy.load("en_core_web_sm")
+import json
+from ..config import settings
+from .. import metrics
+from .lazy import LazyModel
+from .pdf_extract import extract_pdf
 
 SKILL_VOCAB = set([
     "python","java","c++","c#","javascript","react","vue","django","flask","sql",
@@ -16,23 +11,92 @@ SKILL_VOCAB = set([
     "git","docker","html","css","node.js","express","linux","networking"
 ])
 
+# alias -> canonical skill name; matches are reported under the canonical name
+SKILL_SYNONYMS = {
+    "js": "javascript", "nodejs": "node.js", "postgres": "postgresql",
+    "vue.js": "vue", "vuejs": "vue", "react.js": "react", "reactjs": "react",
+    "ml": "machine learning", "data analytics": "data analysis", "cpp": "c++",
+    "csharp": "c#", "html5": "html", "css3": "css", "express.js": "express",
+}
+
+
+def load_skill_vocab(path):
+    """Merge an optional JSON file `{"canonical skill": ["alias", ...]}` into the vocab/synonyms."""
+    with open(path, "r", encoding="utf-8") as f:
+        extra = json.load(f)
+    for canonical, aliases in extra.items():
+        canonical = canonical.strip().lower()
+        SKILL_VOCAB.add(canonical)
+        for alias in aliases or []:
+            SKILL_SYNONYMS[alias.strip().lower()] = canonical
+
+
+def build_skill_matcher(nlp):
+    """Compile SKILL_VOCAB and SKILL_SYNONYMS into one case-insensitive PhraseMatcher."""
+    from spacy.matcher import PhraseMatcher
+    matcher = PhraseMatcher(nlp.vocab, attr="LOWER")
+    terms = {s: s for s in SKILL_VOCAB}
+    terms.update(SKILL_SYNONYMS)
+    by_canonical = {}
+    for term, canonical in terms.items():
+        by_canonical.setdefault(canonical, []).append(nlp.make_doc(term))
+    for canonical, patterns in by_canonical.items():
+        matcher.add(canonical, patterns)
+    return matcher
+
+
+def _load_skill_pipeline():
+    # Skills are found with a PhraseMatcher over the tokenizer output only: no tagger,
+    # parser or trained model is needed, and matching is one linear pass per text
+    # no matter how large the vocabulary is.
+    import spacy
+    if settings.SKILL_VOCAB_PATH:
+        load_skill_vocab(settings.SKILL_VOCAB_PATH)
+    nlp = spacy.blank("en")
+    return nlp, build_skill_matcher(nlp)
+
+skill_pipeline = LazyModel("skills", _load_skill_pipeline)
+
+def get_nlp():
+    return skill_pipeline.get()[0]
+
+def get_skill_matcher():
+    return skill_pipeline.get()[1]
+
 def extract_text_from_pdf(path):
-    return extract_text(path)
+    # page/time budgeted; see pdf_extract for the parallel mode
+    return extract_pdf(path).text
 
 def extract_text_from_docx(path):
+    from docx import Document
     doc = Document(path)
     return "\n".join([p.text for p in doc.paragraphs])
 
-def parse_resume(file_path):
-    text = ""
+def extract_resume_text(file_path):
+    """Raw text of a PDF/DOCX resume; returns (text, truncated)."""
     if file_path.lower().endswith(".pdf"):
-        text = extract_text_from_pdf(file_path)
+        pdf = extract_pdf(file_path)
+        return pdf.text, pdf.truncated
     elif file_path.lower().endswith(".docx"):
-        text = extract_text_from_docx(file_path)
-    else:
-        raise ValueError("Unsupported file type")
+        return extract_text_from_docx(file_path), False
+    raise ValueError("Unsupported file type")
 
-    text_norm = re.sub(r"\s+", " ", text)
+OUTCOME_MAP = {
+    "software development": ["software","development","programming"],
+    "data analysis": ["data analysis","statistics","data science"],
+    "networking": ["network","routing","switching"],
+}
+
+def normalize_resume_text(text):
+    return re.sub(r"\s+", " ", text)
+
+def analyze_resume_text(text, skills=None):
+    """GPA, skills and outcomes from raw resume text.
+
+    Pass `skills` when they were already extracted in bulk (`extract_skills_batch`
+    over `normalize_resume_text(text)`) to skip the per-document matcher run.
+    """
+    text_norm = normalize_resume_text(text)
     gpa = None
     m = re.search(r"(?i)(GPA|Grade Point Average)[:\s]*([0-9]\.?[0-9]?)", text)
     if m:
@@ -41,23 +105,11 @@ def parse_resume(file_path):
         except:
             gpa = None
 
-    doc = nlp(text_norm.lower())
-    found_skills = set()
-    for token in doc:
-        if token.lemma_ in SKILL_VOCAB or token.text in SKILL_VOCAB:
-            found_skills.add(token.text)
-    for nc in doc.noun_chunks:
-        phrase = nc.text.strip()
-        if phrase in SKILL_VOCAB:
-            found_skills.add(phrase)
+    if skills is None:
+        skills = extract_skills_from_text(text_norm)
 
     outcomes = []
-    outcome_map = {
-        "software development": ["software","development","programming"],
-        "data analysis": ["data analysis","statistics","data science"],
-        "networking": ["network","routing","switching"],
-    }
-    for key, kws in outcome_map.items():
+    for key, kws in OUTCOME_MAP.items():
         for kw in kws:
             if kw in text_norm.lower():
                 outcomes.append(key); break
@@ -65,22 +117,40 @@ def parse_resume(file_path):
     return {
         "text": text_norm,
         "gpa": gpa,
-        "skills": list(found_skills),
-        "outcomes": outcomes
+        "skills": list(skills),
+        "outcomes": outcomes,
     }
 
+@metrics.timed("parse_resume")
+def parse_resume(file_path):
+    text, truncated = extract_resume_text(file_path)
+    parsed = analyze_resume_text(text)
+    parsed["truncated"] = truncated  # PDF cut at the page/time budget
+    return parsed
+
 
+def _skills_from_doc(doc):
+    return set(doc.vocab.strings[match_id] for match_id, _, _ in get_skill_matcher()(doc))
+
+
+@metrics.timed("extract_skills_from_text")
 def extract_skills_from_text(text):
     """Return a list of skills found in arbitrary job or resume text using SKILL_VOCAB."""
     if not text:
         return []
-    doc = nlp(text.lower())
-    found = set()
-    for token in doc:
-        if token.lemma_ in SKILL_VOCAB or token.text in SKILL_VOCAB:
-            found.add(token.text)
-    for nc in doc.noun_chunks:
-        phrase = nc.text.strip()
-        if phrase in SKILL_VOCAB:
-            found.add(phrase)
-    return list(found)
+    return list(_skills_from_doc(get_nlp().make_doc(text)))
+
+
+def extract_skills_batch(texts, batch_size=64, n_process=1):
+    """`extract_skills_from_text` over many texts with one `nlp.pipe` call.
+
+    Returns one skill list per input, in order. `n_process` > 1 spreads
+    tokenization over several processes for large ingests.
+    """
+    texts = list(texts)
+    results = [[] for _ in texts]
+    todo = [i for i, t in enumerate(texts) if t]
+    docs = get_nlp().pipe((texts[i] for i in todo), batch_size=batch_size, n_process=n_process)
+    for i, doc in zip(todo, docs):
+        results[i] = list(_skills_from_doc(doc))
+    return results
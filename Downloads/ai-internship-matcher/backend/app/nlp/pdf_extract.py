@@ -0,0 +1,140 @@
+"""Budgeted, page-parallel PDF text extraction.
+
+pdfminer's `extract_text` interprets the whole document in one thread with no
+upper bound. `extract_pdf` stops after `max_pages` pages or `time_budget`
+seconds and reports whether the text was cut short. Documents with at least
+`PDF_PARALLEL_MIN_PAGES` pages are split into contiguous page ranges that run
+on a small process pool, started lazily by the first such document in each
+process: uvicorn workers, upload job workers (one document per job, so a
+long PDF can still use PDF_WORKERS cores) and the CLI/benchmark scripts.
+Workers of pools that already spread many documents across cores (bulk
+ingest) are started with `serial_only` as their initializer and extract
+serially; so do daemonic processes, which may not start children at all.
+"""
+import multiprocessing
+import multiprocessing.util
+import os
+import threading
+import time
+from concurrent.futures import FIRST_EXCEPTION, ProcessPoolExecutor, wait
+from io import StringIO
+from typing import Optional
+
+from ..config import settings
+
+
+class PdfText:
+    def __init__(self, text: str, pages_total: int, pages_read: int, truncated: bool):
+        self.text = text
+        self.pages_total = pages_total
+        self.pages_read = pages_read
+        self.truncated = truncated
+
+
+def count_pages(path: str) -> int:
+    from pdfminer.pdfpage import PDFPage
+    with open(path, "rb") as fp:
+        return sum(1 for _ in PDFPage.get_pages(fp))
+
+
+def extract_page_range(path: str, start: int, stop: int, deadline: Optional[float] = None):
+    """Text of pages [start, stop), stopping early at `deadline` (time.time()); returns (text, pages_read)."""
+    from pdfminer.converter import TextConverter
+    from pdfminer.layout import LAParams
+    from pdfminer.pdfinterp import PDFPageInterpreter, PDFResourceManager
+    from pdfminer.pdfpage import PDFPage
+
+    out = StringIO()
+    rsrcmgr = PDFResourceManager()
+    device = TextConverter(rsrcmgr, out, laparams=LAParams())
+    interpreter = PDFPageInterpreter(rsrcmgr, device)
+    read = 0
+    with open(path, "rb") as fp:
+        for page in PDFPage.get_pages(fp, pagenos=set(range(start, stop))):
+            if deadline is not None and time.time() >= deadline:
+                break
+            interpreter.process_page(page)
+            read += 1
+    device.close()
+    return out.getvalue(), read
+
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_pid: Optional[int] = None
+_pool_lock = threading.Lock()
+_serial_only = False
+
+
+def serial_only():
+    """Process-pool initializer: never start the page pool from this process."""
+    global _serial_only
+    _serial_only = True
+
+
+def _get_pool(workers: int) -> ProcessPoolExecutor:
+    global _pool, _pool_pid
+    with _pool_lock:
+        if _pool is None or _pool_pid != os.getpid():
+            # a pool inherited through fork (JOB_START_METHOD=fork) belongs to the parent: start our own
+            _pool_pid = os.getpid()
+            _pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+            # a multiprocessing child (e.g. an upload job worker) joins its non-daemon children on exit and
+            # idle pool workers never exit on their own: stop the pool before that join, and before the
+            # pool's own call-queue finalizer (priority 10) closes the queue its stop signals go through
+            multiprocessing.util.Finalize(None, shutdown, kwargs={"wait": True}, exitpriority=100)
+        return _pool
+
+
+def shutdown(wait: bool = False):
+    """Stop the page pool (app or process shutdown); the next parallel extraction starts a new one."""
+    global _pool
+    with _pool_lock:
+        if _pool is not None and _pool_pid == os.getpid():
+            _pool.shutdown(wait=wait, cancel_futures=True)
+        _pool = None
+
+
+def _extract_parallel(path: str, limit: int, workers: int, deadline: Optional[float]):
+    # a few ranges per worker so one slow (image-heavy) range doesn't hold back the rest
+    n_chunks = min(limit, workers * 4)
+    bounds = [(limit * i // n_chunks, limit * (i + 1) // n_chunks) for i in range(n_chunks)]
+    pool = _get_pool(workers)
+    futures = [pool.submit(extract_page_range, path, a, b, deadline) for a, b in bounds]
+    timeout = None if deadline is None else max(0.0, deadline - time.time())
+    done, not_done = wait(futures, timeout=timeout, return_when=FIRST_EXCEPTION)
+    if not_done:
+        # ranges still queued are dropped; running ones check the deadline between pages,
+        # so give them a moment to hand back what they have
+        for f in not_done:
+            f.cancel()
+        more, _ = wait([f for f in not_done if not f.cancelled()], timeout=settings.PDF_DEADLINE_GRACE_SECONDS)
+        done |= more
+    parts, read = [], 0
+    # keep the text in page order up to the first range that didn't finish
+    for (a, b), f in zip(bounds, futures):
+        if f not in done:
+            break
+        text, n = f.result()
+        parts.append(text)
+        read += n
+        if n < b - a:
+            break
+    return "".join(parts), read
+
+
+def extract_pdf(path: str, max_pages: Optional[int] = None, time_budget: Optional[float] = None,
+                workers: Optional[int] = None, min_parallel_pages: Optional[int] = None) -> PdfText:
+    max_pages = settings.PDF_MAX_PAGES if max_pages is None else max_pages
+    time_budget = settings.PDF_TIME_BUDGET_SECONDS if time_budget is None else time_budget
+    workers = settings.PDF_WORKERS if workers is None else workers
+    min_parallel_pages = settings.PDF_PARALLEL_MIN_PAGES if min_parallel_pages is None else min_parallel_pages
+    deadline = time.time() + time_budget if time_budget else None
+
+    total = count_pages(path)
+    limit = min(total, max_pages) if max_pages else total
+    nested = _serial_only or multiprocessing.current_process().daemon
+    if workers > 1 and not nested and limit >= min_parallel_pages:
+        text, read = _extract_parallel(path, limit, workers, deadline)
+    else:
+        text, read = extract_page_range(path, 0, limit, deadline)
+    return PdfText(text, total, read, truncated=read < total)
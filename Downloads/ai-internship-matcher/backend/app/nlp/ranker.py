@@ -19,3 +19,18 @@ class Ranker(nn.Module):
 
 def build_feature_vector(resume_emb, dept_emb, gpa_norm, skill_overlap):
     return np.concatenate([resume_emb, dept_emb, np.array([gpa_norm, skill_overlap])], axis=0)
+
+def build_feature_matrix(resume_emb, dept_embs, gpa_norm, skill_overlaps):
+    """Stack `build_feature_vector` rows for one resume against many departments."""
+    n = dept_embs.shape[0]
+    return np.concatenate([
+        np.broadcast_to(resume_emb, (n, resume_emb.shape[0])),
+        dept_embs,
+        np.full((n, 1), gpa_norm),
+        np.asarray(skill_overlaps, dtype=np.float64).reshape(n, 1),
+    ], axis=1)
+
+def configure_torch_threads(num_threads):
+    """Cap torch intra-op threads (0 keeps torch's default) so several workers don't oversubscribe cores."""
+    if num_threads and num_threads > 0:
+        torch.set_num_threads(num_threads)
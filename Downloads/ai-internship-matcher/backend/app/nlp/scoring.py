@@ -0,0 +1,164 @@
+"""Vectorized skill-overlap scoring for internship recommendations.
+
+The catalog is held as a binary internship x skill CSR matrix together with
+the per-row skill counts, so a resume is scored against every posting with a
+single sparse mat-vec and the best rows are picked with `argpartition`.
+
+Scores follow the `match_score` rules used by `compute_recommendations`:
+- skill score = int(matched / len(internship skills) * 100), or 40 when the
+  internship lists no skills
+- outcome boost = 10 per resume outcome found in title + description (max 3)
+- match score = min(100, int(0.8 * skill score + outcome boost))
+- the first 5 postings are always eligible, later ones only when score > 0
+- ties keep catalog order
+"""
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+from scipy import sparse
+
+NO_SKILLS_SCORE = 40
+ALWAYS_ELIGIBLE = 5
+DEFAULT_TOP_K = 20
+
+
+def split_skills(raw: Optional[str]) -> List[str]:
+    """Split a comma-separated skills column into stripped, non-empty tokens."""
+    return [s.strip() for s in (raw or "").split(",") if s.strip()]
+
+
+def skill_set(raw: Optional[str]) -> set:
+    """Lowercased skill set of a comma-separated skills column."""
+    return set(s.lower() for s in split_skills(raw))
+
+
+class ScoringEngine:
+    """Scores resumes against a fixed snapshot of internships."""
+
+    def __init__(self, rows: Sequence[Dict[str, Any]]):
+        """Build the index from dict rows.
+
+        Each row needs `id`, `title`, `company_name`, `location`, `description`,
+        `posting_url`, `posted_date` and `required_skills`.
+        """
+        self.rows = list(rows)
+        self.vocab: Dict[str, int] = {}
+        self.raw_skills: List[List[str]] = []
+        self.outcome_text: List[str] = []
+        indptr = [0]
+        indices: List[int] = []
+        for row in self.rows:
+            raw = split_skills(row.get("required_skills"))
+            self.raw_skills.append(raw)
+            cols = sorted(set(self.vocab.setdefault(s.lower(), len(self.vocab)) for s in raw))
+            indices.extend(cols)
+            indptr.append(len(indices))
+            self.outcome_text.append(((row.get("title") or "") + " " + (row.get("description") or "")).lower())
+        n = len(self.rows)
+        self.matrix = sparse.csr_matrix(
+            (np.ones(len(indices), dtype=np.float64), np.asarray(indices, dtype=np.int64), np.asarray(indptr, dtype=np.int64)),
+            shape=(n, max(1, len(self.vocab))),
+        )
+        # number of distinct skills per internship (row L1 norm of the binary matrix)
+        self.row_norms = np.diff(self.matrix.indptr).astype(np.float64)
+        self._outcome_masks: Dict[str, np.ndarray] = {}
+
+    @classmethod
+    def from_internships(cls, internships: Iterable[Any]) -> "ScoringEngine":
+        """Build an engine from `models.Internship` ORM rows."""
+        return cls([{
+            "id": i.id,
+            "title": i.title,
+            "company_name": i.company_name,
+            "location": i.location,
+            "description": i.description,
+            "posting_url": i.posting_url,
+            "posted_date": i.posted_date,
+            "required_skills": i.required_skills,
+        } for i in internships])
+
+    def __len__(self):
+        return len(self.rows)
+
+    def _resume_vector(self, skills: Iterable[str]) -> np.ndarray:
+        vec = np.zeros(self.matrix.shape[1], dtype=np.float64)
+        for s in skills:
+            col = self.vocab.get(s)
+            if col is not None:
+                vec[col] = 1.0
+        return vec
+
+    def _outcome_mask(self, outcome: str) -> np.ndarray:
+        """Boolean column of postings whose title/description contain `outcome` (memoized)."""
+        mask = self._outcome_masks.get(outcome)
+        if mask is None:
+            mask = np.fromiter((outcome in t for t in self.outcome_text), dtype=bool, count=len(self.outcome_text))
+            self._outcome_masks[outcome] = mask
+        return mask
+
+    def score(self, skills: Iterable[str], outcomes: Iterable[str] = ()) -> np.ndarray:
+        """Match score (0-100, int64) of every posting for one resume.
+
+        `skills` and `outcomes` are lowercased, stripped sets as produced by `skill_set`.
+        """
+        matched = self.matrix @ self._resume_vector(skills)
+        return self._combine(matched[:, None], [self._boost(outcomes)])[:, 0]
+
+    def score_many(self, resumes: Sequence[tuple]) -> np.ndarray:
+        """Score several `(skills, outcomes)` pairs at once; returns an (n_postings, n_resumes) array."""
+        if not resumes:
+            return np.zeros((len(self.rows), 0), dtype=np.int64)
+        cols = [self._resume_vector(s) for s, _ in resumes]
+        matched = self.matrix @ sparse.csc_matrix(np.stack(cols, axis=1))
+        matched = matched.toarray() if sparse.issparse(matched) else np.asarray(matched)
+        return self._combine(matched, [self._boost(o) for _, o in resumes])
+
+    def _boost(self, outcomes: Iterable[str]) -> np.ndarray:
+        hits = np.zeros(len(self.rows), dtype=np.int64)
+        for o in outcomes:
+            if o:
+                hits += self._outcome_mask(o)
+        return np.minimum(hits, 3) * 10
+
+    def _combine(self, matched: np.ndarray, boosts: List[np.ndarray]) -> np.ndarray:
+        norms = self.row_norms[:, None]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            skill_score = np.where(norms > 0, np.trunc((matched / np.where(norms > 0, norms, 1)) * 100), NO_SKILLS_SCORE)
+        boost = np.stack(boosts, axis=1)
+        return np.minimum(100, np.trunc(0.8 * skill_score + boost)).astype(np.int64)
+
+    def top_k(self, scores: np.ndarray, k: int = DEFAULT_TOP_K) -> np.ndarray:
+        """Row indices of the best `k` eligible postings, best first, ties in catalog order."""
+        n = len(scores)
+        if n == 0:
+            return np.zeros(0, dtype=np.int64)
+        idx = np.arange(n, dtype=np.int64)
+        eligible = (idx < ALWAYS_ELIGIBLE) | (scores > 0)
+        # one integer key orders by score desc, then by catalog position asc
+        key = np.where(eligible, scores.astype(np.int64) * n + (n - 1 - idx), -1)
+        k = min(k, int(eligible.sum()))
+        if k <= 0:
+            return np.zeros(0, dtype=np.int64)
+        part = np.argpartition(-key, k - 1)[:k] if k < n else idx
+        return part[np.argsort(-key[part], kind="stable")]
+
+    def to_result(self, row_idx: int, score: int, skills: set) -> Dict[str, Any]:
+        """Serialize one posting the way the frontend endpoints return it."""
+        row = self.rows[row_idx]
+        posted = row.get("posted_date")
+        return {
+            "id": row["id"],
+            "title": row.get("title"),
+            "company_name": row.get("company_name"),
+            "location": row.get("location"),
+            "description": row.get("description"),
+            "posting_url": row.get("posting_url"),
+            "matched_skills": [s for s in self.raw_skills[row_idx] if s.lower() in skills][:5],
+            "match_score": int(score),
+            "posted_date": posted.isoformat() if hasattr(posted, "isoformat") else posted,
+        }
+
+    def recommend(self, skills: set, outcomes: set, k: int = DEFAULT_TOP_K) -> List[Dict[str, Any]]:
+        """Top-k recommendation dicts for one resume."""
+        scores = self.score(skills, outcomes)
+        return [self.to_result(i, scores[i], skills) for i in self.top_k(scores, k)]
@@ -0,0 +1,77 @@
+"""Skill-overlap scoring pushed down to the database.
+
+Same `match_score` rules as `ScoringEngine` (see `app.nlp.scoring`), computed
+in one query over the normalized `skills` / `internship_skills` tables: the
+matched-skill count per posting comes from the `(skill_id, internship_id)`
+index, `internships.skill_count` holds the denominator, and the outcome boost
+is a substring test on the lowercased title + description. Only the top k
+rows leave the database, so no process has to hold the catalog in memory.
+Float arithmetic mirrors numpy's (double precision, then truncation), so both
+backends return the same ranking.
+
+Skills are normalized into a join table with a b-tree `(skill_id,
+internship_id)` index rather than a `text[]` column with a GIN index: the
+query is "count the rows matching these skill ids per posting", which a
+b-tree serves directly and which runs the same on SQLite. `Resume.skills`
+stays a comma string; a resume's skills are only ever bind parameters here.
+"""
+from typing import Any, Dict, Iterable, List
+
+from sqlalchemy import Float, Integer, case, cast, func, literal, select
+from sqlalchemy.orm import Session
+
+from .. import models
+from .scoring import ALWAYS_ELIGIBLE, DEFAULT_TOP_K, NO_SKILLS_SCORE
+
+
+def _trunc(db: Session, expr):
+    """Truncate a non-negative float to an integer."""
+    if db.get_bind().dialect.name == "sqlite":
+        return cast(expr, Integer)  # sqlite's CAST drops the fraction
+    return cast(func.floor(expr), Integer)
+
+
+def sql_top_k(db: Session, skills: Iterable[str], outcomes: Iterable[str] = (),
+              k: int = DEFAULT_TOP_K) -> List[Dict[str, Any]]:
+    """Best `k` active internships for one resume, as `{"internship_id", "score"}` rows.
+
+    `skills` and `outcomes` are lowercased sets as produced by `skill_set`.
+    """
+    i = models.Internship
+    skills = sorted(s for s in skills if s)
+    outcomes = sorted(o for o in outcomes if o)
+
+    if skills:
+        matched_q = (
+            select(models.InternshipSkill.internship_id, func.count().label("matched"))
+            .join(models.Skill, models.Skill.id == models.InternshipSkill.skill_id)
+            .where(models.Skill.name.in_(skills))
+            .group_by(models.InternshipSkill.internship_id)
+            .subquery()
+        )
+        matched = func.coalesce(matched_q.c.matched, 0)
+    else:
+        matched_q, matched = None, literal(0)
+
+    skill_score = case(
+        (i.skill_count > 0, _trunc(db, cast(matched, Float) / i.skill_count * 100)),
+        else_=NO_SKILLS_SCORE,
+    )
+    text = func.lower(func.coalesce(i.title, "") + " " + func.coalesce(i.description, ""))
+    hits = sum((case((text.contains(o, autoescape=True), 1), else_=0) for o in outcomes), literal(0))
+    boost = case((hits > 3, 3), else_=hits) * 10
+    raw = _trunc(db, cast(literal(0.8), Float) * skill_score + boost)
+    score = case((raw > 100, 100), else_=raw).label("score")
+
+    first_ids = select(i.id).where(i.is_active == 1).order_by(i.id).limit(ALWAYS_ELIGIBLE).scalar_subquery()
+    inner = select(i.id.label("internship_id"), score).where(i.is_active == 1)
+    if matched_q is not None:
+        inner = inner.outerjoin(matched_q, matched_q.c.internship_id == i.id)
+    scored = inner.subquery()
+    q = (
+        select(scored.c.internship_id, scored.c.score)
+        .where((scored.c.score > 0) | scored.c.internship_id.in_(first_ids))
+        .order_by(scored.c.score.desc(), scored.c.internship_id)
+        .limit(k)
+    )
+    return [{"internship_id": r.internship_id, "score": int(r.score)} for r in db.execute(q)]
@@ -0,0 +1,116 @@
+"""Semantic nearest-neighbour retrieval over internship embeddings.
+
+With pgvector available the database answers `ORDER BY embedding <=> :q LIMIT k`
+from an HNSW index. Without it (`models.Vector is None`, or a non-Postgres DB)
+the same call falls back to a brute-force NumPy search over a row-normalized
+embedding matrix that is cached per catalog version.
+"""
+import threading
+from typing import List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from .. import models
+from ..catalog import read_catalog_version
+from .embedding import coerce_embedding
+
+# (table, index name) pairs that get an HNSW cosine index when pgvector is present
+VECTOR_INDEXES = (
+    ("internships", "ix_internships_embedding_hnsw"),
+    ("departments", "ix_departments_embedding_hnsw"),
+)
+
+
+def pgvector_enabled(db_or_engine) -> bool:
+    """True when the ORM columns are pgvector columns on a PostgreSQL database."""
+    bind = db_or_engine.get_bind() if isinstance(db_or_engine, Session) else db_or_engine
+    return models.Vector is not None and bind.dialect.name == "postgresql"
+
+
+def ensure_vector_indexes(engine) -> bool:
+    """Create the pgvector extension and HNSW cosine indexes if they are missing.
+
+    Returns False (and does nothing) when pgvector is not in use.
+    """
+    if not pgvector_enabled(engine):
+        return False
+    with engine.begin() as conn:
+        conn.execute(text("CREATE EXTENSION IF NOT EXISTS vector"))
+        for table, name in VECTOR_INDEXES:
+            conn.execute(text(f"CREATE INDEX IF NOT EXISTS {name} ON {table} USING hnsw (embedding vector_cosine_ops)"))
+    return True
+
+
+class BruteForceIndex:
+    """In-process exact cosine search over a normalized (n, d) matrix."""
+
+    def __init__(self, ids: List[int], vectors: List[np.ndarray], version: int = 0):
+        self.version = version
+        self.ids = np.asarray(ids, dtype=np.int64)
+        if vectors:
+            mat = np.stack(vectors).astype(np.float32)
+            mat /= np.linalg.norm(mat, axis=1, keepdims=True) + 1e-8
+        else:
+            mat = np.zeros((0, 0), dtype=np.float32)
+        self.matrix = mat
+
+    def search(self, query: np.ndarray, k: int) -> List[Tuple[int, float]]:
+        """`(id, cosine_distance)` pairs of the `k` nearest rows, nearest first."""
+        n = len(self.ids)
+        if n == 0 or k <= 0:
+            return []
+        q = np.asarray(query, dtype=np.float32)
+        q = q / (np.linalg.norm(q) + 1e-8)
+        dist = 1.0 - self.matrix @ q
+        k = min(k, n)
+        part = np.argpartition(dist, k - 1)[:k] if k < n else np.arange(n)
+        order = part[np.argsort(dist[part], kind="stable")]
+        return [(int(self.ids[i]), float(dist[i])) for i in order]
+
+
+_fallback_index: Optional[BruteForceIndex] = None
+_fallback_lock = threading.Lock()
+
+
+def _get_fallback_index(db: Session) -> BruteForceIndex:
+    global _fallback_index
+    version = read_catalog_version(db)
+    idx = _fallback_index
+    if idx is not None and idx.version == version:
+        return idx
+    with _fallback_lock:
+        idx = _fallback_index
+        if idx is None or idx.version != version:
+            rows = (
+                db.query(models.Internship.id, models.Internship.embedding)
+                .filter(models.Internship.is_active == 1, models.Internship.embedding.isnot(None))
+                .order_by(models.Internship.id)
+                .all()
+            )
+            ids, vecs = [], []
+            for row_id, emb in rows:
+                vec = coerce_embedding(emb)
+                if vec is not None and vec.size:
+                    ids.append(row_id)
+                    vecs.append(vec)
+            idx = BruteForceIndex(ids, vecs, version)
+            _fallback_index = idx
+    return idx
+
+
+def nearest_internships(db: Session, query_vec, k: int = 20) -> List[Tuple[int, float]]:
+    """Return `(internship_id, cosine_distance)` for the `k` active internships nearest `query_vec`."""
+    query_vec = np.asarray(query_vec, dtype=np.float32)
+    if pgvector_enabled(db):
+        distance = models.Internship.embedding.cosine_distance(query_vec.tolist())
+        rows = (
+            db.query(models.Internship.id, distance.label("distance"))
+            .filter(models.Internship.is_active == 1, models.Internship.embedding.isnot(None))
+            .order_by(distance)
+            .limit(k)
+            .all()
+        )
+        return [(r.id, float(r.distance)) for r in rows]
+    return _get_fallback_index(db).search(query_vec, k)
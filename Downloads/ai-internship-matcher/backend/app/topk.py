@@ -0,0 +1,177 @@
+"""Materialized per-resume internship top-k.
+
+A resume's best `DEFAULT_TOP_K` internships are stored as `Recommendation`
+rows (`internship_id` set) stamped with the catalog version they were computed
+against, so `GET /api/get-recommendations` is one indexed lookup. When the
+catalog moves from version V to V+1 (`apply_catalog_delta`), stored lists are
+carried forward instead of recomputed: only the newly added internships are
+scored, against all materialized resumes at once with `score_many`, and merged
+into each list, and lists the delta doesn't change are only re-stamped. A
+list is recomputed in full when it held a posting that is no longer active,
+or had fewer than k entries while postings were added (so zero-score postings
+could matter). Resumes without a list for the current version are computed on read.
+Full scoring runs on the cached snapshot or, with SCORING_BACKEND="sql", in
+the database (`sql_top_k`).
+"""
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import and_, exists, func, or_
+from sqlalchemy.orm import Session, aliased
+
+from . import crud, models
+from .catalog import CATALOG_COLUMNS, get_catalog, read_catalog_version
+from .config import settings
+from .nlp.scoring import DEFAULT_TOP_K, ScoringEngine, skill_set, split_skills
+from .nlp.sql_scoring import sql_top_k
+
+TARGET = "internship_id"
+DELTA_CHUNK = 500
+
+
+def compute_top_k(snapshot, resume, k: int = DEFAULT_TOP_K) -> List[Dict[str, Any]]:
+    """Full scoring of one resume against a catalog snapshot; rows for `save_recommendations`."""
+    engine = snapshot.engine
+    scores = engine.score(skill_set(resume.skills), skill_set(resume.outcomes))
+    return [{TARGET: engine.rows[i]["id"], "score": int(scores[i])} for i in engine.top_k(scores, k)]
+
+
+def full_top_k(db: Session, resume, k: int = DEFAULT_TOP_K) -> List[Dict[str, Any]]:
+    """Full scoring of one resume on the configured SCORING_BACKEND."""
+    if settings.SCORING_BACKEND == "sql":
+        return sql_top_k(db, skill_set(resume.skills), skill_set(resume.outcomes), k)
+    return compute_top_k(get_catalog(db), resume, k)
+
+
+def parse_cursor(cursor: Optional[str]) -> Optional[Tuple[int, int]]:
+    """`"<score>:<internship id>"` of the last item of the previous page."""
+    if not cursor:
+        return None
+    score, internship_id = cursor.split(":", 1)
+    return int(score), int(internship_id)
+
+
+def next_cursor(page: List[Dict[str, Any]], limit: Optional[int]) -> Optional[str]:
+    """Cursor after `page[:limit]`; `page` is read with `limit + 1` so a cursor always leads to a non-empty page."""
+    if limit is None or len(page) <= limit:
+        return None
+    last = page[limit - 1]
+    return f"{last['match_score']}:{last['id']}"
+
+
+def read_top_k(db: Session, resume, catalog_version: int, after: Optional[Tuple[int, int]] = None,
+               limit: Optional[int] = None, include_description: bool = False) -> List[Dict[str, Any]]:
+    """Stored top-k of a resume at `catalog_version`, serialized like `ScoringEngine.to_result`.
+
+    Ordered by score desc, then internship id; `after` is the (score, id) keyset
+    cursor. Descriptions are cut to DESCRIPTION_PREVIEW_CHARS in SQL unless
+    `include_description`.
+    """
+    i = models.Internship
+    rec = models.Recommendation
+    description = i.description if include_description else \
+        func.substr(i.description, 1, settings.DESCRIPTION_PREVIEW_CHARS).label("description")
+    columns = [description if c is i.description else c for c in CATALOG_COLUMNS]
+    q = (
+        db.query(rec.score, *columns)
+        .join(i, i.id == rec.internship_id)
+        .filter(rec.resume_id == resume.id, rec.catalog_version == catalog_version, rec.internship_id.isnot(None))
+    )
+    if after is not None:
+        q = q.filter(or_(rec.score < after[0], and_(rec.score == after[0], i.id > after[1])))
+    q = q.order_by(rec.score.desc(), i.id)
+    rows = (q.limit(limit) if limit else q).all()
+    skills = skill_set(resume.skills)
+    return [{
+        "id": r.id,
+        "title": r.title,
+        "company_name": r.company_name,
+        "location": r.location,
+        "description": r.description,
+        "posting_url": r.posting_url,
+        "matched_skills": [s for s in split_skills(r.required_skills) if s.lower() in skills][:5],
+        "match_score": int(r.score),
+        "posted_date": r.posted_date.isoformat() if hasattr(r.posted_date, "isoformat") else r.posted_date,
+    } for r in rows]
+
+
+def get_top_k(db: Session, resume, k: int = DEFAULT_TOP_K, after: Optional[Tuple[int, int]] = None,
+              limit: Optional[int] = None, include_description: bool = False) -> List[Dict[str, Any]]:
+    """Recommendations of a resume: the stored list when current, otherwise computed and stored."""
+    if settings.SCORING_BACKEND == "sql":
+        version = read_catalog_version(db)
+    else:
+        snapshot = get_catalog(db)
+        if not len(snapshot):
+            return []
+        version = snapshot.version
+    page = dict(after=after, limit=limit, include_description=include_description)
+    if not crud.get_resume_recommendations(db, resume.id, version, target=TARGET, exists=True):
+        rows = full_top_k(db, resume, k)
+        crud.save_recommendations(db, resume.student_id, resume.id, version, rows, target=TARGET)
+    return read_top_k(db, resume, version, **page)
+
+
+def _merge(stored: List[tuple], new: Iterable[tuple], k: int) -> List[tuple]:
+    """Best k of (internship_id, score) pairs: score desc, then catalog (id) order."""
+    return sorted(list(stored) + list(new), key=lambda p: (-p[1], p[0]))[:k]
+
+
+def apply_catalog_delta(db: Session, prev_version: int, new_version: int, added_ids: Iterable[int] = (),
+                        k: int = DEFAULT_TOP_K) -> int:
+    """Carry every top-k stored at `prev_version` to `new_version`; returns the number of resumes carried.
+
+    Lists the delta leaves unchanged (no new posting made the cut, none of
+    theirs went inactive) are re-stamped in place with one UPDATE; only the
+    others are deleted and re-inserted. Inserts skip rows a concurrent
+    `get_top_k` already stored at `new_version`.
+    """
+    rec = models.Recommendation
+    added = (
+        db.query(*CATALOG_COLUMNS)
+        .filter(models.Internship.id.in_(list(added_ids)), models.Internship.is_active == 1)
+        .order_by(models.Internship.id)
+        .all()
+    ) if added_ids else []
+    new_engine = ScoringEngine([dict(r._mapping) for r in added])
+    resume_ids = [r for (r,) in db.query(rec.resume_id).filter(
+        rec.catalog_version == prev_version, rec.internship_id.isnot(None)).distinct().order_by(rec.resume_id)]
+    updated = 0
+    for start in range(0, len(resume_ids), DELTA_CHUNK):
+        chunk = resume_ids[start:start + DELTA_CHUNK]
+        resumes = db.query(models.Resume).filter(models.Resume.id.in_(chunk)).order_by(models.Resume.id).all()
+        stored: Dict[int, List[tuple]] = {r.id: [] for r in resumes}
+        for resume_id, internship_id, score in db.query(rec.resume_id, rec.internship_id, rec.score).filter(
+                rec.resume_id.in_(chunk), rec.catalog_version == prev_version, rec.internship_id.isnot(None)):
+            stored.setdefault(resume_id, []).append((internship_id, int(score)))
+        held = {i for pairs in stored.values() for i, _ in pairs}
+        inactive = {i for (i,) in db.query(models.Internship.id).filter(
+            models.Internship.id.in_(held), models.Internship.is_active != 1)}
+        scores = new_engine.score_many([(skill_set(r.skills), skill_set(r.outcomes)) for r in resumes])
+        values, unchanged = [], []
+        for col, resume in enumerate(resumes):
+            current = stored[resume.id]
+            if any(i in inactive for i, _ in current) or (len(current) < k and len(new_engine)):
+                rows = [(r[TARGET], r["score"]) for r in full_top_k(db, resume, k)]
+            else:
+                fresh = ((new_engine.rows[j]["id"], int(scores[j, col])) for j in range(len(new_engine)) if scores[j, col] > 0)
+                rows = _merge(current, fresh, k)
+            if sorted(rows) == sorted(current):
+                unchanged.append(resume.id)
+                continue
+            values += [{"student_id": resume.student_id, "resume_id": resume.id, TARGET: i, "score": s,
+                        "catalog_version": new_version} for i, s in rows]
+        if unchanged:
+            # rows already re-stamped (or saved) at new_version by a concurrent reader are left to the delete below
+            other = aliased(rec)
+            db.query(rec).filter(
+                rec.resume_id.in_(unchanged), rec.catalog_version == prev_version, rec.internship_id.isnot(None),
+                ~exists().where(other.resume_id == rec.resume_id, other.internship_id == rec.internship_id,
+                                other.catalog_version == new_version),
+            ).update({rec.catalog_version: new_version}, synchronize_session=False)
+        db.query(rec).filter(rec.resume_id.in_(chunk), rec.internship_id.isnot(None),
+                             rec.catalog_version != new_version).delete(synchronize_session=False)
+        if values:
+            db.execute(crud.insert_recommendations_stmt(db, TARGET), values)
+        db.commit()
+        updated += len(resumes)
+    return updated
@@ -1,21 +1,146 @@
 """Location helper utilities.
 
-Provides a stricter Philippines-location check used by the seeder and scraper.
+Provides a stricter Philippines-location check used by the seeder and scraper,
+backed by a gazetteer compiled once into a single word-bounded regex, plus a
+batch classifier that also resolves a normalized city/region for storage on
+`Internship` rows.
 """
-from typing import Optional
-
-# Canonical tokens for Philippine locations, cities, provinces and common abbreviations.
-# Keep tokens lowercase for simple substring matching.
-PH_TOKENS = [
-    "philippin", "philippines", "ph", "phil", "manila", "metro manila",
-    "quezon city", "quezon", "qc", "makati", "cebu", "cebu city", "davao",
-    "davao city", "iloilo", "bacolod", "baguio", "cagayan", "zamboanga",
-    "pasig", "muntinlupa", "taguig", "las piñas", "valenzuela", "valenzuela city",
-    "laguna", "batangas", "laguna province", "visayas", "mindanao", "luzon",
-    "butuan", "pampanga", "bulacan", "oriental mindoro", "occidental mindoro",
-    "cebu province", "iloilo city", "negros", "negros occidental", "negros oriental",
-    "iloilo", "bicol", "palawan", "marikina", "iloilo",
-]
+import re
+from typing import Iterable, List, NamedTuple, Optional
+from urllib.parse import urlparse
+
+NCR = "NCR"
+
+# token -> (city, region). Tokens are lowercase and matched on word boundaries;
+# when tokens overlap the longest one wins ("cebu city" over "cebu").
+GAZETTEER = {
+    "philippines": (None, None), "philippine": (None, None),
+    "metro manila": (None, NCR), "ncr": (None, NCR),
+    "manila": ("Manila", NCR), "quezon city": ("Quezon City", NCR), "qc": ("Quezon City", NCR),
+    "makati": ("Makati", NCR), "makati city": ("Makati", NCR), "pasig": ("Pasig", NCR),
+    "taguig": ("Taguig", NCR), "bgc": ("Taguig", NCR), "bonifacio global city": ("Taguig", NCR),
+    "muntinlupa": ("Muntinlupa", NCR), "alabang": ("Muntinlupa", NCR),
+    "las piñas": ("Las Piñas", NCR), "las pinas": ("Las Piñas", NCR),
+    "valenzuela": ("Valenzuela", NCR), "valenzuela city": ("Valenzuela", NCR),
+    "marikina": ("Marikina", NCR), "mandaluyong": ("Mandaluyong", NCR), "ortigas": ("Pasig", NCR),
+    "pasay": ("Pasay", NCR), "parañaque": ("Parañaque", NCR), "paranaque": ("Parañaque", NCR),
+    "quezon": (None, None),
+    "laguna": (None, "CALABARZON"), "laguna province": (None, "CALABARZON"),
+    "batangas": (None, "CALABARZON"), "cavite": (None, "CALABARZON"), "rizal": (None, "CALABARZON"),
+    "santa rosa": ("Santa Rosa", "CALABARZON"),
+    "pampanga": (None, "Central Luzon"), "bulacan": (None, "Central Luzon"), "clark": (None, "Central Luzon"),
+    "baguio": ("Baguio", "CAR"),
+    "cagayan": (None, "Cagayan Valley"),
+    "cagayan de oro": ("Cagayan de Oro", "Northern Mindanao"),
+    "oriental mindoro": (None, "MIMAROPA"), "occidental mindoro": (None, "MIMAROPA"), "palawan": (None, "MIMAROPA"),
+    "bicol": (None, "Bicol"),
+    "cebu": (None, "Central Visayas"), "cebu city": ("Cebu City", "Central Visayas"),
+    "cebu province": (None, "Central Visayas"), "mandaue": ("Mandaue", "Central Visayas"),
+    "negros oriental": (None, "Central Visayas"),
+    "iloilo": ("Iloilo City", "Western Visayas"), "iloilo city": ("Iloilo City", "Western Visayas"),
+    "bacolod": ("Bacolod", "Western Visayas"), "negros": (None, "Western Visayas"),
+    "negros occidental": (None, "Western Visayas"),
+    "davao": ("Davao City", "Davao Region"), "davao city": ("Davao City", "Davao Region"),
+    "zamboanga": ("Zamboanga City", "Zamboanga Peninsula"),
+    "butuan": ("Butuan", "Caraga"),
+    "luzon": (None, None), "visayas": (None, None), "mindanao": (None, None),
+}
+
+# Tokens too short/ambiguous to trust in free text; only honoured in the location field
+LOCATION_ONLY_TOKENS = {"ph": (None, None), "phil": (None, None)}
+
+# Names shared with places, people or words outside the Philippines ("Delhi NCR", "Santa Rosa, CA",
+# "Laguna Beach, CA", "Montreal, QC", "Clark Kent", Spanish "negros"). On their own they are not a PH
+# signal; they only resolve a city/region once something else places the posting in PH (country/URL,
+# "Philippines", an unambiguous gazetteer name, or a second ambiguous name of the same region, as in
+# "Santa Rosa, Laguna")
+AMBIGUOUS_TOKENS = {"ncr", "rizal", "santa rosa", "clark", "laguna", "qc", "valenzuela", "negros"}
+
+
+def _compile(tokens: Iterable[str]) -> "re.Pattern":
+    alts = sorted(set(tokens), key=len, reverse=True)
+    return re.compile(r"(?<!\w)(?:" + "|".join(re.escape(t) for t in alts) + r")(?!\w)")
+
+
+_TEXT_RE = _compile(GAZETTEER)
+_LOCATION_RE = _compile(list(GAZETTEER) + list(LOCATION_ONLY_TOKENS))
+_COUNTRY_PREFIX_RE = re.compile(r"(?<!\w)philippin\w*")
+_LOOKUP = dict(GAZETTEER, **LOCATION_ONLY_TOKENS)
+
+
+class LocationMatch(NamedTuple):
+    is_ph: bool
+    city: Optional[str] = None
+    region: Optional[str] = None
+
+
+def _hits(text: str, pattern: "re.Pattern") -> List[str]:
+    """Distinct gazetteer tokens found in `text`, in order of appearance."""
+    return list(dict.fromkeys(m.group(0) for m in pattern.finditer(text)))
+
+
+def _best(tokens: Iterable[str]) -> Optional[tuple]:
+    """`(city, region)` of the first token naming a city, else of the first naming a region, else of the first."""
+    best = None
+    for t in tokens:
+        city, region = _LOOKUP[t]
+        if city:
+            return city, region
+        if best is None or (region and not best[1]):
+            best = (city, region)
+    return best
+
+
+def _corroborated(tokens: List[str]) -> bool:
+    """Two different ambiguous names of the same region ("Santa Rosa, Laguna") back each other up."""
+    regions = [_LOOKUP[t][1] for t in tokens if _LOOKUP[t][1]]
+    return len(regions) != len(set(regions))
+
+
+def classify_location(location: Optional[str], posting_url: Optional[str] = None,
+                      description: Optional[str] = None, country: Optional[str] = None) -> LocationMatch:
+    """Classify one posting: whether it is in the Philippines and, if known, its city/region."""
+    loc = (location or "").lower()
+    url = (posting_url or "").lower()
+    desc = (description or "").lower()
+    c = (country or "").lower().strip()
+
+    # location-field hits first, so they win over the description
+    hits = list(dict.fromkeys(_hits(loc, _LOCATION_RE) + _hits(desc, _TEXT_RE)))
+    firm = [t for t in hits if t not in AMBIGUOUS_TOKENS]
+    ambiguous = [t for t in hits if t in AMBIGUOUS_TOKENS]
+
+    host = urlparse(url).netloc if "//" in url else ""
+    is_ph = (
+        # Country field check (exact match/starts-with)
+        bool(c and ("philippin" in c or c in ("ph", "phl", "philippines", "phil")))
+        # URL domain (.ph) or explicit 'philippines' in url
+        or host.endswith(".ph") or "philippines" in url
+        # 'philippines' (e.g. 'remote (philippines)') or any unambiguous gazetteer token in location/description
+        or bool(_COUNTRY_PREFIX_RE.search(loc) or _COUNTRY_PREFIX_RE.search(desc)) or bool(firm)
+        or _corroborated(ambiguous)
+    )
+    if not is_ph:
+        return LocationMatch(False)
+    # in PH for sure: ambiguous names may now fill in what the unambiguous ones left open, as long as they
+    # agree on the region ("Santa Rosa, Laguna, Philippines"; not "Laguna Beach" next to "Manila")
+    city, region = _best(firm) or (None, None)
+    if city is None:
+        for t in ambiguous:
+            a_city, a_region = _LOOKUP[t]
+            if region and a_region != region:
+                continue
+            region = region or a_region
+            if a_city:
+                city = a_city
+                break
+    return LocationMatch(True, city, region)
+
+
+def classify_locations(items: Iterable[dict]) -> List[LocationMatch]:
+    """Batch form of `classify_location` over dicts with location/posting_url/description/country keys."""
+    return [classify_location(i.get("location"), i.get("posting_url"), i.get("description"), i.get("country"))
+            for i in items]
 
 
 def is_philippines_location(location: Optional[str], posting_url: Optional[str] = None,
@@ -25,36 +150,11 @@ def is_philippines_location(location: Optional[str], posting_url: Optional[str]
     Heuristics used (order matters):
     - explicit country match (e.g., country == 'Philippines' or 'PH')
     - .ph domain in posting_url
-    - any PH token appears in location or description (case-insensitive)
-    - phrases like 'remote (philippines)' or 'work from philippines'
+    - 'philippines' anywhere in location or description
+    - any gazetteer city/province/region appears as a whole word in location or
+      description ('ph'/'phil' only count in the location field; names such as
+      'NCR', 'Laguna' or 'Santa Rosa' that also exist abroad never count on their own)
 
     This is intentionally conservative: if uncertain, return False.
     """
-    loc = (location or "").lower()
-    url = (posting_url or "").lower()
-    desc = (description or "").lower()
-    c = (country or "").lower()
-
-    # Country field check (exact match/starts-with)
-    if c:
-        if "philippin" in c or c in ("ph", "philippines", "phil"):
-            return True
-
-    # URL domain (.ph) or explicit 'philippines' in url
-    if ".ph" in url or "philippines" in url:
-        return True
-
-    # Look for 'remote' paired with philippines in either loc or desc
-    if "remote" in loc and "philippin" in loc:
-        return True
-    if "remote" in desc and "philippin" in desc:
-        return True
-
-    # Check canonical tokens inside location or description
-    for token in PH_TOKENS:
-        if token in loc:
-            return True
-        if token in desc:
-            return True
-
-    return False
+    return classify_location(location, posting_url, description, country).is_ph
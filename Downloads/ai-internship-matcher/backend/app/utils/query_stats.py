@@ -0,0 +1,87 @@
+"""Per-request SQL statistics collected from engine events.
+
+`app.db` hooks `before/after_cursor_execute` on both engines. Each statement's
+duration is added to the `QueryStats` of the current HTTP request, held in a
+context variable set by the middleware in `app.main`; the variable follows
+the request into threadpool routes and into the async engine's greenlets.
+Statements run outside a request (scripts, startup) are not recorded.
+
+The same statement text running many times in one request is the N+1
+signature (e.g. a lazy relationship loaded per row), so statements are
+counted by shape, with expanded `IN (...)` lists collapsed.
+"""
+import contextvars
+import re
+import time
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+_current: contextvars.ContextVar = contextvars.ContextVar("query_stats", default=None)
+
+# a parenthesized run of bind placeholders (qmark, format, numeric, pyformat)
+_PLACEHOLDER = r"(?:\?|%s|\$\d+|%\(\w+\)s|:\w+)"
+_IN_LIST = re.compile(r"\(\s*" + _PLACEHOLDER + r"(?:\s*,\s*" + _PLACEHOLDER + r")+\s*\)")
+_SPACE = re.compile(r"\s+")
+
+
+def statement_shape(statement: str) -> str:
+    """Statement text with whitespace squeezed and expanded IN lists collapsed to `(...)`."""
+    return _IN_LIST.sub("(...)", _SPACE.sub(" ", statement).strip())
+
+
+class QueryStats:
+    """Query count, DB time, slowest statements and repeated shapes of one request."""
+
+    def __init__(self, keep_slowest: int = 3):
+        self.count = 0
+        self.total = 0.0
+        self.keep_slowest = keep_slowest
+        self.slowest: List[Tuple[float, str]] = []
+        self.shapes: Counter = Counter()
+
+    def record(self, statement: str, duration: float):
+        self.count += 1
+        self.total += duration
+        self.shapes[statement_shape(statement)] += 1
+        if self.keep_slowest:
+            self.slowest.append((duration, statement))
+            self.slowest.sort(key=lambda s: -s[0])
+            del self.slowest[self.keep_slowest:]
+
+    def repeated(self, threshold: int) -> List[Tuple[str, int]]:
+        """Statement shapes executed at least `threshold` times (N+1 suspects), most frequent first."""
+        return [(shape, n) for shape, n in self.shapes.most_common() if n >= threshold]
+
+    def headers(self, threshold: int) -> Dict[str, str]:
+        return {
+            "X-DB-Queries": str(self.count),
+            "X-DB-Time-Ms": f"{self.total * 1000:.1f}",
+            "X-DB-Slowest-Ms": ",".join(f"{d * 1000:.1f}" for d, _ in self.slowest),
+            "X-DB-Repeated": str(len(self.repeated(threshold))),
+        }
+
+
+def start(keep_slowest: int = 3):
+    """Begin collecting for the current request; returns (stats, token for `stop`)."""
+    stats = QueryStats(keep_slowest)
+    return stats, _current.set(stats)
+
+
+def stop(token):
+    _current.reset(token)
+
+
+def current() -> Optional[QueryStats]:
+    return _current.get()
+
+
+def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current.get() is not None and context is not None:
+        context._query_started = time.perf_counter()
+
+
+def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current.get()
+    started = getattr(context, "_query_started", None)
+    if stats is not None and started is not None:
+        stats.record(statement, time.perf_counter() - started)
@@ -0,0 +1,110 @@
+"""Async RapidAPI Internships client.
+
+Pages through `/search` for several keywords concurrently over one pooled
+`httpx.AsyncClient`, spacing requests with a token bucket and retrying
+transient failures with exponential backoff. The bucket lives in this
+process, so it is sized to this worker's share of `JOBSCRAPER_RATE_LIMIT`
+(requests/second across all `WEB_CONCURRENCY` uvicorn workers); a CLI run
+next to the server is not counted against it. `RAPID_API_BASE_URL` can point it at a local fake
+server.
+"""
+import asyncio
+from typing import Dict, List, Optional
+
+import httpx
+
+from ..config import settings
+from .ratelimit import TokenBucket
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+
+def process_rate() -> float:
+    """This process's share of JOBSCRAPER_RATE_LIMIT (0 = unlimited stays unlimited)."""
+    return settings.JOBSCRAPER_RATE_LIMIT / max(1, settings.WEB_CONCURRENCY)
+
+
+rate_limiter = TokenBucket(process_rate())
+
+
+class RapidAPIError(Exception):
+    """Raised when a RapidAPI request still fails after all retries."""
+
+
+def base_url() -> str:
+    return (settings.RAPID_API_BASE_URL or f"https://{settings.RAPID_API_HOST}").rstrip("/")
+
+
+def extract_items(data) -> List[Dict]:
+    """Pull the list of postings out of a RapidAPI response body."""
+    if not isinstance(data, dict):
+        return []
+    items = data.get("jobs", data.get("results", data.get("data", [])))
+    return items if isinstance(items, list) else []
+
+
+async def _get_page(client: httpx.AsyncClient, params: Dict) -> List[Dict]:
+    delay = settings.JOBSCRAPER_BACKOFF_SECONDS
+    for attempt in range(settings.JOBSCRAPER_MAX_RETRIES + 1):
+        await rate_limiter.acquire()
+        try:
+            response = await client.get("/search", params=params)
+        except httpx.TransportError as e:
+            error = f"RapidAPI request failed: {e}"
+        else:
+            if response.status_code not in RETRY_STATUSES:
+                if response.is_error:
+                    raise RapidAPIError(f"RapidAPI request failed: HTTP {response.status_code}")
+                try:
+                    return extract_items(response.json())
+                except ValueError as e:
+                    raise RapidAPIError(f"Failed to parse RapidAPI response: {e}")
+            error = f"RapidAPI request failed: HTTP {response.status_code}"
+            retry_after = response.headers.get("retry-after")
+            if retry_after and retry_after.isdigit():
+                delay = max(delay, float(retry_after))
+        if attempt < settings.JOBSCRAPER_MAX_RETRIES:
+            await asyncio.sleep(delay)
+            delay *= 2
+    raise RapidAPIError(error)
+
+
+async def _fetch_keyword(client: httpx.AsyncClient, keyword: str, limit: int, sem: asyncio.Semaphore) -> List[Dict]:
+    page_size = max(1, min(limit, settings.JOBSCRAPER_PAGE_SIZE))
+    items: List[Dict] = []
+    for page in range(settings.JOBSCRAPER_MAX_PAGES):
+        async with sem:
+            batch = await _get_page(client, {"keyword": keyword, "limit": page_size, "offset": page * page_size})
+        items.extend(batch)
+        if len(batch) < page_size or len(items) >= limit:
+            break
+    return items[:limit]
+
+
+async def fetch_internships(keywords: List[str], limit: int = 50, api_key: Optional[str] = None,
+                            transport: Optional[httpx.AsyncBaseTransport] = None) -> List[Dict]:
+    """Fetch up to `limit` postings per keyword, all keywords concurrently.
+
+    Keywords that fail are skipped; `RapidAPIError` is raised only if every keyword failed.
+    `transport` replaces the network (tests pass an `httpx.MockTransport`).
+    """
+    headers = {
+        "x-rapidapi-key": api_key or settings.RAPID_API_KEY,
+        "x-rapidapi-host": settings.RAPID_API_HOST,
+    }
+    limits = httpx.Limits(max_connections=settings.JOBSCRAPER_CONCURRENCY, max_keepalive_connections=settings.JOBSCRAPER_CONCURRENCY)
+    sem = asyncio.Semaphore(settings.JOBSCRAPER_CONCURRENCY)
+    async with httpx.AsyncClient(base_url=base_url(), headers=headers, limits=limits, timeout=10,
+                                 transport=transport) as client:
+        outcomes = await asyncio.gather(*(_fetch_keyword(client, k, limit, sem) for k in keywords), return_exceptions=True)
+    items: List[Dict] = []
+    errors = []
+    for outcome in outcomes:
+        if isinstance(outcome, BaseException):
+            errors.append(outcome)
+        else:
+            items.extend(outcome)
+    if errors and len(errors) == len(outcomes):
+        raise errors[0] if isinstance(errors[0], RapidAPIError) else RapidAPIError(str(errors[0]))
+    return items
@@ -0,0 +1,37 @@
+"""Token-bucket rate limiter shared by outbound scraper requests."""
+import asyncio
+import threading
+import time
+
+
+class TokenBucket:
+    """Allow `rate` acquisitions per second with bursts of up to `capacity`.
+
+    State is guarded by a thread lock rather than an asyncio lock, so one bucket
+    can be shared by every event loop (and thread) in the process.
+    """
+
+    def __init__(self, rate: float, capacity: float = None):
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else max(1.0, self.rate))
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _reserve(self) -> float:
+        """Take one token, possibly going into debt; return how long the caller must wait."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1.0
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+    async def acquire(self):
+        if self.rate <= 0:
+            return
+        delay = self._reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
@@ -0,0 +1,15 @@
+"""JSON response class rendered with orjson when it is installed."""
+from fastapi.responses import JSONResponse
+
+try:
+    # optional: orjson serializes large lists of dicts several times faster than json.dumps
+    import orjson
+except Exception:
+    orjson = None
+
+
+class FastJSONResponse(JSONResponse):
+    def render(self, content) -> bytes:
+        if orjson is None:
+            return super().render(content)
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
@@ -0,0 +1,32 @@
+"""Stream an UploadFile to disk in chunks, hashing it and enforcing a size cap."""
+import hashlib
+import os
+from typing import Tuple
+
+from fastapi import UploadFile
+
+
+class UploadTooLarge(Exception):
+    """Raised when an upload exceeds the byte limit; the partial file is removed."""
+
+
+async def save_upload(file: UploadFile, path: str, max_bytes: int, chunk_size: int = 1 << 20) -> Tuple[str, int]:
+    """Write `file` to `path` chunk by chunk; returns (sha256 hex digest, size in bytes)."""
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        with open(path, "wb") as out:
+            while True:
+                chunk = await file.read(chunk_size)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if max_bytes and size > max_bytes:
+                    raise UploadTooLarge(f"upload exceeds {max_bytes} bytes")
+                digest.update(chunk)
+                out.write(chunk)
+    except BaseException:
+        if os.path.exists(path):
+            os.remove(path)
+        raise
+    return digest.hexdigest(), size
@@ -0,0 +1,123 @@
+"""Baseline schema: exactly what `create_all` built before the app had migrations.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from app.models import Vector
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def _embedding():
+    return sa.Column("embedding", Vector(384) if Vector is not None else sa.Text())
+
+
+def upgrade():
+    if Vector is not None and op.get_bind().dialect.name == "postgresql":
+        op.execute("CREATE EXTENSION IF NOT EXISTS vector")
+    op.create_table(
+        "programs",
+        sa.Column("id", sa.Integer, primary_key=True),
+        sa.Column("name", sa.String, nullable=False, unique=True),
+        sa.Column("description", sa.Text),
+        sa.Column("created_at", sa.DateTime),
+    )
+    op.create_index("ix_programs_id", "programs", ["id"])
+    op.create_table(
+        "program_outcomes",
+        sa.Column("id", sa.Integer, primary_key=True),
+        sa.Column("program_id", sa.Integer, sa.ForeignKey("programs.id"), nullable=False),
+        sa.Column("outcome_name", sa.String, nullable=False),
+        sa.Column("outcome_description", sa.Text),
+        sa.Column("related_skills", sa.Text),
+        sa.Column("internship_keywords", sa.Text),
+        sa.Column("created_at", sa.DateTime),
+    )
+    op.create_index("ix_program_outcomes_id", "program_outcomes", ["id"])
+    op.create_table(
+        "students",
+        sa.Column("id", sa.Integer, primary_key=True),
+        sa.Column("name", sa.String, nullable=False),
+        sa.Column("email", sa.String, nullable=False, unique=True),
+        sa.Column("program_id", sa.Integer, sa.ForeignKey("programs.id")),
+        sa.Column("gpa", sa.Float),
+        sa.Column("protected_age", sa.Integer),
+        sa.Column("created_at", sa.DateTime),
+    )
+    op.create_index("ix_students_id", "students", ["id"])
+    op.create_table(
+        "student_outcomes",
+        sa.Column("id", sa.Integer, primary_key=True),
+        sa.Column("student_id", sa.Integer, sa.ForeignKey("students.id"), nullable=False),
+        sa.Column("outcome_id", sa.Integer, sa.ForeignKey("program_outcomes.id"), nullable=False),
+        sa.Column("is_primary", sa.Boolean),
+        sa.Column("proficiency_level", sa.String),
+        sa.Column("created_at", sa.DateTime),
+    )
+    op.create_index("ix_student_outcomes_id", "student_outcomes", ["id"])
+    op.create_table(
+        "resumes",
+        sa.Column("id", sa.Integer, primary_key=True),
+        sa.Column("student_id", sa.Integer, sa.ForeignKey("students.id")),
+        sa.Column("filename", sa.String),
+        sa.Column("parsed_text", sa.Text),
+        sa.Column("skills", sa.Text),
+        sa.Column("outcomes", sa.Text),
+        sa.Column("created_at", sa.DateTime),
+        _embedding(),
+    )
+    op.create_index("ix_resumes_id", "resumes", ["id"])
+    op.create_table(
+        "departments",
+        sa.Column("id", sa.Integer, primary_key=True),
+        sa.Column("name", sa.String, unique=True),
+        sa.Column("program_focus", sa.String),
+        sa.Column("description", sa.Text),
+        sa.Column("required_skills", sa.Text),
+        _embedding(),
+    )
+    op.create_index("ix_departments_id", "departments", ["id"])
+    op.create_table(
+        "internships",
+        sa.Column("id", sa.Integer, primary_key=True),
+        sa.Column("title", sa.String, nullable=False),
+        sa.Column("company_name", sa.String, nullable=False),
+        sa.Column("location", sa.String),
+        sa.Column("description", sa.Text),
+        sa.Column("required_skills", sa.Text),
+        sa.Column("outcome_focus", sa.String),
+        sa.Column("posting_url", sa.String),
+        sa.Column("posted_date", sa.DateTime),
+        sa.Column("is_active", sa.Integer),
+        sa.Column("source", sa.String),
+        sa.Column("created_at", sa.DateTime),
+        _embedding(),
+    )
+    op.create_index("ix_internships_id", "internships", ["id"])
+    op.create_table(
+        "recommendations",
+        sa.Column("id", sa.Integer, primary_key=True),
+        sa.Column("student_id", sa.Integer, sa.ForeignKey("students.id")),
+        sa.Column("internship_id", sa.Integer, sa.ForeignKey("internships.id")),
+        sa.Column("department_id", sa.Integer, sa.ForeignKey("departments.id")),
+        sa.Column("outcome_match", sa.String),
+        sa.Column("score", sa.Float),
+        sa.Column("skill_match_score", sa.Float),
+        sa.Column("outcome_match_score", sa.Float),
+        sa.Column("reason", sa.Text),
+        sa.Column("created_at", sa.DateTime),
+    )
+    op.create_index("ix_recommendations_id", "recommendations", ["id"])
+
+
+def downgrade():
+    for table in ("recommendations", "internships", "departments", "resumes",
+                  "student_outcomes", "students", "program_outcomes", "programs"):
+        op.drop_table(table)
@@ -0,0 +1,74 @@
+"""Columns, tables and indexes added on top of the baseline before migrations existed.
+
+Catalog versioning (catalog_meta, recommendations.resume_id/catalog_version and
+their partial unique indexes), normalized internship city/region, upload
+content hashes and the embedding_model stamps. Databases stamped at the
+baseline by `app.migrate.upgrade_to_head` get all of them here.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "catalog_meta",
+        sa.Column("id", sa.Integer, primary_key=True),
+        sa.Column("version", sa.Integer, nullable=False),
+        sa.Column("updated_at", sa.DateTime),
+    )
+    # seeded so bump_catalog_version only ever updates this row
+    op.bulk_insert(sa.table("catalog_meta", sa.column("id", sa.Integer), sa.column("version", sa.Integer)),
+                   [{"id": 1, "version": 0}])
+    with op.batch_alter_table("recommendations") as batch:
+        batch.add_column(sa.Column("resume_id", sa.Integer))
+        batch.add_column(sa.Column("catalog_version", sa.Integer))
+        batch.create_foreign_key("fk_recommendations_resume_id", "resumes", ["resume_id"], ["id"])
+    op.create_index("uq_recommendations_resume_department", "recommendations",
+                    ["resume_id", "department_id", "catalog_version"], unique=True,
+                    postgresql_where=sa.text("department_id IS NOT NULL"),
+                    sqlite_where=sa.text("department_id IS NOT NULL"))
+    op.create_index("uq_recommendations_resume_internship", "recommendations",
+                    ["resume_id", "internship_id", "catalog_version"], unique=True,
+                    postgresql_where=sa.text("internship_id IS NOT NULL"),
+                    sqlite_where=sa.text("internship_id IS NOT NULL"))
+    with op.batch_alter_table("internships") as batch:
+        batch.add_column(sa.Column("city", sa.String))
+        batch.add_column(sa.Column("region", sa.String))
+        batch.add_column(sa.Column("embedding_model", sa.String))
+    op.create_index("ix_internships_city", "internships", ["city"])
+    op.create_index("ix_internships_region", "internships", ["region"])
+    with op.batch_alter_table("resumes") as batch:
+        batch.add_column(sa.Column("content_hash", sa.String(64)))
+    op.create_index("ix_resumes_content_hash", "resumes", ["content_hash"])
+    with op.batch_alter_table("departments") as batch:
+        batch.add_column(sa.Column("embedding_model", sa.String))
+
+
+def downgrade():
+    with op.batch_alter_table("departments") as batch:
+        batch.drop_column("embedding_model")
+    op.drop_index("ix_resumes_content_hash", table_name="resumes")
+    with op.batch_alter_table("resumes") as batch:
+        batch.drop_column("content_hash")
+    op.drop_index("ix_internships_region", table_name="internships")
+    op.drop_index("ix_internships_city", table_name="internships")
+    with op.batch_alter_table("internships") as batch:
+        batch.drop_column("embedding_model")
+        batch.drop_column("region")
+        batch.drop_column("city")
+    op.drop_index("uq_recommendations_resume_internship", table_name="recommendations")
+    op.drop_index("uq_recommendations_resume_department", table_name="recommendations")
+    with op.batch_alter_table("recommendations") as batch:
+        batch.drop_constraint("fk_recommendations_resume_id", type_="foreignkey")
+        batch.drop_column("catalog_version")
+        batch.drop_column("resume_id")
+    op.drop_table("catalog_meta")
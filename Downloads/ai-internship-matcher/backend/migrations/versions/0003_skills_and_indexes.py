@@ -0,0 +1,79 @@
+"""Normalized skills dictionary, internship_skills join table and missing indexes.
+
+Skills go into a join table indexed on (skill_id, internship_id) with a b-tree
+instead of a text[] column with a GIN index (see app.nlp.sql_scoring): the
+overlap query is an IN over skill ids grouped per posting, which a b-tree
+serves, and it keeps the schema portable to SQLite. Resume.skills is left as
+a comma string.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+BATCH = 1000
+
+
+def upgrade():
+    op.create_table(
+        "skills",
+        sa.Column("id", sa.Integer, primary_key=True),
+        sa.Column("name", sa.String, nullable=False, unique=True),
+    )
+    op.create_table(
+        "internship_skills",
+        sa.Column("internship_id", sa.Integer, sa.ForeignKey("internships.id", ondelete="CASCADE"), primary_key=True),
+        sa.Column("skill_id", sa.Integer, sa.ForeignKey("skills.id", ondelete="CASCADE"), primary_key=True),
+    )
+    op.create_index("ix_internship_skills_skill", "internship_skills", ["skill_id", "internship_id"])
+    with op.batch_alter_table("internships") as batch:
+        batch.add_column(sa.Column("skill_count", sa.Integer, nullable=False, server_default="0"))
+    op.create_index("ix_internships_is_active", "internships", ["is_active"])
+    op.create_index("ix_internships_title_company", "internships", ["title", "company_name"])
+    op.create_index("ix_resumes_created_at", "resumes", ["created_at"])
+    _backfill_internship_skills()
+
+
+def _backfill_internship_skills():
+    """Split the existing comma-separated `required_skills` into the join table."""
+    bind = op.get_bind()
+    internships = sa.table("internships", sa.column("id", sa.Integer), sa.column("required_skills", sa.Text),
+                           sa.column("skill_count", sa.Integer))
+    skills = sa.table("skills", sa.column("id", sa.Integer), sa.column("name", sa.String))
+    links = sa.table("internship_skills", sa.column("internship_id", sa.Integer), sa.column("skill_id", sa.Integer))
+
+    per_row = {}
+    for row_id, raw in bind.execute(sa.select(internships.c.id, internships.c.required_skills)):
+        names = {s.strip().lower() for s in (raw or "").split(",") if s.strip()}
+        if names:
+            per_row[row_id] = names
+    names = sorted(set().union(*per_row.values())) if per_row else []
+    for i in range(0, len(names), BATCH):
+        bind.execute(skills.insert(), [{"name": n} for n in names[i:i + BATCH]])
+    ids = {name: skill_id for skill_id, name in bind.execute(sa.select(skills.c.id, skills.c.name))}
+
+    pairs = [{"internship_id": row_id, "skill_id": ids[n]} for row_id, row_names in per_row.items() for n in row_names]
+    for i in range(0, len(pairs), BATCH):
+        bind.execute(links.insert(), pairs[i:i + BATCH])
+    counts = [{"b_id": row_id, "n": len(row_names)} for row_id, row_names in per_row.items()]
+    if counts:
+        bind.execute(internships.update().where(internships.c.id == sa.bindparam("b_id"))
+                     .values(skill_count=sa.bindparam("n")), counts)
+
+
+def downgrade():
+    op.drop_index("ix_resumes_created_at", table_name="resumes")
+    op.drop_index("ix_internships_title_company", table_name="internships")
+    op.drop_index("ix_internships_is_active", table_name="internships")
+    with op.batch_alter_table("internships") as batch:
+        batch.drop_column("skill_count")
+    op.drop_index("ix_internship_skills_skill", table_name="internship_skills")
+    op.drop_table("internship_skills")
+    op.drop_table("skills")
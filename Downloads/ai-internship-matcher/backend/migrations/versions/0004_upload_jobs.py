@@ -0,0 +1,32 @@
+"""Upload job status table, so any API worker can answer GET /api/jobs/{id}.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "upload_jobs",
+        sa.Column("id", sa.String(32), primary_key=True),
+        sa.Column("kind", sa.String, nullable=False),
+        sa.Column("status", sa.String, nullable=False),
+        sa.Column("result", sa.Text),
+        sa.Column("error", sa.Text),
+        sa.Column("created_at", sa.Float, nullable=False),
+        sa.Column("finished_at", sa.Float),
+    )
+    op.create_index("ix_upload_jobs_finished_at", "upload_jobs", ["finished_at"])
+
+
+def downgrade():
+    op.drop_index("ix_upload_jobs_finished_at", table_name="upload_jobs")
+    op.drop_table("upload_jobs")
@@ -0,0 +1,46 @@
+"""Embed internships/departments whose embedding is missing or from another model.
+
+Run from the backend folder:
+
+    python -m scripts.backfill_embeddings                      # internships + departments once
+    python -m scripts.backfill_embeddings --target internships --chunk-size 512
+    python -m scripts.backfill_embeddings --watch 300          # keep running, re-check every 5 minutes
+
+Safe to interrupt: each chunk commits, and the next run picks up the rows
+that are still stale. Changing EMBEDDING_MODEL re-embeds only rows tagged
+with a different model.
+"""
+import argparse
+import time
+
+from app.db import SessionLocal
+from app.nlp.backfill import TARGETS, backfill_embeddings
+
+
+def run_once(targets, chunk_size):
+    db = SessionLocal()
+    try:
+        for target in targets:
+            n = backfill_embeddings(db, target, chunk_size=chunk_size,
+                                    progress=lambda done, last_id: print(f"{target}: {done} rows (last id {last_id})"))
+            print(f"{target}: {n} rows embedded")
+    finally:
+        db.close()
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Backfill missing or stale embeddings")
+    ap.add_argument("--target", choices=sorted(TARGETS), action="append")
+    ap.add_argument("--chunk-size", type=int, default=None, help="default BACKFILL_CHUNK_SIZE")
+    ap.add_argument("--watch", type=float, default=0, help="seconds between passes; 0 runs once")
+    args = ap.parse_args()
+    targets = args.target or ["internships", "departments"]
+    while True:
+        run_once(targets, args.chunk_size)
+        if not args.watch:
+            break
+        time.sleep(args.watch)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""Benchmark PDF text extraction: pdfminer whole-document vs budgeted serial/parallel.
+
+Run from the backend folder:
+
+    python -m scripts.bench_pdf_extraction
+    python -m scripts.bench_pdf_extraction --pages 1 10 50 200 --workers 4 --budget 2
+
+A corpus of text PDFs of the given page counts is generated with a tiny
+hand-written PDF writer (no extra dependency), then each is extracted with
+`pdfminer.high_level.extract_text`, `extract_pdf(workers=1)` and
+`extract_pdf(workers=N)`. The budget column runs the parallel mode with a
+time budget and shows how many pages made it in before truncation.
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from app.nlp.pdf_extract import extract_pdf
+
+WORDS = ("python sql docker machine learning data analysis react vue linux networking "
+         "internship project team model pipeline research").split()
+
+
+def _pdf_string(s: str) -> str:
+    return s.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def make_pdf(path: str, pages: int, lines_per_page: int = 45):
+    """Write a minimal valid PDF with `pages` pages of Helvetica text."""
+    objects = []  # body of object i+1
+
+    def add(body: bytes) -> int:
+        objects.append(body)
+        return len(objects)
+
+    catalog = add(b"")  # filled in once the page tree exists
+    tree = add(b"")
+    font = add(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+    kids = []
+    for p in range(pages):
+        lines = [f"Page {p + 1}: " + " ".join(WORDS[(p + i + j) % len(WORDS)] for j in range(10))
+                 for i in range(lines_per_page)]
+        ops = ["BT", "/F1 10 Tf", "14 TL", "50 800 Td"]
+        ops += [f"({_pdf_string(line)}) Tj T*" for line in lines]
+        ops.append("ET")
+        stream = "\n".join(ops).encode("latin-1")
+        content = add(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+        kids.append(add(b"<< /Type /Page /Parent %d 0 R /MediaBox [0 0 612 842] "
+                        b"/Resources << /Font << /F1 %d 0 R >> >> /Contents %d 0 R >>" % (tree, font, content)))
+    objects[catalog - 1] = b"<< /Type /Catalog /Pages %d 0 R >>" % tree
+    objects[tree - 1] = (b"<< /Type /Pages /Kids [" + b" ".join(b"%d 0 R" % k for k in kids)
+                         + b"] /Count %d >>" % len(kids))
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for i, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % i + body + b"\nendobj\n"
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % off for off in offsets)
+    out += b"trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, catalog, xref)
+    with open(path, "wb") as f:
+        f.write(out)
+
+
+def _time(fn):
+    start = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - start, result
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Benchmark budgeted/parallel PDF extraction")
+    ap.add_argument("--pages", type=int, nargs="+", default=[1, 5, 20, 60, 150])
+    ap.add_argument("--workers", type=int, default=4)
+    ap.add_argument("--budget", type=float, default=1.0, help="time budget (s) for the truncation column")
+    args = ap.parse_args()
+
+    from pdfminer.high_level import extract_text
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # warm the pool so process start-up isn't charged to the first document
+        warm = os.path.join(tmp, "warm.pdf")
+        make_pdf(warm, args.workers * 4)
+        extract_pdf(warm, max_pages=0, time_budget=0, workers=args.workers, min_parallel_pages=1)
+
+        print(f"{'pages':>6} {'pdfminer':>9} {'serial':>9} {'parallel':>9} {'speedup':>8}  budget {args.budget:g}s")
+        for n in args.pages:
+            path = os.path.join(tmp, f"doc_{n}.pdf")
+            make_pdf(path, n)
+            t_full, full = _time(lambda: extract_text(path))
+            t_serial, serial = _time(lambda: extract_pdf(path, max_pages=0, time_budget=0, workers=1))
+            t_par, par = _time(lambda: extract_pdf(path, max_pages=0, time_budget=0, workers=args.workers))
+            assert serial.text == full and par.text == full, f"text mismatch at {n} pages"
+            t_budget, budgeted = _time(lambda: extract_pdf(path, max_pages=0, time_budget=args.budget,
+                                                           workers=args.workers))
+            print(f"{n:>6} {t_full:>8.3f}s {t_serial:>8.3f}s {t_par:>8.3f}s {t_full / t_par:>7.2f}x  "
+                  f"{budgeted.pages_read}/{n} pages in {t_budget:.2f}s{' (truncated)' if budgeted.truncated else ''}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""Benchmark skill extraction throughput (docs/sec) and check the extractors agree.
+
+Compares the old per-document path (one `nlp()` call per description,
+token/lemma and noun-chunk probes against SKILL_VOCAB) with the tokenizer +
+PhraseMatcher path behind `extract_skills_from_text` / `extract_skills_batch`,
+on the same corpus. The old path runs on `en_core_web_sm` when it is
+installed; otherwise on the blank English tokenizer, which has no lemmas or
+noun chunks, so that "before" times only the probe loop and is a lower bound
+on the real cost of the old pipeline.
+
+Parity (exit status 1 on failure): every document gets the same skills from
+`extract_skills_batch` as from `extract_skills_from_text`, and the new path
+finds every skill the old one found.
+
+Run from the backend folder:
+
+    python -m scripts.bench_skill_extraction --docs 500 --n-process 1 2
+
+Each path is timed `--repeat` times and the best run is reported.
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+import spacy
+
+from app.nlp.parser import extract_skills_batch, extract_skills_from_text, SKILL_VOCAB
+
+FILLER = (
+    "We are looking for a motivated intern to join our team in Makati. "
+    "You will work with senior engineers on internal tools and client projects. "
+    "Good communication skills and willingness to learn are required. "
+)
+
+
+def make_corpus(n, seed=7):
+    rng = random.Random(seed)
+    vocab = sorted(SKILL_VOCAB)
+    docs = []
+    for _ in range(n):
+        skills = ", ".join(rng.sample(vocab, rng.randint(2, 6)))
+        docs.append(FILLER * rng.randint(1, 4) + f"Experience with {skills} is a plus.")
+    return docs
+
+
+def legacy_pipeline():
+    """(nlp, label) for the old path: en_core_web_sm, or the blank tokenizer when it isn't installed."""
+    try:
+        return spacy.load("en_core_web_sm"), "en_core_web_sm"
+    except OSError:
+        return spacy.blank("en"), "blank tokenizer, lower bound"
+
+
+def legacy_skills(nlp, text):
+    doc = nlp(text.lower())
+    found = set()
+    for token in doc:
+        if token.lemma_ in SKILL_VOCAB or token.text in SKILL_VOCAB:
+            found.add(token.text)
+    if doc.has_annotation("DEP"):
+        for nc in doc.noun_chunks:
+            if nc.text.strip() in SKILL_VOCAB:
+                found.add(nc.text.strip())
+    return found
+
+
+def best_of(repeat, fn):
+    """Run `fn()` `repeat` times; its output and the fastest wall time."""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        out = fn()
+        secs = time.perf_counter() - start
+        best = secs if best is None else min(best, secs)
+    return out, best
+
+
+def parity_errors(docs, legacy, single, batch):
+    """Indexes of documents where batch != single, or where the new path misses a skill the old one found."""
+    errors = []
+    for i, (old, one, many) in enumerate(zip(legacy, single, batch)):
+        if set(one) != set(many) or not set(old) <= set(one):
+            errors.append(i)
+    return errors
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--docs", type=int, default=500)
+    ap.add_argument("--n-process", type=int, nargs="+", default=[1])
+    ap.add_argument("--repeat", type=int, default=3)
+    args = ap.parse_args()
+
+    docs = make_corpus(args.docs)
+    print(f"{len(docs)} docs, spaCy {spacy.__version__}, {os.cpu_count()} CPU(s), best of {args.repeat}")
+    nlp, label = legacy_pipeline()
+    legacy, secs = best_of(args.repeat, lambda: [sorted(legacy_skills(nlp, d)) for d in docs])
+    print(f"before: per-doc nlp() + probes ({label}): {len(docs) / secs:8.1f} docs/sec")
+    single, secs = best_of(args.repeat, lambda: [sorted(extract_skills_from_text(d)) for d in docs])
+    print(f"after:  extract_skills_from_text:  {len(docs) / secs:8.1f} docs/sec")
+    failed = False
+    for n in args.n_process:
+        batch, secs = best_of(args.repeat, lambda: [sorted(s) for s in extract_skills_batch(docs, n_process=n)])
+        errors = parity_errors(docs, legacy, single, batch)
+        extra = sum(set(one) != set(old) for old, one in zip(legacy, single))
+        print(f"after:  extract_skills_batch n={n}: {len(docs) / secs:8.1f} docs/sec  "
+              f"parity failures: {len(errors)}, docs with skills the old path missed: {extra}")
+        failed = failed or bool(errors)
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""Bulk-ingest a directory or manifest of resumes.
+
+Run from the backend folder:
+
+    python -m scripts.bulk_ingest_resumes --dir ./cohort_2025
+    python -m scripts.bulk_ingest_resumes --manifest cohort.csv --workers 4 --batch-size 200
+
+A manifest is a CSV with a `path` column and an optional `student_id` column
+(relative paths resolve against the manifest's folder). Per batch, text is
+extracted across a process pool, skills are matched with one `nlp.pipe` pass,
+texts are embedded in one call and all `Resume` rows go in with a single
+INSERT + commit. Finished paths are appended to a checkpoint file, so an
+interrupted run picks up with the next unfinished batch and retries files
+that failed; files whose content hash is already stored are skipped (same
+rule as the upload endpoints).
+"""
+import argparse
+import csv
+import hashlib
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from sqlalchemy import insert
+
+from app import models
+from app.config import settings
+from app.db import SessionLocal
+from app.nlp.embedding import embed_texts, to_column_value
+from app.nlp.parser import analyze_resume_text, extract_resume_text, extract_skills_batch, normalize_resume_text
+from app.nlp import pdf_extract
+
+EXTENSIONS = (".pdf", ".docx")
+
+
+def list_inputs(directory=None, manifest=None):
+    """[(path, student_id or None)] from a directory walk or a CSV manifest."""
+    if manifest:
+        base = os.path.dirname(os.path.abspath(manifest))
+        with open(manifest, newline="", encoding="utf-8") as f:
+            return [(os.path.join(base, row["path"]), int(row["student_id"]) if row.get("student_id") else None)
+                    for row in csv.DictReader(f)]
+    items = []
+    for root, _, files in os.walk(directory):
+        items += [(os.path.join(root, name), None) for name in files if name.lower().endswith(EXTENSIONS)]
+    return sorted(items)
+
+
+def read_resume(path):
+    """Worker: (path, sha256, raw text, error)."""
+    try:
+        with open(path, "rb") as f:
+            content_hash = hashlib.sha256(f.read()).hexdigest()
+        text, _ = extract_resume_text(path)
+        return path, content_hash, text, None
+    except Exception as e:
+        return path, None, None, str(e)
+
+
+def load_checkpoint(path):
+    if not os.path.exists(path):
+        return set()
+    with open(path, encoding="utf-8") as f:
+        return {line.rstrip("\n") for line in f if line.strip()}
+
+
+def ingest_batch(db, pool, batch):
+    """Extract, analyze, embed and insert one batch; returns (inserted, skipped, failed paths)."""
+    owners = dict(batch)
+    read = list(pool.map(read_resume, [p for p, _ in batch]))
+    failed = [(p, err) for p, _, _, err in read if err]
+    for p, err in failed:
+        print(f"  failed {p}: {err}")
+    ok = [(p, h, t) for p, h, t, err in read if not err]
+
+    hashes = {h for _, h, _ in ok}
+    known = {h for (h,) in db.query(models.Resume.content_hash).filter(models.Resume.content_hash.in_(hashes))}
+    fresh, seen = [], set()
+    for p, h, t in ok:
+        if h not in known and h not in seen:
+            seen.add(h)
+            fresh.append((p, h, t))
+    if not fresh:
+        return 0, len(ok), [p for p, _ in failed]
+
+    norm = [normalize_resume_text(t) for _, _, t in fresh]
+    skills = extract_skills_batch(norm, n_process=settings.SPACY_N_PROCESS)
+    parsed = [analyze_resume_text(t, skills=s) for (_, _, t), s in zip(fresh, skills)]
+    vecs = embed_texts([r["text"] for r in parsed])
+    rows = [{
+        "student_id": owners[p],
+        "filename": os.path.basename(p),
+        "parsed_text": r["text"],
+        "skills": ",".join(r["skills"]),
+        "outcomes": ",".join(r["outcomes"]),
+        "embedding": to_column_value(v),
+        "content_hash": h,
+    } for (p, h, _), r, v in zip(fresh, parsed, vecs)]
+    db.execute(insert(models.Resume), rows)
+    db.commit()
+    return len(rows), len(ok) - len(rows), [p for p, _ in failed]
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Bulk-ingest resumes from a directory or CSV manifest")
+    src = ap.add_mutually_exclusive_group(required=True)
+    src.add_argument("--dir")
+    src.add_argument("--manifest")
+    ap.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    ap.add_argument("--batch-size", type=int, default=100)
+    ap.add_argument("--checkpoint", help="default: <dir or manifest>.checkpoint")
+    args = ap.parse_args()
+
+    checkpoint = args.checkpoint or (args.dir or args.manifest).rstrip("/\\") + ".checkpoint"
+    done = load_checkpoint(checkpoint)
+    todo = [item for item in list_inputs(args.dir, args.manifest) if item[0] not in done]
+    print(f"{len(todo)} files to ingest ({len(done)} already in {checkpoint})")
+
+    totals = [0, 0, 0]
+    start = time.perf_counter()
+    db = SessionLocal()
+    try:
+        with ProcessPoolExecutor(max_workers=args.workers, mp_context=multiprocessing.get_context("spawn"),
+                                 initializer=pdf_extract.serial_only) as pool, \
+                open(checkpoint, "a", encoding="utf-8") as ckpt:
+            for i in range(0, len(todo), args.batch_size):
+                batch = todo[i:i + args.batch_size]
+                inserted, skipped, failed = ingest_batch(db, pool, batch)
+                # failed files stay out of the checkpoint so the next run retries them
+                ckpt.write("".join(p + "\n" for p, _ in batch if p not in failed))
+                ckpt.flush()
+                totals = [totals[0] + inserted, totals[1] + skipped, totals[2] + len(failed)]
+                print(f"{i + len(batch)}/{len(todo)}: inserted {inserted}, skipped {skipped}, failed {len(failed)}")
+    finally:
+        db.close()
+    elapsed = time.perf_counter() - start
+    print(f"inserted {totals[0]}, skipped {totals[1]} duplicates, failed {totals[2]} in {elapsed:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""Measure how long `import app.main` takes and fail when it exceeds the budget.
+
+Run from the backend folder:
+
+    python -m scripts.check_import_time            # budget from IMPORT_TIME_BUDGET_SECONDS
+    python -m scripts.check_import_time --budget 2 --top 15
+
+The import runs in a fresh interpreter with `-X importtime`, so the number is
+what a new uvicorn worker pays before it can serve `/api/health`. The slowest
+modules (cumulative time) are printed to show what to make lazy next.
+"""
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def measure(module="app.main"):
+    start = time.perf_counter()
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                          cwd=BACKEND_DIR, capture_output=True, text=True)
+    elapsed = time.perf_counter() - start
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        rows.append((int(cumulative_us), name.strip()))
+    return proc.returncode, elapsed, rows, proc.stderr
+
+
+def main():
+    from app.config import settings
+    ap = argparse.ArgumentParser(description="Check the import-time budget of app.main")
+    ap.add_argument("--budget", type=float, default=settings.IMPORT_TIME_BUDGET_SECONDS)
+    ap.add_argument("--top", type=int, default=10)
+    args = ap.parse_args()
+
+    code, elapsed, rows, stderr = measure()
+    if code != 0:
+        print("\n".join(l for l in stderr.splitlines() if not l.startswith("import time:")))
+        print("import app.main failed")
+        return 2
+    print(f"import app.main: {elapsed:.2f}s (budget {args.budget:.2f}s)")
+    for cumulative_us, name in sorted(rows, reverse=True)[:args.top]:
+        print(f"  {cumulative_us / 1e6:6.3f}s  {name}")
+    if elapsed > args.budget:
+        print("over budget")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
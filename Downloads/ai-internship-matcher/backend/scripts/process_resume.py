@@ -1,8 +1,9 @@
 """
 Helper to process a resume file: parse text, create embedding, save Resume record.
 
-Provides `process_resume_file(db, path, filename, run_scrape=False)` which
-returns a tuple `(resume_id, parsed, embedding_path)`.
+Provides `process_resume_file(path, filename, db=None, run_scrape=False, student_id=None, content_hash=None)` which
+returns a tuple `(resume_id, parsed, embedding_path)`, and `store_parsed_resume` for the embed + insert half
+(the upload jobs parse in a worker process and store in the API process).
 
 This module intentionally keeps responsibilities narrow so it's reusable
 from API endpoints and CLI scripts.
@@ -14,7 +15,7 @@ from sqlalchemy.orm import Session
 
 from app.db import SessionLocal
 from app.nlp.parser import parse_resume
-from app.nlp.embedding import embed_text, save_embedding
+from app.nlp.embedding import embed_text, to_column_value
 from app import models
 
 try:
@@ -24,54 +25,64 @@ except Exception:
     scrape_internships = None
 
 
-def process_resume_file(path: str, filename: Optional[str] = None, db: Optional[Session] = None, run_scrape: bool = False) -> Tuple[int, dict, str]:
-    """Parse, embed and persist a resume file.
-
-    - `path`: filesystem path to uploaded file
-    - `filename`: original filename (optional)
-    - `db`: optional SQLAlchemy Session; if None a new SessionLocal will be used
-    - `run_scrape`: if True will attempt to call `scrape_internships(..., db=...)` after saving
-
-    Returns: `(resume_id, parsed_dict, embedding_path)`
-    """
+def store_parsed_resume(parsed: dict, filename: str, db: Optional[Session] = None, student_id: Optional[int] = None,
+                        content_hash: Optional[str] = None) -> int:
+    """Embed the text of an already parsed resume and insert its Resume row (one commit); returns the id."""
     own_session = False
     if db is None:
         db = SessionLocal()
         own_session = True
-
     try:
-        parsed = parse_resume(path)
+        embedding = None
+        try:
+            # stored in the column (pgvector list or JSON text) so the row is written with one commit
+            embedding = to_column_value(embed_text(parsed.get("text", "")))
+        except Exception:
+            # embedding optional; continue
+            pass
 
         resume = models.Resume(
-            filename=filename or os.path.basename(path),
+            student_id=student_id,
+            content_hash=content_hash,
+            filename=filename,
             parsed_text=parsed.get("text", ""),
             skills=",".join(parsed.get("skills", [])),
             outcomes=",".join(parsed.get("outcomes", [])),
+            embedding=embedding,
             created_at=datetime.utcnow()
         )
         db.add(resume)
         db.commit()
         db.refresh(resume)
+        return resume.id
+    finally:
+        if own_session:
+            db.close()
+
+
+def process_resume_file(path: str, filename: Optional[str] = None, db: Optional[Session] = None, run_scrape: bool = False,
+                        student_id: Optional[int] = None, content_hash: Optional[str] = None) -> Tuple[int, dict, str]:
+    """Parse, embed and persist a resume file.
 
+    - `path`: filesystem path to uploaded file
+    - `filename`: original filename (optional)
+    - `db`: optional SQLAlchemy Session; if None a new SessionLocal will be used
+    - `run_scrape`: if True will attempt to call `scrape_internships(..., db=...)` after saving
+    - `student_id`: optional owner of the resume
+    - `content_hash`: sha256 of the file, stored so identical uploads can reuse this parse
+
+    Returns: `(resume_id, parsed_dict, embedding_path)`
+    """
+    own_session = False
+    if db is None:
+        db = SessionLocal()
+        own_session = True
+
+    try:
+        parsed = parse_resume(path)
+        resume_id = store_parsed_resume(parsed, filename or os.path.basename(path), db=db, student_id=student_id,
+                                        content_hash=content_hash)
         emb_path = ""
-        try:
-            emb = embed_text(parsed.get("text", ""))
-            # If model is available, store vector directly in DB (pgvector)
-            try:
-                # accept numpy arrays or lists
-                resume.embedding = emb.tolist() if hasattr(emb, 'tolist') else list(emb)
-                db.add(resume)
-                db.commit()
-            except Exception:
-                # Fallback: save to disk and store path
-                db.rollback()
-                emb_path = save_embedding(resume.id, emb, prefix="resume")
-                resume.embedding = emb_path
-                db.add(resume)
-                db.commit()
-        except Exception:
-            # embedding optional; continue
-            db.rollback()
 
         # Optional: refresh internships via scraper
         if run_scrape and callable(scrape_internships):
@@ -82,7 +93,7 @@ def process_resume_file(path: str, filename: Optional[str] = None, db: Optional[
                 # do not propagate scraper errors
                 pass
 
-        return resume.id, parsed, emb_path
+        return resume_id, parsed, emb_path
     finally:
         if own_session:
             db.close()
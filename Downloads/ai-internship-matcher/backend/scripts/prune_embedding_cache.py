@@ -0,0 +1,29 @@
+"""Trim the on-disk embedding cache to its least recently used entries.
+
+The API prunes the directory on its own once EMBED_DISK_CACHE_MAX_ITEMS is
+exceeded; this is for shrinking it further, or after switching EMBEDDING_MODEL
+(vectors of the old model are never read again and age out first).
+
+Run from the backend folder:
+
+    python -m scripts.prune_embedding_cache                    # down to EMBED_DISK_CACHE_MAX_ITEMS
+    python -m scripts.prune_embedding_cache --max-items 20000
+"""
+import argparse
+
+from app.nlp.embedding import cache
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Prune the on-disk embedding cache")
+    ap.add_argument("--max-items", type=int, default=None, help="default EMBED_DISK_CACHE_MAX_ITEMS")
+    args = ap.parse_args()
+    if not cache.directory:
+        print("disk cache disabled (EMBED_DISK_CACHE=False)")
+        return
+    removed = cache.prune(args.max_items)
+    print(f"{cache.directory}: {removed} entries removed")
+
+
+if __name__ == "__main__":
+    main()
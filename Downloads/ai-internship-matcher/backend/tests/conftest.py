@@ -0,0 +1,29 @@
+import os
+import sys
+
+import pytest
+
+# run from anywhere: make `app` importable from the backend directory
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# never touch the database configured in backend/.env; tests build their own SQLite files
+os.environ["DATABASE_URL"] = "sqlite://"
+
+
+@pytest.fixture
+def db(tmp_path):
+    """Session on a fresh SQLite database with every table, and no cached catalog snapshot."""
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+
+    from app import catalog, models
+
+    engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}")
+    models.Base.metadata.create_all(engine)
+    catalog.invalidate_catalog()
+    session = sessionmaker(bind=engine)()
+    try:
+        yield session
+    finally:
+        session.close()
+        engine.dispose()
+        catalog.invalidate_catalog()
@@ -0,0 +1,53 @@
+"""Disk tier of `EmbeddingCache`: capped at `max_disk_items`, least recently used files go first."""
+import os
+import threading
+import time
+
+import numpy as np
+
+from app.nlp.embedding_cache import EmbeddingCache
+
+
+def disk_keys(cache):
+    return {name[:-4] for _, _, files in os.walk(cache.directory) for name in files if name.endswith(".npy")}
+
+
+def fill(cache, n):
+    """Put `n` vectors, each file one minute older than the next; returns their keys, oldest first."""
+    keys = [cache.key(f"text {i}") for i in range(n)]
+    now = time.time()
+    for i, key in enumerate(keys):
+        cache.put(key, np.full(4, i, dtype=np.float32))
+        os.utime(cache._path(key), (now - 60 * (n - i), now - 60 * (n - i)))
+    return keys
+
+
+def test_prune_keeps_most_recently_used(tmp_path):
+    cache = EmbeddingCache("m", max_items=1, directory=str(tmp_path))
+    keys = fill(cache, 6)
+    # a disk hit (memory LRU holds one item, so this goes to disk) refreshes the oldest entry
+    assert cache.get(keys[0])[0] == 0
+    assert cache.stats()["disk_hits"] == 1
+    assert cache.prune(3) == 3
+    assert disk_keys(cache) == {keys[0], keys[4], keys[5]}
+    assert cache.stats()["disk_evicted"] == 3
+    assert cache.prune(3) == 0
+
+
+def test_unbounded_by_default(tmp_path):
+    cache = EmbeddingCache("m", directory=str(tmp_path))
+    fill(cache, 5)
+    assert cache.prune() == 0
+    assert len(disk_keys(cache)) == 5
+
+
+def test_writes_trigger_background_prune(tmp_path):
+    cache = EmbeddingCache("m", max_items=1, directory=str(tmp_path), max_disk_items=4)
+    fill(cache, 12)
+    for t in threading.enumerate():
+        if t.name == "embed-cache-prune":
+            t.join(timeout=10)
+    assert cache.stats()["disk_evicted"] > 0
+    # whatever a racing background run skipped, an explicit prune settles on the cap, newest kept
+    cache.prune()
+    assert disk_keys(cache) == {cache.key(f"text {i}") for i in range(8, 12)}
@@ -0,0 +1,66 @@
+"""Philippines detection and city/region resolution in app.utils.location."""
+import pytest
+
+from app.utils.location import LocationMatch, classify_location, classify_locations, is_philippines_location
+
+
+@pytest.mark.parametrize("location, expected", [
+    ("Makati City, Metro Manila", LocationMatch(True, "Makati", "NCR")),
+    ("Cebu City", LocationMatch(True, "Cebu City", "Central Visayas")),
+    ("BGC, Taguig", LocationMatch(True, "Taguig", "NCR")),
+    ("Remote (Philippines)", LocationMatch(True, None, None)),
+    ("Manila, PH", LocationMatch(True, "Manila", "NCR")),
+    ("Tokyo, Japan", LocationMatch(False)),
+])
+def test_unambiguous_locations(location, expected):
+    assert classify_location(location) == expected
+
+
+@pytest.mark.parametrize("location", [
+    "Laguna Beach, CA",
+    "Laguna Niguel, California",
+    "Santa Rosa, CA",
+    "Gurgaon, Delhi NCR",
+    "Montreal, QC",
+    "Clark, NJ",
+    "Valenzuela, Venezuela",
+])
+def test_ambiguous_names_alone_are_not_ph(location):
+    assert classify_location(location) == LocationMatch(False)
+
+
+def test_ambiguous_name_in_description_is_not_ph():
+    assert not is_philippines_location("Remote", description="Work with our Laguna Beach office and Clark's team.")
+
+
+def test_phil_abbreviation_is_not_a_signal():
+    assert not is_philippines_location("Boston, MA", description="Report to Phil. Smith, the team lead.")
+
+
+@pytest.mark.parametrize("location, kwargs, expected", [
+    # another PH signal lets the ambiguous name resolve the city/region
+    ("Santa Rosa, Laguna, Philippines", {}, LocationMatch(True, "Santa Rosa", "CALABARZON")),
+    ("Santa Rosa", {"country": "PH"}, LocationMatch(True, "Santa Rosa", "CALABARZON")),
+    ("Santa Rosa, PH", {}, LocationMatch(True, "Santa Rosa", "CALABARZON")),
+    ("Clark, Pampanga", {}, LocationMatch(True, None, "Central Luzon")),
+    ("Laguna", {"posting_url": "https://jobs.example.ph/1"}, LocationMatch(True, None, "CALABARZON")),
+    # two ambiguous names of the same region back each other up
+    ("Santa Rosa, Laguna", {}, LocationMatch(True, "Santa Rosa", "CALABARZON")),
+])
+def test_ambiguous_names_resolve_with_a_ph_signal(location, kwargs, expected):
+    assert classify_location(location, **kwargs) == expected
+
+
+def test_ambiguous_name_does_not_override_unambiguous_region():
+    match = classify_location("Laguna Beach, CA", description="Hybrid, reporting to our Manila office.")
+    assert match == LocationMatch(True, "Manila", "NCR")
+
+
+def test_location_only_tokens():
+    assert is_philippines_location("Quezon City, PH")
+    assert not is_philippines_location("Remote", description="Graph theory, ph scale and PHP experience")
+
+
+def test_batch_matches_single():
+    items = [{"location": "Pasig"}, {"location": "Laguna Beach, CA"}, {"location": "Remote", "country": "Philippines"}]
+    assert classify_locations(items) == [classify_location(i.get("location"), country=i.get("country")) for i in items]
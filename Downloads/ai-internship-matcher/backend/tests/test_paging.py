@@ -0,0 +1,77 @@
+"""Keyset paging: recommendation cursors (score, id) and the id cursors of the list endpoints."""
+import pytest
+from sqlalchemy import insert
+
+from app import crud, models
+from app.config import settings
+from app.topk import get_top_k, next_cursor, parse_cursor
+
+
+@pytest.fixture
+def resume(db):
+    # three score levels with several postings each, so page boundaries fall inside ties
+    skills = ["python,sql", "python,java", "python", "java,go", "python,sql,go", "sql", "python,sql", "go"] * 2
+    db.execute(insert(models.Internship), [dict(title=f"t{n}", company_name="c", required_skills=s,
+                                                description="x" * 500, is_active=1) for n, s in enumerate(skills)])
+    db.commit()
+    r = models.Resume(filename="r", skills="python,sql", outcomes="")
+    db.add(r)
+    db.commit()
+    return r
+
+
+def walk(db, resume, size):
+    """Every page as the endpoint serves them: read `size + 1`, follow the cursor until there is none."""
+    pages, cursor = [], None
+    while True:
+        page = get_top_k(db, resume, after=parse_cursor(cursor), limit=size + 1)
+        pages.append(page[:size])
+        cursor = next_cursor(page, size)
+        if cursor is None:
+            return pages
+
+
+@pytest.mark.parametrize("size", [1, 3, 5, 16, 50])
+def test_pages_concatenate_to_the_full_list(db, resume, size):
+    full = get_top_k(db, resume)
+    pages = walk(db, resume, size)
+    assert [r["id"] for p in pages for r in p] == [r["id"] for r in full]
+    assert all(pages) and all(len(p) == size for p in pages[:-1])
+    keys = [(-r["match_score"], r["id"]) for r in full]
+    assert keys == sorted(keys) and len(set(r["match_score"] for r in full)) < len(full)
+
+
+def test_cursor_format():
+    page = [{"id": 7, "match_score": 80}, {"id": 9, "match_score": 80}, {"id": 2, "match_score": 40}]
+    assert next_cursor(page, 2) == "80:9"
+    assert parse_cursor("80:9") == (80, 9)
+    assert next_cursor(page, 3) is None and next_cursor(page, None) is None
+    assert parse_cursor(None) is None and parse_cursor("") is None
+
+
+def test_descriptions_are_previews_unless_asked(db, resume, monkeypatch):
+    monkeypatch.setattr(settings, "DESCRIPTION_PREVIEW_CHARS", 20)
+    assert {len(r["description"]) for r in get_top_k(db, resume)} == {20}
+    assert {len(r["description"]) for r in get_top_k(db, resume, include_description=True)} == {500}
+
+
+def test_page_size_is_clamped(monkeypatch):
+    monkeypatch.setattr(settings, "PAGE_SIZE", 50)
+    monkeypatch.setattr(settings, "MAX_PAGE_SIZE", 200)
+    assert [crud.page_size(n) for n in (None, 0, -5, 1, 120, 10_000)] == [50, 50, 1, 1, 120, 200]
+
+
+def test_student_and_resume_keysets(db):
+    students = [models.Student(name=f"s{n}", email=f"s{n}@x") for n in range(5)]
+    db.add_all(students)
+    db.commit()
+    for s in students:
+        db.add(models.Resume(student_id=s.id, filename="r"))
+    db.commit()
+    first = crud.list_students(db, limit=2)
+    rest = crud.list_students(db, after_id=first[-1].id, limit=10)
+    assert [r.id for r in first + rest] == [s.id for s in students]
+    newest = crud.list_resumes(db, limit=2)
+    older = crud.list_resumes(db, before_id=newest[-1].id, limit=10)
+    ids = [r.id for r in newest + older]
+    assert ids == sorted(ids, reverse=True) and len(ids) == 5
@@ -0,0 +1,62 @@
+"""Page-parallel PDF extraction, including from an upload job worker."""
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+from app.nlp import pdf_extract
+
+PAGES = 6
+
+
+def write_pdf(path, pages):
+    """Minimal PDF with one line of Helvetica text ("page N") per page."""
+    objs = ["<< /Type /Catalog /Pages 2 0 R >>",
+            "<< /Type /Pages /Kids [%s] /Count %d >>" % (" ".join(f"{4 + 2 * n} 0 R" for n in range(pages)), pages),
+            "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    for n in range(pages):
+        stream = f"BT /F1 12 Tf 72 720 Td (page {n}) Tj ET"
+        objs.append(f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents {5 + 2 * n} 0 R "
+                    "/Resources << /Font << /F1 3 0 R >> >> >>")
+        objs.append(f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream")
+    out, offsets = "%PDF-1.4\n", []
+    for i, obj in enumerate(objs, 1):
+        offsets.append(len(out))
+        out += f"{i} 0 obj\n{obj}\nendobj\n"
+    xref = len(out)
+    out += f"xref\n0 {len(objs) + 1}\n0000000000 65535 f \n" + "".join(f"{o:010d} 00000 n \n" for o in offsets)
+    out += f"trailer\n<< /Size {len(objs) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n"
+    path.write_bytes(out.encode("latin-1"))
+    return str(path)
+
+
+def extract_in_worker(path):
+    result = pdf_extract.extract_pdf(path, workers=2, min_parallel_pages=1)
+    return result.text, result.pages_read, pdf_extract._pool is not None
+
+
+@pytest.fixture
+def pdf(tmp_path):
+    return write_pdf(tmp_path / "doc.pdf", PAGES)
+
+
+def test_parallel_matches_serial(pdf):
+    serial = pdf_extract.extract_pdf(pdf, workers=1)
+    try:
+        parallel = pdf_extract.extract_pdf(pdf, workers=2, min_parallel_pages=1)
+    finally:
+        pdf_extract.shutdown(wait=True)
+    assert (parallel.text, parallel.pages_read, parallel.truncated) == (serial.text, PAGES, False)
+    assert [f"page {n}" in serial.text for n in range(PAGES)] == [True] * PAGES
+
+
+def test_job_worker_uses_page_pool_and_exits(pdf):
+    # same pool setup as app.jobs: the worker starts its own page pool and must still shut down cleanly
+    with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as pool:
+        text, read, used_pool = pool.submit(extract_in_worker, pdf).result(timeout=60)
+        workers = list(pool._processes.values())
+    for proc in workers:
+        proc.join(timeout=30)
+        assert not proc.is_alive()
+    assert (read, used_pool) == (PAGES, True)
+    assert "page 5" in text
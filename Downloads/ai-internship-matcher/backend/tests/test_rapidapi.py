@@ -0,0 +1,117 @@
+"""RapidAPI client against an in-process fake (`httpx.MockTransport`): paging, retries and pacing."""
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from app.config import settings
+from app.utils import rapidapi
+from app.utils.ratelimit import TokenBucket
+
+
+@pytest.fixture(autouse=True)
+def fast_settings(monkeypatch):
+    monkeypatch.setattr(settings, "JOBSCRAPER_PAGE_SIZE", 2)
+    monkeypatch.setattr(settings, "JOBSCRAPER_MAX_PAGES", 10)
+    monkeypatch.setattr(settings, "JOBSCRAPER_MAX_RETRIES", 3)
+    monkeypatch.setattr(settings, "JOBSCRAPER_BACKOFF_SECONDS", 0.01)
+    # unlimited unless a test installs its own bucket
+    monkeypatch.setattr(rapidapi, "rate_limiter", TokenBucket(0))
+
+
+def postings(keyword, total):
+    return [{"id": f"{keyword}-{i}", "title": f"{keyword} intern {i}"} for i in range(total)]
+
+
+def paged_handler(catalog, calls):
+    def handler(request: httpx.Request) -> httpx.Response:
+        params = request.url.params
+        calls.append((params["keyword"], int(params["offset"]), int(params["limit"])))
+        offset, limit = int(params["offset"]), int(params["limit"])
+        return httpx.Response(200, json={"jobs": catalog[params["keyword"]][offset:offset + limit]})
+    return handler
+
+
+def fetch(handler, keywords, limit=50):
+    return asyncio.run(rapidapi.fetch_internships(keywords, limit=limit, api_key="k",
+                                                  transport=httpx.MockTransport(handler)))
+
+
+def test_pages_until_a_short_page():
+    calls = []
+    items = fetch(paged_handler({"python": postings("python", 5)}, calls), ["python"])
+    assert [i["id"] for i in items] == [f"python-{i}" for i in range(5)]
+    assert calls == [("python", 0, 2), ("python", 2, 2), ("python", 4, 2)]
+
+
+def test_stops_at_limit_and_fetches_keywords_independently():
+    calls = []
+    catalog = {"python": postings("python", 10), "java": postings("java", 1)}
+    items = fetch(paged_handler(catalog, calls), ["python", "java"], limit=3)
+    assert sorted(i["id"] for i in items) == ["java-0", "python-0", "python-1", "python-2"]
+    assert sorted(c for c in calls if c[0] == "python") == [("python", 0, 2), ("python", 2, 2)]
+
+
+def test_retries_and_honours_retry_after(monkeypatch):
+    sleeps = []
+    real_sleep = asyncio.sleep
+
+    async def fake_sleep(seconds):
+        sleeps.append(seconds)
+        await real_sleep(0)
+
+    monkeypatch.setattr(rapidapi.asyncio, "sleep", fake_sleep)
+    responses = iter([httpx.Response(429, headers={"Retry-After": "2"}), httpx.Response(503),
+                      httpx.Response(200, json={"jobs": postings("go", 1)})])
+    items = fetch(lambda request: next(responses), ["go"])
+    assert [i["id"] for i in items] == ["go-0"]
+    # Retry-After raises the first delay to 2s, then exponential backoff doubles it
+    assert sleeps == [2.0, 4.0]
+
+
+def test_gives_up_after_max_retries(monkeypatch):
+    monkeypatch.setattr(settings, "JOBSCRAPER_BACKOFF_SECONDS", 0)
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        return httpx.Response(502)
+
+    with pytest.raises(rapidapi.RapidAPIError, match="HTTP 502"):
+        fetch(handler, ["rust"])
+    assert len(calls) == settings.JOBSCRAPER_MAX_RETRIES + 1
+
+
+def test_client_errors_are_not_retried():
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        return httpx.Response(401)
+
+    with pytest.raises(rapidapi.RapidAPIError, match="HTTP 401"):
+        fetch(handler, ["rust"])
+    assert len(calls) == 1
+
+
+def test_token_bucket_paces_requests(monkeypatch):
+    rate = 20.0
+    monkeypatch.setattr(rapidapi, "rate_limiter", TokenBucket(rate, capacity=1))
+    stamps = []
+
+    def handler(request):
+        stamps.append(time.monotonic())
+        return httpx.Response(200, json={"jobs": []})
+
+    fetch(handler, ["a", "b", "c", "d", "e"])
+    assert len(stamps) == 5
+    # the first request uses the burst token, the other four wait 1/rate each (small timer slack allowed)
+    assert stamps[-1] - stamps[0] >= 4 / rate * 0.9
+
+
+@pytest.mark.parametrize("workers, expected", [(1, 4.0), (4, 1.0), (0, 4.0)])
+def test_rate_is_split_across_uvicorn_workers(monkeypatch, workers, expected):
+    monkeypatch.setattr(settings, "JOBSCRAPER_RATE_LIMIT", 4.0)
+    monkeypatch.setattr(settings, "WEB_CONCURRENCY", workers)
+    assert rapidapi.process_rate() == expected
@@ -0,0 +1,58 @@
+"""Department recommendations are reused until the departments or the student's GPA change."""
+import numpy as np
+import pytest
+
+from app import models
+from app.api import recommendations
+from app.catalog import bump_catalog_version
+
+
+@pytest.fixture
+def setup(db, monkeypatch):
+    calls = []
+
+    def score(resume_emb, dept_embs, gpa_norm, overlaps, dept_skill_counts):
+        calls.append(gpa_norm)
+        return [float(n) for n in range(len(dept_embs))]
+
+    monkeypatch.setattr(recommendations, "score_departments", score)
+    monkeypatch.setattr(recommendations, "explain_matches", lambda student, resume, pairs: ["ok"] * len(pairs))
+    vec = np.ones(384, dtype=np.float32)
+    student = models.Student(name="s", email="s@x", gpa=3.0)
+    db.add(student)
+    db.commit()
+    db.add(models.Resume(student_id=student.id, filename="r", skills="python", embedding=vec))
+    db.add_all([models.InternshipDepartment(name=f"d{n}", required_skills="python", embedding=vec, embedding_model="m")
+                for n in range(3)])
+    db.commit()
+    return db, student, calls
+
+
+def recommend(db, student):
+    return recommendations.recommend_for_student(student.id, db=db)["recommendations"]
+
+
+def test_reused_across_internship_catalog_bumps(setup):
+    db, student, calls = setup
+    first = recommend(db, student)
+    bump_catalog_version(db)
+    assert recommend(db, student) == first
+    assert len(calls) == 1
+
+
+@pytest.mark.parametrize("edit", [
+    lambda db, student: setattr(student, "gpa", 3.5),
+    lambda db, student: setattr(db.query(models.InternshipDepartment).first(), "required_skills", "python,sql"),
+    lambda db, student: setattr(db.query(models.InternshipDepartment).first(), "embedding_model", "other"),
+    lambda db, student: db.delete(db.query(models.InternshipDepartment).first()),
+])
+def test_recomputed_when_inputs_change(setup, edit):
+    db, student, calls = setup
+    recommend(db, student)
+    edit(db, student)
+    db.commit()
+    recommend(db, student)
+    assert len(calls) == 2
+    # and reused again afterwards
+    recommend(db, student)
+    assert len(calls) == 2
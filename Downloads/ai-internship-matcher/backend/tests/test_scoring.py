@@ -0,0 +1,41 @@
+"""`ScoringEngine.top_k`: best first, ties in catalog order, first ALWAYS_ELIGIBLE rows always eligible."""
+import random
+
+import numpy as np
+import pytest
+
+from app.nlp.scoring import ALWAYS_ELIGIBLE, ScoringEngine
+
+
+def reference_top_k(scores, k):
+    """The pre-vectorized rule: stable sort by score desc over the eligible rows."""
+    eligible = [i for i, s in enumerate(scores) if i < ALWAYS_ELIGIBLE or s > 0]
+    return sorted(eligible, key=lambda i: -scores[i])[:k]
+
+
+def engine(n):
+    return ScoringEngine([{"id": i, "required_skills": ""} for i in range(n)])
+
+
+def test_ties_keep_catalog_order():
+    scores = np.array([50, 80, 50, 80, 50, 80, 50])
+    assert engine(7).top_k(scores, 7).tolist() == [1, 3, 5, 0, 2, 4, 6]
+    # a cut through a tie keeps the earliest rows
+    assert engine(7).top_k(scores, 4).tolist() == [1, 3, 5, 0]
+
+
+def test_first_rows_always_eligible():
+    scores = np.array([0, 0, 30, 0, 0, 0, 0, 20])
+    assert engine(8).top_k(scores, 20).tolist() == [2, 7, 0, 1, 3, 4]
+    assert engine(0).top_k(np.zeros(0), 5).tolist() == []
+    assert engine(8).top_k(scores, 0).tolist() == []
+
+
+@pytest.mark.parametrize("seed", range(20))
+@pytest.mark.parametrize("k", [1, 3, 10, 100])
+def test_matches_reference(seed, k):
+    rng = random.Random(seed)
+    n = rng.randint(1, 60)
+    # few distinct values so there are many ties, and many zeros so eligibility matters
+    scores = np.array([rng.choice([0, 0, 0, 10, 40, 40, 72, 100]) for _ in range(n)])
+    assert engine(n).top_k(scores, k).tolist() == reference_top_k(scores.tolist(), k)
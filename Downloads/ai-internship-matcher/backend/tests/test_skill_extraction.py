@@ -0,0 +1,55 @@
+"""Skill extraction parity over a fixed sample of resumes and postings."""
+import os
+
+import pytest
+import spacy
+
+from app.nlp.parser import extract_skills_batch, extract_skills_from_text
+from scripts.bench_skill_extraction import legacy_skills, make_corpus
+
+SAMPLE_RESUME = os.path.join(os.path.dirname(__file__), "..", "..", "sample_resume.txt")
+
+RESUMES = [
+    ("Built REST APIs in Python with Flask and PostgreSQL; deployed with Docker on Linux.",
+     {"python", "flask", "postgresql", "docker", "linux"}),
+    ("Frontend: React.js, Vue, HTML5/CSS3 and JS. Some Node.js + Express.",
+     {"react", "vue", "html", "css", "javascript", "node.js", "express"}),
+    ("Coursework in machine learning (TensorFlow, PyTorch) and data analytics with SQL.",
+     {"machine learning", "tensorflow", "pytorch", "data analysis", "sql"}),
+    ("Networking lab: routing, switching, Git for configs. C++ and C# for tooling.",
+     {"networking", "git", "c++", "c#"}),
+    ("Barista, event host and volunteer tutor.", set()),
+    ("", set()),
+]
+
+
+@pytest.fixture(scope="module")
+def samples():
+    texts = [t for t, _ in RESUMES] + make_corpus(200)
+    with open(SAMPLE_RESUME, encoding="utf-8") as f:
+        texts.append(f.read())
+    return texts
+
+
+@pytest.mark.parametrize("text, expected", RESUMES)
+def test_expected_skills(text, expected):
+    assert set(extract_skills_from_text(text)) == expected
+
+
+def test_sample_resume():
+    with open(SAMPLE_RESUME, encoding="utf-8") as f:
+        found = set(extract_skills_from_text(f.read()))
+    assert {"python", "java", "c++", "sql", "javascript", "tensorflow", "pytorch", "keras",
+            "machine learning", "data analysis", "git", "docker", "mongodb"} <= found
+
+
+def test_batch_matches_single(samples):
+    assert [set(s) for s in extract_skills_batch(samples, batch_size=16)] == \
+        [set(extract_skills_from_text(t)) for t in samples]
+
+
+def test_never_misses_a_skill_the_token_probes_found(samples):
+    # the pre-matcher loop over the same tokenizer (the full en_core_web_sm pipeline isn't a test dependency)
+    nlp = spacy.blank("en")
+    for text in samples:
+        assert legacy_skills(nlp, text) <= set(extract_skills_from_text(text)), text[:80]
@@ -0,0 +1,49 @@
+"""`sql_top_k` must rank exactly like the in-memory `ScoringEngine` on the same catalog."""
+import random
+
+import pytest
+from sqlalchemy import insert
+
+from app import crud, models
+from app.catalog import bump_catalog_version, get_catalog
+from app.nlp.scoring import skill_set, split_skills
+from app.nlp.sql_scoring import sql_top_k
+from app.topk import compute_top_k
+
+SKILLS = ["python", "sql", "java", "react", "docker", "excel", "machine learning", "go", "figma", "c++"]
+OUTCOMES = ["data analysis", "web development", "research"]
+
+
+@pytest.fixture
+def catalog(db):
+    rng = random.Random(11)
+    rows = []
+    for n in range(120):
+        skills = rng.sample(SKILLS, rng.randint(0, 4))
+        if skills and rng.random() < 0.2:
+            # case-duplicates and padding collapse to one skill on both backends
+            skills.append(" " + skills[0].upper())
+        rows.append(dict(title=f"intern {n}", company_name="c", required_skills=",".join(skills),
+                         description=" ".join(rng.sample(OUTCOMES + ["coffee", "team"], 2)),
+                         is_active=0 if rng.random() < 0.1 else 1))
+    ids = db.execute(insert(models.Internship).returning(models.Internship.id, sort_by_parameter_order=True),
+                     rows).scalars().all()
+    db.commit()
+    crud.sync_internship_skills(db, {i: split_skills(r["required_skills"]) for i, r in zip(ids, rows)})
+    bump_catalog_version(db)
+    return db
+
+
+class _Resume:
+    def __init__(self, skills, outcomes):
+        self.skills, self.outcomes = skills, outcomes
+
+
+@pytest.mark.parametrize("seed", range(8))
+@pytest.mark.parametrize("k", [1, 5, 20, 200])
+def test_sql_top_k_matches_scoring_engine(catalog, seed, k):
+    rng = random.Random(seed)
+    resume = _Resume(",".join(rng.sample(SKILLS, rng.randint(0, 5))), ",".join(rng.sample(OUTCOMES, rng.randint(0, 3))))
+    expected = compute_top_k(get_catalog(catalog), resume, k)
+    got = sql_top_k(catalog, skill_set(resume.skills), skill_set(resume.outcomes), k)
+    assert got == expected
@@ -0,0 +1,107 @@
+"""Materialized top-k: carrying stored lists across catalog versions (`apply_catalog_delta`)."""
+from sqlalchemy import insert
+
+from app import crud, models
+from app.catalog import bump_catalog_version, invalidate_catalog
+from app.topk import TARGET, apply_catalog_delta, full_top_k, get_top_k
+
+K = 5
+
+
+def add_internships(db, skills_list):
+    ids = db.execute(insert(models.Internship).returning(models.Internship.id, sort_by_parameter_order=True),
+                     [dict(title=f"t{n}", company_name="c", required_skills=s, is_active=1)
+                      for n, s in enumerate(skills_list)]).scalars().all()
+    db.commit()
+    return ids
+
+
+def add_resume(db, skills):
+    resume = models.Resume(filename="r", skills=skills, outcomes="")
+    db.add(resume)
+    db.commit()
+    return resume
+
+
+def stored(db, resume, version):
+    rec = models.Recommendation
+    return sorted((r.internship_id, int(r.score)) for r in db.query(rec).filter(
+        rec.resume_id == resume.id, rec.catalog_version == version, rec.internship_id.isnot(None)))
+
+
+def stored_ids(db, resume):
+    rec = models.Recommendation
+    return sorted(r.id for r in db.query(rec).filter(rec.resume_id == resume.id, rec.internship_id.isnot(None)))
+
+
+def full(db, resume):
+    invalidate_catalog()
+    return sorted((r[TARGET], r["score"]) for r in full_top_k(db, resume, K))
+
+
+def materialize(db, resumes):
+    for resume in resumes:
+        get_top_k(db, resume, k=K)
+
+
+def test_new_postings_are_merged_like_a_full_recompute(db):
+    add_internships(db, ["python", "python,sql", "java", "sql", "python,java,sql", "go", "python,go"])
+    v1 = bump_catalog_version(db)
+    resumes = [add_resume(db, "python,sql"), add_resume(db, "java")]
+    materialize(db, resumes)
+    added = add_internships(db, ["python,sql", "sql", "java"])
+    v2 = bump_catalog_version(db)
+    assert apply_catalog_delta(db, v1, v2, added, k=K) == 2
+    for resume in resumes:
+        assert stored(db, resume, v2) == full(db, resume)
+        assert stored(db, resume, v1) == []
+
+
+def test_unchanged_lists_are_restamped_in_place(db):
+    add_internships(db, ["python"] * 8)
+    v1 = bump_catalog_version(db)
+    resume = add_resume(db, "python")
+    materialize(db, [resume])
+    before, row_ids = stored(db, resume, v1), stored_ids(db, resume)
+    # a posting that doesn't make the cut (a full list of 100s) and a bump without additions
+    added = add_internships(db, ["cobol"])
+    v2 = bump_catalog_version(db)
+    apply_catalog_delta(db, v1, v2, added, k=K)
+    v3 = bump_catalog_version(db)
+    apply_catalog_delta(db, v2, v3, k=K)
+    assert stored(db, resume, v3) == before
+    # same rows, only the version moved: nothing was deleted and re-inserted
+    assert stored_ids(db, resume) == row_ids
+
+
+def test_inactive_held_posting_triggers_a_recompute(db):
+    add_internships(db, ["python"] * 3 + ["python,sql"] * 4)
+    v1 = bump_catalog_version(db)
+    resume = add_resume(db, "python")
+    materialize(db, [resume])
+    held = stored(db, resume, v1)[0][0]
+    db.query(models.Internship).filter(models.Internship.id == held).update({"is_active": 0})
+    db.commit()
+    v2 = bump_catalog_version(db)
+    apply_catalog_delta(db, v1, v2, k=K)
+    carried = stored(db, resume, v2)
+    assert held not in [i for i, _ in carried]
+    assert carried == full(db, resume)
+
+
+def test_rows_already_saved_at_the_new_version_are_kept(db):
+    add_internships(db, ["python", "sql", "python,sql", "java", "python"])
+    v1 = bump_catalog_version(db)
+    changed, unchanged = add_resume(db, "sql"), add_resume(db, "java")
+    materialize(db, [changed, unchanged])
+    added = add_internships(db, ["sql"])
+    v2 = bump_catalog_version(db)
+    # a reader got there first and stored both lists at v2 (the v1 rows are still there)
+    for resume in (changed, unchanged):
+        invalidate_catalog()
+        db.execute(crud.insert_recommendations_stmt(db, TARGET), [
+            dict(r, resume_id=resume.id, catalog_version=v2) for r in full_top_k(db, resume, K)])
+    db.commit()
+    apply_catalog_delta(db, v1, v2, added, k=K)
+    for resume in (changed, unchanged):
+        assert stored(db, resume, v2) == full(db, resume)